@@ -0,0 +1,195 @@
+"""
+asv tarzı benchmark tanımları.
+
+Her sınıf:
+  params      -> ölçekler (satır sayısı)
+  setup(n)    -> ölçülmeyen hazırlık; NotImplementedError -> bu ölçek atlanır
+  time_*(n)   -> ölçülen çağrı (her tekrar öncesi setup yeniden çalışır)
+
+Çalıştırmak için: python -m benchmarks.run (bkz. benchmarks/run.py)
+"""
+
+from __future__ import annotations
+import functools
+import shutil
+import tempfile
+import warnings
+from pathlib import Path
+
+import pandas as pd
+
+from src.etl.merge import fill_hb_from_title, merge_ty_hb, to_english_columns
+from src.etl.normalize import DEFAULT_PARSERS, normalize_df_inplace, parse_columns
+from src.etl.synthetic import (
+    PROJECT_ROOT,
+    generate_raw_catalog,
+    write_synthetic_snapshots,
+)
+
+SCALES = [10_000, 100_000, 1_000_000]
+
+
+# -----------------------------
+# Paylaşılan sentetik veri (ölçek başına bir kez üretilir)
+# -----------------------------
+@functools.lru_cache(maxsize=None)
+def raw_catalog(n: int) -> tuple[pd.DataFrame, pd.DataFrame]:
+    return generate_raw_catalog(n, seed=0)
+
+
+@functools.lru_cache(maxsize=None)
+def merged(n: int) -> pd.DataFrame:
+    hb, ty = raw_catalog(n)
+    df = merge_ty_hb(ty, fill_hb_from_title(hb.copy()), "TY_synth.csv", "HB_synth.csv")
+    return to_english_columns(df)
+
+
+@functools.lru_cache(maxsize=None)
+def normalized(n: int) -> pd.DataFrame:
+    return normalize_df_inplace(merged(n).copy(), engine="arrow")
+
+
+@functools.lru_cache(maxsize=None)
+def processed(n: int) -> pd.DataFrame:
+    return parse_columns(normalized(n).copy())
+
+
+# -----------------------------
+# ETL
+# -----------------------------
+class TitleExtractors:
+    params = SCALES
+
+    def setup(self, n):
+        self.hb = raw_catalog(n)[0].copy()
+
+    def time_fill_hb_from_title(self, n):
+        fill_hb_from_title(self.hb)
+
+
+class MergeTyHb:
+    params = SCALES
+
+    def setup(self, n):
+        self.hb, self.ty = raw_catalog(n)
+
+    def time_merge_and_rename(self, n):
+        to_english_columns(merge_ty_hb(self.ty, self.hb, "TY.csv", "HB.csv"))
+
+
+class Normalize:
+    params = SCALES
+
+    def setup(self, n):
+        self.df = merged(n).copy()
+
+    def time_python(self, n):
+        normalize_df_inplace(self.df, engine="python")
+
+    def time_arrow(self, n):
+        normalize_df_inplace(self.df, engine="arrow")
+
+
+class ColumnParsers:
+    params = SCALES
+
+    def setup(self, n):
+        self.df = normalized(n).copy()
+
+    def time_parse_columns(self, n):
+        parse_columns(self.df)
+
+
+class ColumnParsersRowwise:
+    """Eski df[col].apply(parser) yolu; referans için, 1M'de atlanır."""
+
+    params = SCALES
+
+    def setup(self, n):
+        if n > 100_000:
+            raise NotImplementedError
+        self.df = normalized(n).copy()
+
+    def time_apply_rowwise(self, n):
+        for col, spec in DEFAULT_PARSERS.items():
+            fn, kwargs = spec if isinstance(spec, tuple) else (spec, {})
+            self.df[col] = self.df[col].apply(lambda x: fn(x, **kwargs))
+
+
+class EtlPipelineCold:
+    """Snapshot csv'lerinden işlenmiş tabloya, boş cache ile."""
+
+    params = SCALES
+
+    def setup(self, n):
+        from src.etl.pipeline import build_etl_pipeline
+
+        self.tmp = Path(tempfile.mkdtemp(prefix="rfs_bench_"))
+        write_synthetic_snapshots(self.tmp, n, seed=0, stamp="000000000000")
+        self.pipe = build_etl_pipeline(
+            hb_pattern=str(self.tmp / "HB_Details_*.csv"),
+            ty_pattern=str(self.tmp / "TY_Details_*.csv"),
+            cache_dir=str(self.tmp / "cache"),
+        )
+
+    def time_run(self, n):
+        self.pipe.run()
+
+    def teardown(self, n):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+
+# -----------------------------
+# Model
+# -----------------------------
+@functools.lru_cache(maxsize=None)
+def fitted_model():
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.pipeline import Pipeline
+
+    from src.models.dataset import build_preprocessor, load_model_frame, split_log_price
+
+    df = load_model_frame(
+        str(PROJECT_ROOT / "data" / "processed" / "laptop_data_processed.csv")
+    )
+    X_train, _, y_train, _ = split_log_price(df)
+    model = Pipeline(
+        [
+            ("step1", build_preprocessor()),
+            (
+                "step2",
+                RandomForestRegressor(
+                    n_estimators=100,
+                    random_state=3,
+                    max_samples=0.5,
+                    max_features=0.75,
+                    max_depth=15,
+                    n_jobs=-1,
+                ),
+            ),
+        ]
+    )
+    return model.fit(X_train, y_train), list(X_train.columns)
+
+
+@functools.lru_cache(maxsize=None)
+def model_inputs(n: int) -> pd.DataFrame:
+    from src.models.dataset import TARGET_COL, prepare_model_frame
+
+    _, cols = fitted_model()
+    df = prepare_model_frame(processed(n).copy(), dedupe=False)
+    return df.drop(columns=[TARGET_COL]).reindex(columns=cols)
+
+
+class ModelPredict:
+    params = SCALES
+
+    def setup(self, n):
+        self.model, _ = fitted_model()
+        self.X = model_inputs(n)
+
+    def time_random_forest_predict(self, n):
+        with warnings.catch_warnings():
+            # sentetik satırlarda eğitimde görülmemiş kategoriler olağan
+            warnings.simplefilter("ignore", UserWarning)
+            self.model.predict(self.X)
@@ -0,0 +1,211 @@
+"""
+Benchmark runner: benchmarks.py'deki asv tarzı sınıfları çalıştırır.
+
+  python -m benchmarks.run                       # 10k + 100k
+  python -m benchmarks.run --scales 1m           # 1M satır
+  python -m benchmarks.run --bench Normalize ColumnParsers --repeat 5
+
+Her (benchmark, ölçek) için:
+  - median/min süre (tekrar başına setup yeniden çalışır, ölçülmez)
+  - throughput (satır/s, median üzerinden)
+  - bellek tepe değeri (ayrı bir çalıştırmada; süreyi etkilemesin diye):
+    tracemalloc peak (python nesneleri + numpy tamponları) + pyarrow bellek
+    havuzunun tepe artışı. Arrow tamponları tracemalloc'a görünmez; havuz
+    arka plan thread'inde örneklenir ve ayrıca raporlanır.
+
+Sonuçlar benchmarks/results/<zaman>_<commit>.json olarak saklanır ve bir
+önceki sonuç dosyasıyla karşılaştırılır.
+"""
+
+from __future__ import annotations
+import argparse
+import gc
+import inspect
+import json
+import platform
+import subprocess
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks import benchmarks as suite
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+SCALE_ALIASES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+# önceki koşuya göre bu oranın üstü regresyon sayılır
+REGRESSION_RATIO = 1.2
+
+
+def _scale(s: str) -> int:
+    return SCALE_ALIASES.get(s.lower()) or int(s)
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def discover(names: list[str] | None = None) -> list[tuple[str, type, str]]:
+    """(sınıf adı, sınıf, time_* metodu) listesi."""
+    out = []
+    for cls_name, cls in inspect.getmembers(suite, inspect.isclass):
+        if cls.__module__ != suite.__name__ or not hasattr(cls, "params"):
+            continue
+        if names and cls_name not in names:
+            continue
+        for meth in sorted(m for m in dir(cls) if m.startswith("time_")):
+            out.append((cls_name, cls, meth))
+    return out
+
+
+# -----------------------------
+# Bellek ölçümü
+# -----------------------------
+class ArrowPeakSampler(threading.Thread):
+    """Çağrı süresince pyarrow bellek havuzunun başlangıca göre tepe artışı."""
+
+    def __init__(self, interval: float = 0.002):
+        import pyarrow as pa
+
+        super().__init__(daemon=True)
+        self._allocated = pa.total_allocated_bytes
+        self.interval = interval
+        self._done = threading.Event()
+        self.start_bytes = self.peak_bytes = self._allocated()
+
+    def sample(self) -> None:
+        self.peak_bytes = max(self.peak_bytes, self._allocated())
+
+    def run(self) -> None:
+        while not self._done.wait(self.interval):
+            self.sample()
+
+    def stop(self) -> int:
+        self._done.set()
+        self.join()
+        self.sample()
+        return self.peak_bytes - self.start_bytes
+
+
+def _call(cls: type, meth: str, n: int, measure: bool) -> tuple[float, dict]:
+    """Süre ve measure=True ise bayt cinsinden tepe artışları (python, arrow)."""
+    bench = cls()
+    bench.setup(n)
+    try:
+        gc.collect()
+        if measure:
+            sampler = ArrowPeakSampler()
+            tracemalloc.start()
+            sampler.start()
+        t0 = time.perf_counter()
+        getattr(bench, meth)(n)
+        elapsed = time.perf_counter() - t0
+        mem = {}
+        if measure:
+            mem["arrow"] = sampler.stop()
+            mem["python"] = tracemalloc.get_traced_memory()[1]
+        return elapsed, mem
+    finally:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        if hasattr(bench, "teardown"):
+            bench.teardown(n)
+
+
+def run_one(cls: type, meth: str, n: int, repeat: int) -> dict | None:
+    try:
+        times = [_call(cls, meth, n, measure=False)[0] for _ in range(repeat)]
+        _, mem = _call(cls, meth, n, measure=True)
+    except NotImplementedError:
+        return None
+
+    times.sort()
+    median = times[len(times) // 2]
+    return {
+        "median_s": round(median, 6),
+        "min_s": round(times[0], 6),
+        "rows_per_s": round(n / median, 1) if median > 0 else None,
+        # python nesneleri + numpy (tracemalloc) ve Arrow havuzu; iki tepe
+        # farklı anlarda olabilir, toplam üst sınırdır
+        "peak_mb": round((mem["python"] + mem["arrow"]) / 1e6, 2),
+        "arrow_peak_mb": round(mem["arrow"] / 1e6, 2),
+        "repeat": repeat,
+    }
+
+
+def latest_result(exclude: Path | None = None) -> dict | None:
+    files = sorted(p for p in RESULTS_DIR.glob("*.json") if p != exclude)
+    return json.loads(files[-1].read_text(encoding="utf-8")) if files else None
+
+
+def main(argv: list[str] | None = None) -> None:
+    p = argparse.ArgumentParser(description="ETL / model benchmark'ları")
+    p.add_argument("--scales", nargs="*", default=["10k", "100k"])
+    p.add_argument("--bench", nargs="*", default=None, help="Sınıf adları")
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--no-save", action="store_true")
+    args = p.parse_args(argv)
+
+    scales = [_scale(s) for s in args.scales]
+    previous = latest_result()
+    prev = (previous or {}).get("results", {})
+
+    results = {}
+    header = f"{'benchmark':48s} {'n':>9s} {'median s':>10s} {'rows/s':>12s} {'peak MB':>9s} {'arrow MB':>9s}  vs prev"
+    print(header)
+    print("-" * len(header))
+    for cls_name, cls, meth in discover(args.bench):
+        for n in scales:
+            if n not in cls.params:
+                continue
+            key = f"{cls_name}.{meth}[{n}]"
+            r = run_one(cls, meth, n, args.repeat)
+            if r is None:
+                print(f"{cls_name + '.' + meth:48s} {n:>9d} {'skipped':>10s}")
+                continue
+            results[key] = r
+
+            cmp = ""
+            if key in prev and prev[key]["median_s"] > 0:
+                ratio = r["median_s"] / prev[key]["median_s"]
+                cmp = f"{ratio:5.2f}x" + (
+                    "  REGRESSION" if ratio > REGRESSION_RATIO else ""
+                )
+            print(
+                f"{cls_name + '.' + meth:48s} {n:>9d} {r['median_s']:>10.4f} "
+                f"{r['rows_per_s'] or 0:>12,.0f} {r['peak_mb']:>9.1f} {r['arrow_peak_mb']:>9.1f}  {cmp}"
+            )
+
+    if args.no_save or not results:
+        return
+
+    commit = _git_commit()
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    out = RESULTS_DIR / f"{datetime.now().strftime('%Y%m%d%H%M%S')}_{commit}.json"
+    payload = {
+        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "commit": commit,
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+        },
+        "results": results,
+    }
+    out.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    print("Sonuçlar:", out)
+
+
+if __name__ == "__main__":
+    main()
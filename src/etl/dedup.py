@@ -0,0 +1,292 @@
+from __future__ import annotations
+import re
+import numpy as np
+import pandas as pd
+
+# -----------------------------
+# Normalizasyon / shingle
+# -----------------------------
+# ilan başlığında ürünü değiştirmeyen renk ekleri
+COLOR_WORDS = re.compile(
+    r"\b(?:siyah|gri|gümüş|gumus|beyaz|mavi|lacivert|yeşil|yesil|pembe|kırmızı|"
+    r"black|grey|gray|silver|white|blue|green|uzay grisi|space gray|renk)\b"
+)
+
+DEDUP_SPEC_COLS = [
+    "brand",
+    "cpu_family",
+    "cpu_model",
+    "ram_gb",
+    "ssd_gb",
+    "gpu_model",
+    "screen_size_inch",
+]
+
+_MERSENNE = np.uint64((1 << 61) - 1)
+
+
+def normalize_title(title) -> str:
+    if pd.isna(title):
+        return ""
+    s = str(title).lower()
+    s = COLOR_WORDS.sub(" ", s)
+    s = re.sub(r"[^\w.]+", " ", s)
+    return re.sub(r"\s+", " ", s).strip()
+
+
+def _shingles(text: str, k: int) -> set[str]:
+    if len(text) <= k:
+        return {text} if text else set()
+    return {text[i : i + k] for i in range(len(text) - k + 1)}
+
+
+def _token_hashes(tokens) -> np.ndarray:
+    """str token'ları -> 32 bit hash (minhash çarpımı uint64'e sığsın diye)."""
+    return pd.util.hash_array(np.asarray(tokens, dtype=object)) & np.uint64(0xFFFFFFFF)
+
+
+def build_shingles(titles: np.ndarray, k: int = 5) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (doc_idx, shingle_hash) düz dizileri; doc_idx titles içindeki sıradır.
+    titles normalize edilmiş başlıklar olmalı (bkz. normalize_title).
+    """
+    doc_idx, tokens = [], []
+    for i, t in enumerate(titles):
+        sh = _shingles(t, k)
+        doc_idx.append(np.full(len(sh), i, dtype=np.int64))
+        tokens.extend(sh)
+
+    doc_idx = np.concatenate(doc_idx) if doc_idx else np.empty(0, dtype=np.int64)
+    return doc_idx, _token_hashes(tokens)
+
+
+# -----------------------------
+# MinHash
+# -----------------------------
+def _permutations(num_perm: int, seed: int) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 1 << 32, size=num_perm, dtype=np.uint64)
+    b = rng.integers(0, 1 << 32, size=num_perm, dtype=np.uint64)
+    return a, b
+
+
+def _hash_perm(h: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    # a, h < 2^32 -> çarpım uint64'e sığar
+    return (h[:, None] * a[None, :] + b[None, :]) % _MERSENNE
+
+
+def minhash_signatures(
+    doc_idx: np.ndarray,
+    hashes: np.ndarray,
+    n_docs: int,
+    num_perm: int = 64,
+    seed: int = 42,
+    chunk: int = 100_000,
+) -> np.ndarray:
+    """
+    (n_docs, num_perm) MinHash imzaları.
+    h_i(x) = (a_i * x + b_i) mod (2^61 - 1); doc başına min, reduceat ile.
+    Shingle'lar chunk'lar halinde işlenir -> bellek sınırlı.
+    """
+    a, b = _permutations(num_perm, seed)
+    sig = np.full((n_docs, num_perm), np.iinfo(np.uint64).max, dtype=np.uint64)
+    if len(hashes) == 0:
+        return sig
+
+    order = np.argsort(doc_idx, kind="stable")
+    doc_idx, hashes = doc_idx[order], hashes[order]
+
+    for s in range(0, len(hashes), chunk):
+        d = doc_idx[s : s + chunk]
+        ph = _hash_perm(hashes[s : s + chunk], a, b)
+        starts = np.flatnonzero(np.r_[True, d[1:] != d[:-1]])
+        mins = np.minimum.reduceat(ph, starts, axis=0)
+        docs = d[starts]
+        sig[docs] = np.minimum(sig[docs], mins)
+
+    return sig
+
+
+def frame_signatures(
+    df: pd.DataFrame,
+    title_col: str = "title",
+    spec_cols: list[str] | None = None,
+    k: int = 5,
+    num_perm: int = 64,
+    seed: int = 42,
+) -> np.ndarray:
+    """
+    Satır başına MinHash imzası: başlık k-gram'ları + 'kolon=değer' token'ları.
+
+    MinHash bir küme birleşiminde min'e ayrışır; bu yüzden imzalar sadece
+    benzersiz başlıklar ve benzersiz spec değerleri için hesaplanır, sonra
+    satırlara take + np.minimum ile yayılır. Tekrarlanan snapshot'larda
+    maliyet satır sayısıyla değil benzersiz başlık sayısıyla büyür.
+    """
+    spec_cols = [c for c in (spec_cols or DEDUP_SPEC_COLS) if c in df.columns]
+    a, b = _permutations(num_perm, seed)
+
+    codes, uniques = pd.factorize(df[title_col], use_na_sentinel=True)
+    norm = np.array([normalize_title(t) for t in uniques] + [""], dtype=object)
+    doc_idx, hashes = build_shingles(norm, k=k)
+    sig = minhash_signatures(doc_idx, hashes, len(norm), num_perm=num_perm, seed=seed)
+    sig = sig[codes]  # -1 (NA) -> boş başlık
+
+    for c in spec_cols:
+        c_codes, c_uniques = pd.factorize(df[c].astype("string"), use_na_sentinel=True)
+        if len(c_uniques) == 0:
+            continue
+        tok = _hash_perm(_token_hashes([f"{c}={u}" for u in c_uniques]), a, b)
+        has = c_codes >= 0
+        sig[has] = np.minimum(sig[has], tok[c_codes[has]])
+
+    return sig
+
+
+# -----------------------------
+# LSH banding + kümeleme
+# -----------------------------
+def _bands_for_threshold(num_perm: int, threshold: float) -> tuple[int, int]:
+    """(1/b)^(1/r) ~ threshold olacak şekilde b*r = num_perm seçer."""
+    best, best_err = (num_perm, 1), float("inf")
+    for r in range(1, num_perm + 1):
+        if num_perm % r:
+            continue
+        b = num_perm // r
+        err = abs((1 / b) ** (1 / r) - threshold)
+        if err < best_err:
+            best, best_err = (b, r), err
+    return best
+
+
+def _connected_components(n: int, u: np.ndarray, v: np.ndarray) -> np.ndarray:
+    """Kenar listesinden bileşen etiketleri (vektörel label propagation)."""
+    labels = np.arange(n)
+    if len(u) == 0:
+        return labels
+    while True:
+        m = np.minimum(labels[u], labels[v])
+        new = labels.copy()
+        np.minimum.at(new, u, m)
+        np.minimum.at(new, v, m)
+        # pointer jumping
+        while True:
+            nxt = new[new]
+            if np.array_equal(nxt, new):
+                break
+            new = nxt
+        if np.array_equal(new, labels):
+            return labels
+        labels = new
+
+
+def lsh_clusters(
+    sig: np.ndarray,
+    threshold: float = 0.8,
+    verify: bool = True,
+    block: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    LSH banding ile aday çiftler -> bağlı bileşenler.
+    block verilirse (ör. spec anahtarı) sadece aynı bloktaki satırlar aynı
+    kovaya düşer; farklı RAM/SSD varyantları zincirleme birleşmez.
+    verify=True ise aday kenarlar tahmini Jaccard >= threshold ile süzülür.
+    Dönen dizi: satır başına küme etiketi (küme içindeki en küçük satır indeksi).
+    """
+    n, num_perm = sig.shape
+    b, r = _bands_for_threshold(num_perm, threshold)
+    rows = np.arange(n)
+    mult = np.random.default_rng(0).integers(
+        1, np.iinfo(np.int64).max, size=r + 1, dtype=np.uint64
+    ) | np.uint64(1)
+    salt = block.astype(np.uint64) if block is not None else np.zeros(n, np.uint64)
+
+    us, vs = [], []
+    for band in range(b):
+        cols = sig[:, band * r : (band + 1) * r]
+        # r satırlık bandı tek 64-bit anahtara indir (taşma = mod 2^64)
+        key = cols @ mult[:r] + salt * mult[r]
+        codes, _ = pd.factorize(key)
+        # aynı kovadaki her satırı kovanın ilk satırına bağla (yıldız)
+        first = np.full(codes.max() + 1, -1, dtype=np.int64)
+        first[codes[::-1]] = rows[::-1]
+        head = first[codes]
+        mask = head != rows
+        us.append(rows[mask])
+        vs.append(head[mask])
+
+    u = np.concatenate(us)
+    v = np.concatenate(vs)
+    if len(u):
+        pairs = np.unique(np.stack([u, v], axis=1), axis=0)
+        u, v = pairs[:, 0], pairs[:, 1]
+
+    if verify and len(u):
+        est = (sig[u] == sig[v]).mean(axis=1)
+        keep = est >= threshold
+        u, v = u[keep], v[keep]
+
+    return _connected_components(n, u, v)
+
+
+# -----------------------------
+# Public API
+# -----------------------------
+def find_near_duplicates(
+    df: pd.DataFrame,
+    title_col: str = "title",
+    spec_cols: list[str] | None = None,
+    threshold: float = 0.8,
+    num_perm: int = 64,
+    k: int = 5,
+    seed: int = 42,
+) -> pd.Series:
+    """
+    Normalize başlık + spec alanları üzerinden yakın-kopya kümeleri.
+    Spec alanları (marka, cpu, ram, ssd, gpu, ekran) aynı olan ve başlık Jaccard
+    benzerliği ~threshold üstündeki satırlar aynı kümeye düşer.
+    Dönen Series df.index ile hizalı küme etiketidir; tekil satırlar kendi kümesidir.
+    """
+    spec_cols = [c for c in (spec_cols or DEDUP_SPEC_COLS) if c in df.columns]
+    sig = frame_signatures(
+        df, title_col=title_col, spec_cols=spec_cols, k=k, num_perm=num_perm, seed=seed
+    )
+
+    # spec alanları birebir aynı olmalı: blok anahtarı olarak kovaya karışır
+    block = (
+        pd.util.hash_pandas_object(
+            df[spec_cols].astype("string"), index=False
+        ).to_numpy()
+        if spec_cols
+        else None
+    )
+    labels = lsh_clusters(sig, threshold=threshold, block=block)
+    return pd.Series(labels, index=df.index, name="dup_cluster")
+
+
+def drop_near_duplicates(
+    df: pd.DataFrame,
+    policy: str = "cheapest",
+    price_col: str = "price_try",
+    time_col: str = "scraped_at",
+    **kwargs,
+) -> tuple[pd.DataFrame, int]:
+    """
+    Her yakın-kopya kümesinden tek satır bırakır.
+    policy: 'cheapest' (en düşük fiyat) | 'latest' (en yeni scraped_at)
+    """
+    clusters = find_near_duplicates(df, **kwargs)
+    out = df.assign(_cluster=clusters.to_numpy())
+
+    if policy == "cheapest":
+        out = out.sort_values(price_col, kind="stable", na_position="last")
+    elif policy == "latest":
+        out = out.assign(_t=pd.to_datetime(out[time_col], errors="coerce"))
+        out = out.sort_values("_t", ascending=False, kind="stable", na_position="last")
+        out = out.drop(columns="_t")
+    else:
+        raise ValueError(f"Unknown policy: {policy}")
+
+    before = len(out)
+    out = out.drop_duplicates("_cluster", keep="first").sort_index()
+    return out.drop(columns="_cluster"), before - len(out)
@@ -0,0 +1,92 @@
+from __future__ import annotations
+import pandas as pd
+
+
+def drop_apple(df: pd.DataFrame) -> tuple[pd.DataFrame, int]:
+    """Apple/MacBook satırlarını kaldırır; (df, silinen satır sayısı) döndürür."""
+    mask_apple = df["brand"].astype("string").str.contains(
+        r"\bapple\b", case=False, na=False
+    ) | df["title"].astype("string").str.contains(
+        r"\bmacbook\b|\bapple\b", case=False, na=False
+    )
+
+    removed = int(mask_apple.sum())
+    return df.loc[~mask_apple].reset_index(drop=True), removed
+
+
+def inspect_title_duplicates(
+    df: pd.DataFrame,
+    title_col: str = "title",
+    sort_by: str = "scraped_at",
+    show_top: int = 20,
+    sample_rows: int = 50,
+    preview_cols: list[str] | None = None,
+):
+    """
+    Title'a göre duplicate kayıtları incelemek için özet + örnek tablo döndürür.
+    Silme yapmaz.
+    """
+    out = df.copy()
+
+    if sort_by in out.columns:
+        out[sort_by] = pd.to_datetime(out[sort_by], errors="coerce")
+
+    s = out[title_col].astype("string")
+    dup_mask = s.duplicated(keep=False)
+
+    dups = out.loc[dup_mask].sort_values(
+        [title_col] + ([sort_by] if sort_by in out.columns else [])
+    )
+
+    unique_dup_titles = int(dups[title_col].astype("string").nunique())
+    dup_rows = int(len(dups))
+    to_drop_keep_last = int(s.duplicated(keep="last").sum())
+
+    print("Duplicate title (benzersiz):", unique_dup_titles)
+    print("Duplicate satır (toplam):", dup_rows)
+    print("Silinecek satır (keep='last'):", to_drop_keep_last)
+
+    top_counts = (
+        dups[title_col].value_counts().head(show_top).rename("count").to_frame()
+    )
+
+    if preview_cols is None:
+        preview_cols = [
+            c
+            for c in [
+                "title",
+                "brand",
+                "price_try",
+                "platform",
+                "source_file",
+                "scraped_at",
+                "url",
+            ]
+            if c in out.columns
+        ]
+
+    sample = dups[preview_cols].head(sample_rows)
+
+    return dups, top_counts, sample
+
+
+def drop_title_duplicates(
+    df: pd.DataFrame,
+    title_col: str = "title",
+    keep: str = "last",
+    sort_by: str = "scraped_at",
+) -> tuple[pd.DataFrame, int]:
+    """
+    Title'a göre duplicate'leri siler.
+    keep='last' için scraped_at'e göre sıralayıp en yeniyi bırakır.
+    """
+    out = df.copy()
+
+    if sort_by in out.columns:
+        out[sort_by] = pd.to_datetime(out[sort_by], errors="coerce")
+        out = out.sort_values(sort_by)
+
+    before = len(out)
+    out = out.drop_duplicates(subset=[title_col], keep=keep).reset_index(drop=True)
+    removed = before - len(out)
+    return out, removed
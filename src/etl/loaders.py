@@ -1,5 +1,8 @@
 import os
+import re
 import glob
+from urllib.parse import parse_qs, unquote, urlencode, urlsplit, urlunsplit
+import numpy as np
 import pandas as pd
 
 
@@ -9,3 +12,134 @@ def load_latest_csv(pattern: str) -> tuple[str, pd.DataFrame]:
         raise FileNotFoundError(f"No files found for pattern: {pattern}")
     latest = max(files, key=os.path.getctime)
     return latest, pd.read_csv(latest).copy()
+
+
+# -----------------------------
+# Snapshot yardımcıları
+# -----------------------------
+PLATFORM_PREFIX = {"HB": "hepsiburada", "TY": "trendyol"}
+
+# satıcıyı belirleyen parametreler; geri kalan query (izleme vb.) atılır
+URL_IDENTITY_PARAMS = ("merchantId", "magaza")
+
+
+def list_snapshots(pattern: str) -> list[str]:
+    """Pattern'e uyan snapshot dosyaları, eskiden yeniye."""
+    return sorted(glob.glob(pattern), key=os.path.getctime)
+
+
+def platform_from_filename(path: str) -> str:
+    """'HB_Details_202512030147.csv' -> 'hepsiburada'."""
+    prefix = os.path.basename(path).split("_", 1)[0].upper()
+    return PLATFORM_PREFIX.get(prefix, prefix.lower())
+
+
+def snapshot_time_from_filename(path: str) -> pd.Timestamp:
+    """'..._202512030147.csv' -> Timestamp (bulunamazsa NaT)."""
+    m = re.search(r"_(\d{12})\.csv$", os.path.basename(path))
+    return pd.to_datetime(m.group(1), format="%Y%m%d%H%M") if m else pd.NaT
+
+
+def canonical_url(url) -> str | None:
+    """
+    Ürün linkini kararlı bir anahtara çevirir:
+    - reklam yönlendirmelerinden (adservice ...&redirect=...) asıl linki çıkarır
+    - izleme parametrelerini atar, sadece satıcı parametrelerini tutar
+    """
+    if pd.isna(url):
+        return None
+
+    parts = urlsplit(str(url).strip())
+    query = parse_qs(parts.query)
+    if "redirect" in query:
+        return canonical_url(unquote(query["redirect"][0]))
+
+    keep = [(k, query[k][0]) for k in URL_IDENTITY_PARAMS if k in query]
+    return urlunsplit(
+        (parts.scheme, parts.netloc.lower(), parts.path, urlencode(keep), "")
+    )
+
+
+# yönlendirme, kodlanmış/özel karakter, fragment, path'te '&' veya ikinci
+# '?' içeren linkler canonical_url'e bırakılır; gerisi vektörel yoldan geçer
+_URL_SLOW_RE = r"redirect=|[%+#;]|^[^?]*&|\?.*\?"
+
+
+def _first_param(tokens, rows, n: int, key: str):
+    """Satır başına ilk boş olmayan 'key=değer' token'ı (yoksa null)."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    prefix = key + "="
+    hit = pc.and_(
+        pc.starts_with(tokens, prefix),
+        pc.greater(pc.utf8_length(tokens), len(prefix)),
+    )
+    pos = np.flatnonzero(np.asarray(hit))
+    first_rows, first = np.unique(rows[pos], return_index=True)
+    idx = np.full(n, -1, dtype=np.int64)
+    idx[first_rows] = pos[first]
+    return pc.take(tokens, pa.array(idx, mask=idx < 0))
+
+
+def canonical_urls(urls: pd.Series) -> pd.Series:
+    """
+    urls.map(canonical_url) ile aynı sonuç, vektörel (Arrow compute):
+    link '?' ve '&' ile bölünür, query'den sadece URL_IDENTITY_PARAMS
+    seçilir; yönlendirme/kodlama içeren az sayıdaki link benzersiz değer
+    başına canonical_url ile çözülür.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if urls.empty:
+        return urls.astype("string[pyarrow]")
+
+    arr = pa.array(urls.astype("string[pyarrow]").array)
+    if isinstance(arr, pa.ChunkedArray):
+        arr = arr.combine_chunks()
+    arr = arr.cast(pa.string())
+    arr = pc.utf8_trim_whitespace(arr)
+    n = len(arr)
+
+    parts = pc.split_pattern(arr, "?", max_splits=1)
+    base = pc.list_element(parts, 0)
+    offsets = parts.offsets.to_numpy()[:-1]
+    has_q = np.flatnonzero(
+        np.asarray(pc.fill_null(pc.list_value_length(parts), 0)) == 2
+    )
+    query = pc.list_flatten(parts).take(pa.array(offsets[has_q] + 1 - offsets[0]))
+
+    pairs = pc.split_pattern(query, "&")
+    tokens = pc.list_flatten(pairs)
+    rows = has_q[pc.list_parent_indices(pairs).to_numpy()]
+
+    picked = [
+        pc.fill_null(_first_param(tokens, rows, n, k), "") for k in URL_IDENTITY_PARAMS
+    ]
+    q = pc.binary_join_element_wise(*picked, "&")
+    q = pc.replace_substring_regex(q, "^&+|&+$", "")
+    q = pc.replace_substring_regex(q, "&&+", "&")
+    out = pc.if_else(pc.equal(q, ""), base, pc.binary_join_element_wise(base, q, "?"))
+
+    # host'ta büyük harf varsa da yavaş yol ("///" eki: şemasız/kısa
+    # linklerde de en az 3 parça olsun)
+    padded = pc.binary_join_element_wise(base, "///", "")
+    host = pc.list_element(pc.split_pattern(padded, "/", max_splits=3), 2)
+    slow = pc.or_(
+        pc.not_equal(host, pc.utf8_lower(host)),
+        pc.match_substring_regex(arr, _URL_SLOW_RE),
+    )
+    slow = np.asarray(pc.fill_null(slow, False))
+
+    out = pd.Series(
+        pd.arrays.ArrowStringArray(out.cast(pa.large_string())),
+        index=urls.index,
+        name=urls.name,
+    )
+    if slow.any():
+        s = urls.astype("string[pyarrow]").str.strip()
+        uniq = s[slow].unique()
+        fixed = dict(zip(uniq, (canonical_url(u) for u in uniq)))
+        out[slow] = s[slow].map(fixed)
+    return out.where(urls.notna(), None)
@@ -0,0 +1,272 @@
+from __future__ import annotations
+import re
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+# -----------------------------
+# Model kodu (başlıktan)
+# -----------------------------
+# harf + rakam karışık, en az 6 karakterlik token: 82xb009gtx, a13ve-1252xtr, nh.qnbey.001
+CODE_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9.\-/]{4,}[a-z0-9]")
+
+# model kodu olmayan ama harf+rakam içeren spec token'ları
+NON_CODE_RE = re.compile(
+    r"^(?:"
+    r"\d+(?:gb|tb|hz|w|mhz|ghz|inc|inch|nesil)"  # 512gb, 144hz, 60w
+    r"|(?:rtx|gtx|mx)\d+(?:ti)?"  # rtx4050
+    r"|i[3579]\d{4,5}[a-z]{0,2}"  # i5-13420h (ayraç silindikten sonra)
+    r"|\d{4,5}[a-z]{1,2}"  # 13420h, 7735hs
+    r"|(?:ddr|lpddr|gddr)\d+x?"
+    r"|w(?:in)?1[01]\w*"
+    r")$"
+)
+
+
+def _model_codes(title) -> list[str]:
+    if pd.isna(title):
+        return []
+    out = []
+    for tok in CODE_TOKEN_RE.findall(str(title).lower()):
+        code = re.sub(r"[.\-/]", "", tok)
+        if len(code) < 6 or not re.search(r"\d", code) or not re.search(r"[a-z]", code):
+            continue
+        if NON_CODE_RE.match(code):
+            continue
+        out.append(code)
+    return out
+
+
+def extract_model_codes(title_series: pd.Series) -> pd.Series:
+    """Başlıktaki üretici model kodlarını liste olarak döndürür."""
+    return title_series.apply(_model_codes)
+
+
+# -----------------------------
+# Blocking
+# -----------------------------
+SPEC_BLOCK_COLS = ["brand", "cpu_family", "ram_gb", "ssd_gb"]
+REFINE_BLOCK_COLS = ["gpu_model", "screen_size_inch"]
+AGREE_COLS = [
+    "gpu_model",
+    "screen_size_inch",
+    "cpu_generation",
+    "resolution",
+    "gpu_vram_gb",
+]
+
+
+def _key(df: pd.DataFrame, cols: list[str]) -> pd.Series:
+    parts = [
+        (
+            df[c].astype("string").fillna("?")
+            if c in df.columns
+            else pd.Series("?", index=df.index)
+        )
+        for c in cols
+    ]
+    key = parts[0]
+    for p in parts[1:]:
+        key = key + "|" + p
+    return key
+
+
+def blocking_keys(df: pd.DataFrame, max_block_size: int = 200) -> pd.DataFrame:
+    """
+    (row, block) tablosu döndürür. Her satır iki tür bloğa girer:
+      - spec bloğu: brand + cpu_family + ram_gb + ssd_gb (büyükse gpu/ekranla bölünür)
+      - kod bloğu: başlıktaki her model kodu
+    Tamamen boş spec anahtarları (marka yok) bloklanmaz.
+    """
+    spec = _key(df, SPEC_BLOCK_COLS)
+    sizes = spec.map(spec.value_counts())
+    big = sizes > max_block_size
+    spec = spec.where(~big, spec + "|" + _key(df, REFINE_BLOCK_COLS))
+
+    valid = (
+        df["brand"].notna()
+        if "brand" in df.columns
+        else pd.Series(False, index=df.index)
+    )
+    spec_rows = pd.DataFrame(
+        {
+            "row": np.flatnonzero(valid.to_numpy()),
+            "block": "s:" + spec[valid].to_numpy(),
+        }
+    )
+
+    codes = extract_model_codes(df["title"]).reset_index(drop=True).explode().dropna()
+    code_rows = pd.DataFrame(
+        {"row": codes.index.to_numpy(), "block": "c:" + codes.astype(str).to_numpy()}
+    )
+
+    return pd.concat([spec_rows, code_rows], ignore_index=True)
+
+
+def candidate_pairs(
+    blocks: pd.DataFrame,
+    side: np.ndarray,
+    max_block_size: int = 200,
+) -> pd.DataFrame:
+    """
+    Aynı blokta, farklı taraftaki (side=0 sol / 1 sağ) satır çiftleri.
+    Çok büyük bloklar (ör. jenerik kod) atlanır; çiftler tekilleştirilir.
+    Atlananlar attrs["blocking"]'de: dropped_blocks, dropped_block_rows
+    (atlanan bloklardaki satır girdileri) ve unblocked_rows (tüm blokları
+    atlandığı için hiç aday çifti olamayan satırlar).
+    """
+    b = blocks.assign(side=side[blocks["row"].to_numpy()])
+    counts = b.groupby("block")["row"].transform("size")
+    small = counts <= max_block_size
+    summary = {
+        "blocks": int(b["block"].nunique()),
+        "dropped_blocks": int(b.loc[~small, "block"].nunique()),
+        "dropped_block_rows": int((~small).sum()),
+        "unblocked_rows": int(
+            b.loc[b["side"] >= 0, "row"].nunique()
+            - b.loc[small & (b["side"] >= 0), "row"].nunique()
+        ),
+    }
+    b = b[small]
+
+    left = b[b["side"] == 0][["block", "row"]]
+    right = b[b["side"] == 1][["block", "row"]]
+    pairs = left.merge(right, on="block", suffixes=("_l", "_r"))
+
+    pairs["code_block"] = pairs["block"].str.startswith("c:")
+    out = (
+        pairs.groupby(["row_l", "row_r"], sort=False)["code_block"]
+        .any()
+        .reset_index()
+        .rename(columns={"code_block": "code_match"})
+    )
+    out.attrs["blocking"] = summary
+    return out
+
+
+# -----------------------------
+# Skorlama
+# -----------------------------
+def _title_text(df: pd.DataFrame) -> pd.Series:
+    brand = df["brand"].astype("string").fillna("") if "brand" in df.columns else ""
+    return (brand + " " + df["title"].astype("string").fillna("")).str.lower()
+
+
+def _rowwise_cosine(
+    X, i: np.ndarray, j: np.ndarray, chunk: int = 200_000
+) -> np.ndarray:
+    """L2-normalize sparse satır çiftlerinin cosine'ı (çiftler üzerinde vektörel)."""
+    out = np.empty(len(i))
+    for s in range(0, len(i), chunk):
+        a = X[i[s : s + chunk]]
+        b = X[j[s : s + chunk]]
+        out[s : s + chunk] = np.asarray(a.multiply(b).sum(axis=1)).ravel()
+    return out
+
+
+def _spec_agreement(df: pd.DataFrame, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+    agree = np.zeros(len(i))
+    known = np.zeros(len(i))
+    for c in AGREE_COLS:
+        if c not in df.columns:
+            continue
+        codes, _ = pd.factorize(df[c].astype("string"))
+        a, b = codes[i], codes[j]
+        both = (a >= 0) & (b >= 0)
+        known += both
+        agree += both & (a == b)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(known > 0, agree / known, 0.5)
+
+
+def match_listings(
+    df: pd.DataFrame,
+    left_platform: str = "trendyol",
+    right_platform: str = "hepsiburada",
+    min_confidence: float = 0.55,
+    max_block_size: int = 200,
+    one_to_one: bool = True,
+) -> pd.DataFrame:
+    """
+    İki platform arasında aynı laptopu eşleştirir.
+
+    df: laptop_data_processed formatında (title, brand, platform, url, spec kolonları).
+    Sadece ortak bloktaki (spec anahtarı veya model kodu) çiftler skorlanır;
+    toplam iş ~ blok boyutlarının karesi toplamı, n² değil.
+
+    confidence = 0.5 * title cosine (char 3-gram tf-idf)
+               + 0.3 * model kodu eşleşmesi
+               + 0.2 * spec uyumu (gpu, ekran, nesil, çözünürlük, vram)
+
+    Sonucun attrs["summary"]'si: candidate_pairs, matches ve max_block_size'ı
+    aştığı için atlanan bloklar / satırlar (bkz. candidate_pairs).
+    """
+    df = df.reset_index(drop=True)
+    platform = df["platform"].astype("string").str.lower()
+    keep = platform.isin([left_platform, right_platform]).to_numpy()
+    side = np.where(platform == right_platform, 1, 0)
+    side = np.where(keep, side, -1)
+
+    blocks = blocking_keys(df, max_block_size=max_block_size)
+    pairs = candidate_pairs(blocks, side, max_block_size=max_block_size)
+
+    cols = [
+        "left_idx",
+        "right_idx",
+        "left_url",
+        "right_url",
+        "left_title",
+        "right_title",
+        "title_sim",
+        "code_match",
+        "spec_agree",
+        "confidence",
+    ]
+    summary = {**pairs.attrs["blocking"], "candidate_pairs": int(len(pairs))}
+    if pairs.empty:
+        empty = pd.DataFrame(columns=cols)
+        empty.attrs["summary"] = {**summary, "matches": 0}
+        return empty
+
+    i = pairs["row_l"].to_numpy()
+    j = pairs["row_r"].to_numpy()
+
+    X = TfidfVectorizer(
+        analyzer="char_wb", ngram_range=(3, 3), dtype=np.float32
+    ).fit_transform(_title_text(df))
+    title_sim = _rowwise_cosine(X, i, j)
+    spec_agree = _spec_agreement(df, i, j)
+    code = pairs["code_match"].to_numpy(dtype=float)
+
+    out = pd.DataFrame(
+        {
+            "left_idx": i,
+            "right_idx": j,
+            "left_url": df["url"].to_numpy()[i],
+            "right_url": df["url"].to_numpy()[j],
+            "left_title": df["title"].to_numpy()[i],
+            "right_title": df["title"].to_numpy()[j],
+            "title_sim": title_sim,
+            "code_match": code.astype(bool),
+            "spec_agree": spec_agree,
+            "confidence": 0.5 * title_sim + 0.3 * code + 0.2 * spec_agree,
+        }
+    )
+    out = out[out["confidence"] >= min_confidence].sort_values(
+        "confidence", ascending=False
+    )
+
+    if one_to_one:
+        # greedy: en yüksek güvenli çiftten başla, iki taraf da bir kez kullanılır
+        used_l, used_r, keep_rows = set(), set(), []
+        for r, li, ri in zip(out.index, out["left_idx"], out["right_idx"]):
+            if li in used_l or ri in used_r:
+                continue
+            used_l.add(li)
+            used_r.add(ri)
+            keep_rows.append(r)
+        out = out.loc[keep_rows]
+
+    out = out[cols].reset_index(drop=True)
+    out.attrs["summary"] = {**summary, "matches": int(len(out))}
+    return out
@@ -0,0 +1,93 @@
+from __future__ import annotations
+import os
+import pandas as pd
+
+from src.etl.title_extractors import (
+    extract_ram_from_title,
+    extract_refresh_rate_from_title,
+    extract_screen_feature_from_title,
+    extract_ssd_from_title,
+    fill_column_from_title,
+)
+
+# -----------------------------
+# Kolon eşlemeleri
+# -----------------------------
+# Hepsiburada kolonu -> Trendyol kolonu (Trendyol kolon sırası şablondur)
+HB_TO_TY = {
+    "İşlemci": "İşlemci Modeli",
+    "Maksimum İşlemci Hızı": "Maksimum İşlemci Hızı (GHz)",
+    "Ram Tipi": "Ram (Sistem Belleği) Tipi",
+    "Harddisk Kapasitesi": "Hard Disk Kapasitesi",
+    "Max Ekran Çözünürlüğü": "Çözünürlük",
+    "Ekran Özelliği": "Çözünürlük Standartı",
+    "Ekran Panel Tipi": "Panel Tipi",
+}
+
+COLS_EN = {
+    "Başlık": "title",
+    "Marka": "brand",
+    "Kullanım Amacı": "intended_use",
+    "Renk": "color",
+    "Cihaz Ağırlığı": "weight",
+    "İşlemci Tipi": "cpu_family",
+    "İşlemci Modeli": "cpu_model",
+    "İşlemci Nesli": "cpu_generation",
+    "İşlemci Çekirdek Sayısı": "cpu_cores",
+    "Maksimum İşlemci Hızı (GHz)": "cpu_max_ghz",
+    "Ram (Sistem Belleği)": "ram_gb",
+    "Ram (Sistem Belleği) Tipi": "ram_type",
+    "Ekran Kartı": "gpu_model",
+    "Ekran Kartı Tipi": "gpu_type",
+    "Ekran Kartı Hafızası": "gpu_vram_gb",
+    "Ekran Kartı Bellek Tipi": "gpu_vram_type",
+    "SSD Kapasitesi": "ssd_gb",
+    "Hard Disk Kapasitesi": "hdd_gb",
+    "Ekran Boyutu": "screen_size_inch",
+    "Çözünürlük": "resolution",
+    "Çözünürlük Standartı": "display_standard",
+    "Ekran Yenileme Hızı": "refresh_rate_hz",
+    "Panel Tipi": "panel_type",
+    "İşletim Sistemi": "operating_system",
+    "Çekilme Zamanı": "scraped_at",
+    "Fiyat (TRY)": "price_try",
+    "Link": "url",
+    "Platform": "platform",
+    "KaynakDosya": "source_file",
+}
+
+# Hepsiburada'da boş gelen spec'ler başlıktan doldurulur: kolon -> extractor
+HB_TITLE_FILLS = {
+    "Ram (Sistem Belleği)": extract_ram_from_title,
+    "SSD Kapasitesi": extract_ssd_from_title,
+    "Ekran Yenileme Hızı": extract_refresh_rate_from_title,
+    "Ekran Özelliği": extract_screen_feature_from_title,
+}
+
+
+def fill_hb_from_title(hb: pd.DataFrame, title_col: str = "Başlık") -> pd.DataFrame:
+    for col, extractor in HB_TITLE_FILLS.items():
+        hb = fill_column_from_title(hb, title_col, col, extractor)
+    return hb
+
+
+def merge_ty_hb(
+    ty: pd.DataFrame, hb: pd.DataFrame, latest_ty_file: str, latest_hb_file: str
+) -> pd.DataFrame:
+    ty = ty.copy()
+    hb = hb.copy()
+
+    ty["Platform"], hb["Platform"] = "Trendyol", "Hepsiburada"
+    ty["KaynakDosya"] = os.path.basename(latest_ty_file)
+    hb["KaynakDosya"] = os.path.basename(latest_hb_file)
+
+    cols = list(ty.columns)  # Trendyol kolon sırası = şablon
+
+    hb = hb.rename(columns=HB_TO_TY).reindex(columns=cols)
+    ty = ty.reindex(columns=cols)
+
+    return pd.concat([ty, hb], ignore_index=True)
+
+
+def to_english_columns(df: pd.DataFrame) -> pd.DataFrame:
+    return df.rename(columns=COLS_EN)
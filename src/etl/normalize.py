@@ -0,0 +1,170 @@
+from __future__ import annotations
+import numpy as np
+import pandas as pd
+
+from src.etl.column_parsers import (
+    parse_brand,
+    parse_capacity_gb,
+    parse_color,
+    parse_core_count,
+    parse_cpu_family,
+    parse_cpu_generation,
+    parse_display_standard,
+    parse_gpu_memory,
+    parse_gpu_model,
+    parse_gpu_type,
+    parse_gpu_vram_type,
+    parse_intended_use,
+    parse_max_cpu_freq,
+    parse_operating_system,
+    parse_panel_type,
+    parse_price_try,
+    parse_ram_size,
+    parse_ram_type,
+    parse_refresh_rate,
+    parse_resolution,
+    parse_screen_size,
+    parse_weight,
+)
+
+# column_parsers._na_if_invalid ile aynı küme
+NA_TOKENS = ["", "nan", "none", "null", "-", "yok", "belirtilmemiş", "belirtilmemis"]
+
+# Python'daki \s (unicode) karşılığı; RE2'de \s sadece ASCII boşlukları kapsar
+_WS_RE2 = r"[\s\p{Z}\x{85}\x{1c}-\x{1f}]+"
+
+ENGINES = ("python", "arrow")
+
+
+def text_columns(df: pd.DataFrame) -> list[str]:
+    return list(df.select_dtypes(include=["object", "string"]).columns)
+
+
+# -----------------------------
+# Normalizasyon
+# -----------------------------
+def _normalize_python(s: pd.Series) -> pd.Series:
+    s = s.astype("string").str.strip().str.replace(r"\s+", " ", regex=True).str.lower()
+    return s.mask(s.isin(NA_TOKENS), pd.NA)
+
+
+def _normalize_arrow(s: pd.Series) -> pd.Series:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    arr = pa.array(s.astype("string[pyarrow]").array)
+    if isinstance(arr, pa.ChunkedArray):
+        arr = arr.combine_chunks()
+
+    # kernel'lar sadece sözlükteki benzersiz değerlere uygulanır, sonra take
+    enc = pc.dictionary_encode(arr)
+    d = pc.utf8_trim_whitespace(enc.dictionary)
+    d = pc.replace_substring_regex(d, _WS_RE2, " ")
+    d = pc.utf8_lower(d)
+    d = pc.if_else(pc.is_in(d, pa.array(NA_TOKENS)), None, d)
+    out = pc.take(d, enc.indices)
+
+    return pd.Series(pd.arrays.ArrowStringArray(out), index=s.index, name=s.name)
+
+
+def normalize_df_inplace(df: pd.DataFrame, engine: str = "python") -> pd.DataFrame:
+    """
+    Tüm object/string kolonlarda: strip + boşlukları tekle + küçük harf
+    + NA_TOKENS -> NA.
+
+    engine='python': pandas string dtype, kolon kolon .str zinciri (eski davranış).
+    engine='arrow' : kolonlar string[pyarrow] olarak tutulur; her kolon
+                     dictionary_encode edilir, strip/regex/lower/NA maskesi
+                     Arrow compute kernel'larıyla sadece sözlüğe uygulanır.
+                     Not: utf8_lower 'İ' -> 'i' verir (Python 'i̇' üretir).
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine: {engine}")
+
+    fn = _normalize_arrow if engine == "arrow" else _normalize_python
+    for c in text_columns(df):
+        df[c] = fn(df[c])
+    return df
+
+
+# etl.ipynb'deki kolon -> (parser, min/max) eşlemesi (İngilizce kolon adlarıyla)
+DEFAULT_PARSERS = {
+    # string / object standardizasyonları
+    "brand": parse_brand,
+    "intended_use": parse_intended_use,
+    "color": parse_color,
+    "weight": parse_weight,
+    "cpu_family": parse_cpu_family,
+    "ram_type": parse_ram_type,
+    "gpu_model": parse_gpu_model,
+    "gpu_type": parse_gpu_type,
+    "gpu_vram_type": parse_gpu_vram_type,
+    "resolution": (
+        parse_resolution,
+        {"min_w": 800, "min_h": 500, "max_w": 10000, "max_h": 10000},
+    ),
+    "display_standard": parse_display_standard,
+    "panel_type": parse_panel_type,
+    "operating_system": parse_operating_system,
+    # numeric / format
+    "cpu_generation": (parse_cpu_generation, {"min_gen": 1, "max_gen": 15}),
+    "cpu_cores": (parse_core_count, {"min_core": 1, "max_core": 24}),
+    "cpu_max_ghz": (parse_max_cpu_freq, {"min_freq": 1.0, "max_freq": 6.0}),
+    "ram_gb": (parse_ram_size, {"min_ram": 4, "max_ram": 256}),
+    "gpu_vram_gb": (
+        parse_gpu_memory,
+        {"min_value": 0, "max_value": 32, "shared_value": 0},
+    ),
+    "ssd_gb": (parse_capacity_gb, {"min_value": 32, "max_value": 8192}),
+    "hdd_gb": (parse_capacity_gb, {"min_value": 32, "max_value": 8192}),
+    "screen_size_inch": (parse_screen_size, {"min_value": 7.0, "max_value": 20.0}),
+    "refresh_rate_hz": (parse_refresh_rate, {"min_value": 30, "max_value": 360}),
+    "price_try": (parse_price_try, {"min_value": 1000, "max_value": 1000000}),
+}
+
+
+# -----------------------------
+# Parser uygulama
+# -----------------------------
+def apply_parser_unique(s: pd.Series, fn, **kwargs) -> pd.Series:
+    """
+    fn'i sadece benzersiz değerlere uygular ve sonucu satırlara yayar.
+
+    Girdi normalize edildiyse (büyük/küçük harf, boşluk varyantları tek değere
+    inmiş olur) benzersiz değer sayısı satır sayısından çok küçüktür; parser'ın
+    regex/normalizasyon maliyeti satır başına değil değer başına ödenir.
+    Sonuç df[col].apply(lambda x: fn(x, **kwargs)) ile aynıdır.
+    """
+    codes, uniques = pd.factorize(s, use_na_sentinel=True)
+    results = [fn(u, **kwargs) for u in uniques] + [fn(pd.NA, **kwargs)]
+
+    if all(
+        isinstance(r, (int, float, np.number)) and not isinstance(r, bool)
+        for r in results
+    ):
+        table = np.asarray(results, dtype=float)
+        return pd.Series(table[codes], index=s.index, name=s.name)
+
+    table = np.empty(len(results), dtype=object)
+    table[:] = results
+    out = pd.Series(table[codes], index=s.index, name=s.name)
+    if isinstance(s.dtype, pd.StringDtype) and all(
+        isinstance(r, str) or r is pd.NA for r in results
+    ):
+        # string[pyarrow] girdiden string[pyarrow] çıktı
+        out = out.astype(s.dtype)
+    return out
+
+
+def parse_columns(df: pd.DataFrame, parsers: dict | None = None) -> pd.DataFrame:
+    """
+    parsers: {kolon: fn} veya {kolon: (fn, kwargs)}.
+    Kolon yoksa atlar; her kolon apply_parser_unique ile işlenir.
+    parsers verilmezse DEFAULT_PARSERS kullanılır.
+    """
+    for col, spec in (parsers or DEFAULT_PARSERS).items():
+        if col not in df.columns:
+            continue
+        fn, kwargs = spec if isinstance(spec, tuple) else (spec, {})
+        df[col] = apply_parser_unique(df[col], fn, **kwargs)
+    return df
@@ -0,0 +1,304 @@
+from __future__ import annotations
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import ModuleType
+from typing import Callable
+
+import pandas as pd
+
+from src.etl import column_parsers, filters, loaders, merge, normalize, title_extractors
+from src.etl.filters import drop_apple, drop_title_duplicates
+from src.etl.merge import fill_hb_from_title, merge_ty_hb, to_english_columns
+from src.etl.normalize import normalize_df_inplace, parse_columns
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+HB_PATTERN = str(PROJECT_ROOT / "data" / "scrapped" / "HB_Details_*.csv")
+TY_PATTERN = str(PROJECT_ROOT / "data" / "scrapped" / "TY_Details_*.csv")
+OUTPUT_PATH = str(PROJECT_ROOT / "data" / "processed" / "laptop_data_processed.csv")
+CACHE_DIR = str(PROJECT_ROOT / "data" / "cache" / "etl")
+
+
+# -----------------------------
+# Hash yardımcıları
+# -----------------------------
+def _sha(*parts: str) -> str:
+    h = hashlib.sha256()
+    for p in parts:
+        h.update(p.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()[:16]
+
+
+def file_digest(path: str, chunk: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(chunk):
+            h.update(block)
+    return h.hexdigest()[:16]
+
+
+def code_digest(modules: tuple[ModuleType, ...]) -> str:
+    """Stage'in bağlı olduğu modüllerin kaynak kodu -> kod versiyonu."""
+    return _sha(*(inspect.getsource(m) for m in modules))
+
+
+# -----------------------------
+# Stage / Pipeline
+# -----------------------------
+@dataclass
+class Stage:
+    """
+    fn(*deps çıktıları, **params) -> DataFrame.
+    code: kaynağı değişince stage'i geçersiz kılan modüller.
+    source: dosyadan okuyan stage'ler için dosya yolu (içerik hash'i anahtara girer).
+    """
+
+    name: str
+    fn: Callable[..., pd.DataFrame]
+    deps: tuple[str, ...] = ()
+    code: tuple[ModuleType, ...] = ()
+    params: dict = field(default_factory=dict)
+    source: str | None = None
+
+
+class Pipeline:
+    """
+    İsimli stage'lerden oluşan DAG; her stage çıktısı pickle olarak
+    cache_dir/<stage>/<anahtar>.pkl altında tutulur. (Ara çıktılarda
+    str/float karışık object kolonlar olduğu için parquet yerine pickle:
+    dtype'lar birebir geri gelir.)
+
+    anahtar = hash(stage adı, kod versiyonu, params, kaynak dosya içeriği,
+                   upstream anahtarları)
+
+    Anahtarlar veri okunmadan yukarıdan aşağı hesaplanır; çalıştırma hedef
+    stage'den geriye doğru gider ve cache'i olan ilk stage'de durur. Böylece
+    sadece değişen stage ve onun downstream'i yeniden çalışır.
+    """
+
+    def __init__(self, stages: list[Stage], cache_dir: str = CACHE_DIR):
+        self.stages = {s.name: s for s in stages}
+        self.cache_dir = Path(cache_dir)
+        self._keys: dict[str, str] = {}
+
+    def key(self, name: str) -> str:
+        if name not in self._keys:
+            st = self.stages[name]
+            self._keys[name] = _sha(
+                st.name,
+                code_digest(st.code),
+                json.dumps(st.params, sort_keys=True, default=str),
+                file_digest(st.source) if st.source else "",
+                *(self.key(d) for d in st.deps),
+            )
+        return self._keys[name]
+
+    def _path(self, name: str) -> Path:
+        return self.cache_dir / name / f"{self.key(name)}.pkl"
+
+    def _execute(self, st: Stage, inputs: list[pd.DataFrame]) -> pd.DataFrame:
+        return st.fn(*inputs, **st.params)
+
+    def _downstream(self, names: tuple[str, ...]) -> set[str]:
+        out = set(names)
+        for name, st in self.stages.items():  # stage'ler topolojik sırada
+            if out.intersection(st.deps):
+                out.add(name)
+        return out
+
+    def run(
+        self, target: str | None = None, force: tuple[str, ...] = ()
+    ) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        target stage'in çıktısını döndürür (varsayılan: son stage).
+        force: cache'e bakılmadan yeniden çalıştırılacak stage'ler
+               (downstream'leri de yeniden çalışır); bilinmeyen ad ValueError.
+        Dönen ikinci tablo stage başına rapor: status (cached/ran), saniye, satır.
+        """
+        unknown = [name for name in force if name not in self.stages]
+        if unknown:
+            raise ValueError(
+                f"Unknown stage(s) to force: {', '.join(unknown)} "
+                f"(valid: {', '.join(self.stages)})"
+            )
+        target = target or list(self.stages)[-1]
+        report, memo = [], {}
+        stale = self._downstream(force)
+
+        def _get(name: str) -> pd.DataFrame:
+            if name in memo:
+                return memo[name]
+            st = self.stages[name]
+            path = self._path(name)
+
+            t0 = time.perf_counter()
+            if path.exists() and name not in stale:
+                out, status = pd.read_pickle(path), "cached"
+            else:
+                inputs = [_get(d) for d in st.deps]
+                t0 = time.perf_counter()
+                out, status = self._execute(st, inputs), "ran"
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix(".tmp")
+                out.to_pickle(tmp)
+                os.replace(tmp, path)
+
+            report.append(
+                {
+                    "stage": name,
+                    "status": status,
+                    "seconds": round(time.perf_counter() - t0, 3),
+                    "rows": len(out),
+                    "key": self.key(name),
+                }
+            )
+            memo[name] = out
+            return out
+
+        out = _get(target)
+        return out, pd.DataFrame(report)
+
+
+# -----------------------------
+# Stage fonksiyonları
+# -----------------------------
+def _read_csv(path: str) -> pd.DataFrame:
+    return pd.read_csv(path)
+
+
+def _merge(ty: pd.DataFrame, hb: pd.DataFrame, ty_file: str, hb_file: str):
+    return to_english_columns(merge_ty_hb(ty, hb, ty_file, hb_file))
+
+
+def _normalize(df: pd.DataFrame, engine: str) -> pd.DataFrame:
+    return normalize_df_inplace(df, engine=engine)
+
+
+def _filter(df: pd.DataFrame) -> pd.DataFrame:
+    df, _ = drop_apple(df)
+    df, _ = drop_title_duplicates(df, keep="last")
+    return df
+
+
+def _parse(df: pd.DataFrame) -> pd.DataFrame:
+    return parse_columns(df)
+
+
+def _latest(pattern: str) -> str:
+    """load_latest_csv ile aynı seçim (en yeni ctime), dosyayı okumadan."""
+    files = loaders.list_snapshots(pattern)
+    if not files:
+        raise FileNotFoundError(f"No files found for pattern: {pattern}")
+    return files[-1]
+
+
+def build_etl_pipeline(
+    hb_pattern: str = HB_PATTERN,
+    ty_pattern: str = TY_PATTERN,
+    cache_dir: str = CACHE_DIR,
+    engine: str = "arrow",
+) -> Pipeline:
+    """etl.ipynb'deki akışın stage'lere bölünmüş hali (en yeni HB/TY snapshot'ı)."""
+    hb_file = _latest(hb_pattern)
+    ty_file = _latest(ty_pattern)
+
+    stages = [
+        Stage("load_hb", _read_csv, params={"path": hb_file}, source=hb_file),
+        Stage("load_ty", _read_csv, params={"path": ty_file}, source=ty_file),
+        Stage(
+            "fill_hb",
+            fill_hb_from_title,
+            deps=("load_hb",),
+            code=(title_extractors, merge),
+        ),
+        Stage(
+            "merge",
+            _merge,
+            deps=("load_ty", "fill_hb"),
+            code=(merge,),
+            params={
+                "ty_file": os.path.basename(ty_file),
+                "hb_file": os.path.basename(hb_file),
+            },
+        ),
+        Stage(
+            "normalize",
+            _normalize,
+            deps=("merge",),
+            code=(normalize,),
+            params={"engine": engine},
+        ),
+        Stage("filter", _filter, deps=("normalize",), code=(filters,)),
+        Stage("parse", _parse, deps=("filter",), code=(column_parsers, normalize)),
+    ]
+    return Pipeline(stages, cache_dir=cache_dir)
+
+
+def run_etl(
+    output: str | None = OUTPUT_PATH,
+    force: tuple[str, ...] = (),
+    **kwargs,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Pipeline'ı çalıştırır, sonucu output'a (csv) yazar; (df, rapor) döndürür."""
+    df, report = build_etl_pipeline(**kwargs).run(force=force)
+    if output:
+        df.to_csv(output, index=False)
+    return df, report
+
+
+def main(argv: list[str] | None = None) -> None:
+    p = argparse.ArgumentParser(description="Laptop ETL pipeline (stage cache'li)")
+    p.add_argument("--hb", default=HB_PATTERN, help="HB snapshot glob pattern")
+    p.add_argument("--ty", default=TY_PATTERN, help="TY snapshot glob pattern")
+    p.add_argument("--out", default=OUTPUT_PATH, help="Çıktı csv yolu")
+    p.add_argument("--cache-dir", default=CACHE_DIR)
+    p.add_argument("--engine", default="arrow", choices=normalize.ENGINES)
+    p.add_argument(
+        "--force", nargs="*", default=[], help="Cache'e bakmadan çalışacak stage'ler"
+    )
+    p.add_argument(
+        "--profile",
+        metavar="JSON",
+        default=None,
+        help="Parser/extractor/stage profili (tüm stage'ler yeniden çalışır)",
+    )
+    args = p.parse_args(argv)
+
+    kwargs = dict(
+        hb_pattern=args.hb,
+        ty_pattern=args.ty,
+        cache_dir=args.cache_dir,
+        engine=args.engine,
+    )
+    force = tuple(args.force)
+
+    if args.profile:
+        # python -m ile çalışınca bu dosya __main__ olur; profiler'ın patch'lediği
+        # Pipeline sınıfı src.etl.pipeline'daki olduğu için oradan çağrılır
+        from src.etl import pipeline as etl_pipeline
+        from src.etl.profiling import ETLProfiler
+
+        # cache'ten gelen stage'lerde ölçülecek bir şey yok; load'lar (ve
+        # bağımlıları) zorlanır, kullanıcının --force listesi korunur
+        force = tuple(dict.fromkeys(force + ("load_hb", "load_ty")))
+        with ETLProfiler(memory=True) as prof:
+            _, report = etl_pipeline.run_etl(output=args.out, force=force, **kwargs)
+        print(prof.to_text())
+        prof.to_json(args.profile)
+        print("Profil:", args.profile)
+    else:
+        _, report = run_etl(output=args.out, force=force, **kwargs)
+
+    print(report.to_string(index=False))
+    print("Çıktı:", args.out)
+
+
+if __name__ == "__main__":
+    main()
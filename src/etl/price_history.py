@@ -0,0 +1,260 @@
+from __future__ import annotations
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.etl.column_parsers import parse_price_try
+from src.etl.loaders import (
+    canonical_url,
+    canonical_urls,
+    list_snapshots,
+    platform_from_filename,
+    snapshot_time_from_filename,
+)
+
+
+# -----------------------------
+# Yardımcılar
+# -----------------------------
+def product_ids(platform: pd.Series, url: pd.Series) -> np.ndarray:
+    """(platform, canonical url) -> uint64 ürün kimliği."""
+    keys = (platform.astype(str) + "|" + url.astype(str)).to_numpy(dtype=object)
+    return pd.util.hash_array(keys)
+
+
+def _write_parquet(df: pd.DataFrame, path: Path) -> None:
+    """Yarım dosya kalmasın diye önce tmp'ye yazıp atomik olarak taşır."""
+    tmp = path.with_suffix(".tmp")
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+
+
+def _daily_rollup(obs: pd.DataFrame) -> pd.DataFrame:
+    """Gözlemler -> (product_id, day) başına min/max/last/n."""
+    obs = obs.sort_values("ts", kind="stable")
+    obs = obs.assign(day=obs["ts"].dt.normalize())
+    g = obs.groupby(["product_id", "day"], sort=False)
+    return g.agg(
+        min=("price", "min"),
+        max=("price", "max"),
+        last=("price", "last"),
+        last_ts=("ts", "last"),
+        n=("price", "size"),
+    ).reset_index()
+
+
+def _merge_rollups(old: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+    both = pd.concat([old, new], ignore_index=True).sort_values(
+        "last_ts", kind="stable"
+    )
+    g = both.groupby(["product_id", "day"], sort=False)
+    return (
+        g.agg(
+            min=("min", "min"),
+            max=("max", "max"),
+            last=("last", "last"),
+            last_ts=("last_ts", "last"),
+            n=("n", "sum"),
+        )
+        .reset_index()
+        .sort_values(["product_id", "day"])
+        .reset_index(drop=True)
+    )
+
+
+# -----------------------------
+# Store
+# -----------------------------
+class PriceHistoryStore:
+    """
+    (platform, url) anahtarlı, sadece eklenen (append-only) fiyat geçmişi.
+
+    Dizin yapısı:
+      manifest.json                   -> işlenmiş snapshot dosyaları
+      products.parquet                -> product_id, platform, url, first_seen, last_seen
+      observations/<platform>/*.parquet -> her snapshot için product_id, ts, price
+      daily.parquet                   -> (product_id, day) başına min/max/last/n
+
+    Sorgular sadece products + daily üzerinden çalışır; snapshot csv'leri
+    ya da ham gözlemler taranmaz.
+    """
+
+    def __init__(self, root: str = "../data/price_history"):
+        self.root = Path(root)
+        (self.root / "observations").mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.root / "manifest.json"
+        self.products_path = self.root / "products.parquet"
+        self.daily_path = self.root / "daily.parquet"
+
+        self.manifest = (
+            json.loads(self.manifest_path.read_text(encoding="utf-8"))
+            if self.manifest_path.exists()
+            else {"ingested": {}}
+        )
+
+    # ---- okuma ----
+    def products(self) -> pd.DataFrame:
+        if not self.products_path.exists():
+            return pd.DataFrame(
+                {
+                    "product_id": pd.Series(dtype="uint64"),
+                    "platform": pd.Series(dtype="string"),
+                    "url": pd.Series(dtype="string"),
+                    "first_seen": pd.Series(dtype="datetime64[ns]"),
+                    "last_seen": pd.Series(dtype="datetime64[ns]"),
+                }
+            )
+        return pd.read_parquet(self.products_path)
+
+    def daily(self) -> pd.DataFrame:
+        if not self.daily_path.exists():
+            return pd.DataFrame(
+                {
+                    "product_id": pd.Series(dtype="uint64"),
+                    "day": pd.Series(dtype="datetime64[ns]"),
+                    "min": pd.Series(dtype="float32"),
+                    "max": pd.Series(dtype="float32"),
+                    "last": pd.Series(dtype="float32"),
+                    "last_ts": pd.Series(dtype="datetime64[ns]"),
+                    "n": pd.Series(dtype="int64"),
+                }
+            )
+        return pd.read_parquet(self.daily_path)
+
+    # ---- yazma ----
+    def ingest(self, path: str, platform: str | None = None) -> int:
+        """
+        Tek bir HB_Details_*/TY_Details_* snapshot'ını ekler.
+        Aynı dosya ikinci kez eklenmez. Eklenen gözlem sayısını döndürür.
+        """
+        name = os.path.basename(path)
+        if name in self.manifest["ingested"]:
+            return 0
+
+        platform = platform or platform_from_filename(path)
+        raw = pd.read_csv(path, usecols=["Fiyat (TRY)", "Çekilme Zamanı", "Link"])
+
+        url = canonical_urls(raw["Link"])
+        ts = pd.to_datetime(raw["Çekilme Zamanı"], errors="coerce").fillna(
+            snapshot_time_from_filename(path)
+        )
+        price = raw["Fiyat (TRY)"].map(parse_price_try).astype("float32")
+
+        obs = pd.DataFrame(
+            {
+                "product_id": product_ids(pd.Series(platform, index=raw.index), url),
+                "platform": platform,
+                "url": url,
+                "ts": ts.astype("datetime64[ns]"),
+                "price": price,
+            }
+        ).dropna(subset=["url", "ts", "price"])
+
+        out_dir = self.root / "observations" / platform
+        out_dir.mkdir(parents=True, exist_ok=True)
+        _write_parquet(
+            obs[["product_id", "ts", "price"]], out_dir / f"{Path(name).stem}.parquet"
+        )
+
+        # ürün sözlüğü
+        seen = obs.groupby("product_id", sort=False).agg(
+            platform=("platform", "first"),
+            url=("url", "first"),
+            first_seen=("ts", "min"),
+            last_seen=("ts", "max"),
+        )
+        prods = pd.concat([self.products().set_index("product_id"), seen])
+        prods = prods.groupby(level=0, sort=False).agg(
+            platform=("platform", "first"),
+            url=("url", "first"),
+            first_seen=("first_seen", "min"),
+            last_seen=("last_seen", "max"),
+        )
+        _write_parquet(prods.reset_index(), self.products_path)
+
+        # günlük rollup: sadece bu snapshot'ın (ürün, gün) hücreleri birleşir
+        _write_parquet(
+            _merge_rollups(self.daily(), _daily_rollup(obs)), self.daily_path
+        )
+
+        self.manifest["ingested"][name] = {
+            "platform": platform,
+            "rows": int(len(obs)),
+            "ingested_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        tmp = self.manifest_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.manifest, indent=2), encoding="utf-8")
+        os.replace(tmp, self.manifest_path)
+
+        return int(len(obs))
+
+    def ingest_many(
+        self,
+        patterns: tuple[str, ...] = (
+            "../data/scrapped/HB_Details_*.csv",
+            "../data/scrapped/TY_Details_*.csv",
+        ),
+    ) -> int:
+        """Henüz eklenmemiş tüm snapshot'ları (eskiden yeniye) ekler."""
+        total = 0
+        for pattern in patterns:
+            for path in list_snapshots(pattern):
+                total += self.ingest(path)
+        return total
+
+    # ---- sorgular ----
+    def price_series(self, url: str, platform: str | None = None) -> pd.DataFrame:
+        """Bir ürünün günlük min/max/last serisi (url ham veya kanonik olabilir)."""
+        url = canonical_url(url)
+        prods = self.products()
+        hit = prods[prods["url"] == url]
+        if platform is not None:
+            hit = hit[hit["platform"] == platform]
+
+        daily = self.daily()
+        out = daily[daily["product_id"].isin(hit["product_id"])]
+        return (
+            out.merge(hit[["product_id", "platform", "url"]], on="product_id")
+            .sort_values(["platform", "day"])
+            .reset_index(drop=True)
+        )
+
+    def price_drops(self, min_pct: float, since) -> pd.DataFrame:
+        """
+        since tarihinden bu yana son fiyatı min_pct (%) veya daha fazla düşen ürünler.
+        Referans fiyat: since gününe kadar bilinen son fiyat; since öncesi
+        gözlem yoksa since sonrası ilk gözlem.
+        """
+        since = pd.Timestamp(since).normalize()
+        daily = self.daily().sort_values(["product_id", "day"], kind="stable")
+        if daily.empty:
+            return daily.assign(ref_price=[], current_price=[], drop_pct=[])
+
+        before = daily[daily["day"] <= since]
+        after = daily[daily["day"] > since]
+
+        ref = before.groupby("product_id")["last"].last()
+        first_after = after.groupby("product_id")["last"].first()
+        ref = ref.combine_first(first_after)
+
+        cur = daily.groupby("product_id").agg(
+            current_price=("last", "last"), current_day=("day", "last")
+        )
+        out = cur.join(ref.rename("ref_price"), how="inner")
+        out = out[out["current_day"] > since]
+        out["drop_pct"] = (
+            (out["ref_price"] - out["current_price"]) / out["ref_price"] * 100
+        )
+
+        out = out[out["drop_pct"] >= min_pct].reset_index()
+        return (
+            out.merge(
+                self.products()[["product_id", "platform", "url"]], on="product_id"
+            )
+            .sort_values("drop_pct", ascending=False)
+            .reset_index(drop=True)
+        )
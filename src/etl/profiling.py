@@ -0,0 +1,228 @@
+from __future__ import annotations
+import functools
+import inspect
+import json
+import sys
+import time
+import tracemalloc
+from types import ModuleType
+
+import numpy as np
+import pandas as pd
+
+from src.etl import column_parsers, title_extractors
+from src.etl.pipeline import Pipeline, Stage
+
+# wrap edilecek fonksiyonların modülleri -> rapordaki tür
+TARGET_MODULES = {column_parsers: "parser", title_extractors: "extractor"}
+
+# referansları aranacak modüller (from x import y ile alınmış isimler,
+# DEFAULT_PARSERS / HB_TITLE_FILLS gibi dict'ler)
+CONSUMER_PREFIX = "src."
+
+
+class _Stats:
+    __slots__ = ("kind", "calls", "total_ns", "durations", "peak")
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.calls = 0
+        self.total_ns = 0
+        self.durations: list[int] = []
+        self.peak = 0
+
+
+class ETLProfiler:
+    """
+    Opt-in ETL profili: parser'lar, title extractor'lar ve pipeline stage'leri.
+
+        with ETLProfiler(memory=True) as prof:
+            run_etl(...)
+        print(prof.to_text())
+        prof.to_json("etl_profile.json")
+
+    Context içinde hedef modüllerin public fonksiyonları ve src.* modüllerinde
+    onlara tutulan referanslar (import edilmiş isimler, parser eşleme
+    dict'leri) ölçen wrapper'larla değiştirilir; çıkışta geri alınır.
+    Context dışında hiçbir şey wrap edilmez -> kapalıyken ek maliyet yok.
+
+    Kayıtlar: çağrı sayısı, toplam süre, çağrı başına p50/p95/p99 ve
+    memory=True ise tracemalloc peak (çağrı süresince ek ayrılan bayt).
+    İç içe çağrılarda süre ve bellek dış çağrıya da yazılır (kapsayıcı).
+    """
+
+    def __init__(self, memory: bool = True, modules: dict | None = None):
+        self.memory = memory
+        self.modules = modules if modules is not None else TARGET_MODULES
+        self.stats: dict[str, _Stats] = {}
+        self._patches: list[tuple[object, object, object]] = []
+        self._peak_stack: list[int] = []
+        self._started_tracemalloc = False
+        self.wall_s = 0.0
+
+    # ---- ölçüm ----
+    def _stat(self, name: str, kind: str) -> _Stats:
+        st = self.stats.get(name)
+        if st is None:
+            st = self.stats[name] = _Stats(kind)
+        return st
+
+    def _measure(self, st: _Stats, fn, args, kwargs):
+        if self.memory:
+            cur, peak = tracemalloc.get_traced_memory()
+            self._peak_stack.append(peak)
+            tracemalloc.reset_peak()
+        t0 = time.perf_counter_ns()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            dt = time.perf_counter_ns() - t0
+            st.calls += 1
+            st.total_ns += dt
+            st.durations.append(dt)
+            if self.memory:
+                _, p = tracemalloc.get_traced_memory()
+                st.peak = max(st.peak, p - cur)
+                # dış çağrının peak'i sıfırlanmasın: bilinen en yükseği geri yaz
+                outer = max(self._peak_stack.pop(), p)
+                if self._peak_stack:
+                    self._peak_stack[-1] = max(self._peak_stack[-1], outer)
+
+    def wrap(self, fn, name: str, kind: str):
+        st = self._stat(name, kind)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            return self._measure(st, fn, args, kwargs)
+
+        return wrapper
+
+    # ---- patch / unpatch ----
+    def _set(self, owner, key, value) -> None:
+        if isinstance(owner, dict):
+            self._patches.append((owner, key, owner[key]))
+            owner[key] = value
+        else:
+            self._patches.append((owner, key, getattr(owner, key)))
+            setattr(owner, key, value)
+
+    def _targets(self) -> dict[int, tuple[object, object]]:
+        """id(orijinal fonksiyon) -> (orijinal, wrapper)."""
+        out = {}
+        for mod, kind in self.modules.items():
+            for name, fn in inspect.getmembers(mod, inspect.isfunction):
+                if name.startswith("_") or fn.__module__ != mod.__name__:
+                    continue
+                out[id(fn)] = (fn, self.wrap(fn, name, kind))
+        return out
+
+    def _patch_refs(self, consumer: ModuleType, targets: dict) -> None:
+        for key, val in list(vars(consumer).items()):
+            if id(val) in targets:
+                self._set(consumer, key, targets[id(val)][1])
+            elif isinstance(val, dict):
+                for k, v in list(val.items()):
+                    if id(v) in targets:
+                        self._set(val, k, targets[id(v)][1])
+                    elif isinstance(v, tuple) and v and id(v[0]) in targets:
+                        self._set(val, k, (targets[id(v[0])][1],) + v[1:])
+
+    def __enter__(self) -> "ETLProfiler":
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+        targets = self._targets()
+        for mod_name, mod in list(sys.modules.items()):
+            if mod_name.startswith(CONSUMER_PREFIX) and mod is not None:
+                self._patch_refs(mod, targets)
+
+        # pipeline stage'leri: Pipeline._execute üzerinden
+        prof = self
+        original = Pipeline._execute
+
+        def _execute(pipe: Pipeline, st: Stage, inputs):
+            stat = prof._stat(f"stage:{st.name}", "stage")
+            return prof._measure(stat, original, (pipe, st, inputs), {})
+
+        self._set(Pipeline, "_execute", _execute)
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.wall_s += time.perf_counter() - self._t0
+        for owner, key, old in reversed(self._patches):
+            if isinstance(owner, dict):
+                owner[key] = old
+            else:
+                setattr(owner, key, old)
+        self._patches.clear()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    # ---- rapor ----
+    def report(self) -> pd.DataFrame:
+        """Toplam süreye göre sıralı tablo (çağrılmayanlar hariç)."""
+        rows = []
+        for name, st in self.stats.items():
+            if not st.calls:
+                continue
+            d = np.asarray(st.durations, dtype=float) / 1e3  # µs
+            p50, p95, p99 = np.percentile(d, [50, 95, 99])
+            rows.append(
+                {
+                    "name": name,
+                    "kind": st.kind,
+                    "calls": st.calls,
+                    "total_s": st.total_ns / 1e9,
+                    "pct_wall": (
+                        100 * st.total_ns / 1e9 / self.wall_s if self.wall_s else np.nan
+                    ),
+                    "mean_us": d.mean(),
+                    "p50_us": p50,
+                    "p95_us": p95,
+                    "p99_us": p99,
+                    "peak_kb": st.peak / 1024 if self.memory else np.nan,
+                }
+            )
+        cols = [
+            "name",
+            "kind",
+            "calls",
+            "total_s",
+            "pct_wall",
+            "mean_us",
+            "p50_us",
+            "p95_us",
+            "p99_us",
+            "peak_kb",
+        ]
+        if not rows:
+            return pd.DataFrame(columns=cols)
+        return (
+            pd.DataFrame(rows, columns=cols)
+            .sort_values("total_s", ascending=False)
+            .reset_index(drop=True)
+        )
+
+    def to_text(self, top: int | None = None) -> str:
+        rep = self.report()
+        if top is not None:
+            rep = rep.head(top)
+        head = f"ETL profili | wall {self.wall_s:.3f}s | memory={'on' if self.memory else 'off'}"
+        return (
+            head + "\n" + rep.to_string(index=False, float_format=lambda v: f"{v:,.2f}")
+        )
+
+    def to_json(self, path: str | None = None) -> str:
+        payload = {
+            "wall_s": self.wall_s,
+            "memory": self.memory,
+            "entries": json.loads(self.report().to_json(orient="records")),
+        }
+        text = json.dumps(payload, indent=2, ensure_ascii=False)
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+        return text
@@ -0,0 +1,390 @@
+from __future__ import annotations
+import argparse
+import json
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+
+from src.etl.column_parsers import parse_price_try
+from src.etl.loaders import canonical_urls, list_snapshots, platform_from_filename
+from src.etl.merge import COLS_EN, HB_TO_TY
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SCRAPPED_DIR = PROJECT_ROOT / "data" / "scrapped"
+
+# merge_ty_hb çıktısındaki (Türkçe) kolonlar
+TITLE_COL = "Başlık"
+TIME_COL = "Çekilme Zamanı"
+PRICE_COL = "Fiyat (TRY)"
+LINK_COL = "Link"
+PLATFORM_COL = "Platform"
+SOURCE_COL = "KaynakDosya"
+
+META_COLS = {TIME_COL, PRICE_COL, LINK_COL, PLATFORM_COL, SOURCE_COL}
+# spec karşılaştırmasına giren kolonlar (başlık dahil), Trendyol şablon sırası
+SPEC_COLS = [c for c in COLS_EN if c not in META_COLS]
+
+# csv okuma bloğu; bellek kullanımını bu ve indeks boyutu belirler
+CHUNK_BYTES = 16 << 20
+FRAME_CHUNK_ROWS = 200_000
+EVENTS = ("new", "removed", "price_change", "spec_change")
+
+
+# -----------------------------
+# Snapshot okuma (chunk'lı)
+# -----------------------------
+def _platform_label(path: str) -> str:
+    """merge_ty_hb'deki etiketle aynı: 'Hepsiburada' / 'Trendyol'."""
+    return platform_from_filename(path).capitalize()
+
+
+def _constant(value: str, n: int) -> pa.Array:
+    return pa.array([value], pa.string()).take(pa.array(np.zeros(n, dtype=np.int64)))
+
+
+def read_snapshot_chunks(
+    paths: Iterable[str], chunk_bytes: int = CHUNK_BYTES
+) -> Iterator[pa.Table]:
+    """
+    HB_Details_*/TY_Details_* dosyalarını merge_ty_hb biçiminde Arrow
+    tabloları olarak blok blok okur: HB kolonları Trendyol adlarına çevrilir,
+    Platform eklenir. Tüm kolonlar string okunur (iki snapshot aynı metni
+    aynı hash'e çevirsin).
+    """
+    for path in paths:
+        platform = _platform_label(path)
+        header = list(pd.read_csv(path, nrows=0).columns)
+        reader = pacsv.open_csv(
+            path,
+            read_options=pacsv.ReadOptions(block_size=chunk_bytes),
+            convert_options=pacsv.ConvertOptions(
+                column_types={c: pa.string() for c in header},
+                strings_can_be_null=True,
+            ),
+        )
+        names = [HB_TO_TY.get(c, c) for c in header]
+        for batch in reader:
+            t = pa.Table.from_batches([batch]).rename_columns(names)
+            yield t.append_column(PLATFORM_COL, _constant(platform, len(t)))
+
+
+def frame_chunks(
+    df: pd.DataFrame, chunk_rows: int = FRAME_CHUNK_ROWS
+) -> Iterator[pa.Table]:
+    """Bellekteki merge_ty_hb çıktısı için aynı arayüz (kolonlar string'e çevrilir)."""
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start : start + chunk_rows].astype("string[pyarrow]")
+        t = pa.Table.from_pandas(chunk, preserve_index=False)
+        yield t.cast(pa.schema([(c, pa.string()) for c in t.column_names]))
+
+
+# -----------------------------
+# 1. geçiş: kompakt indeks
+# -----------------------------
+def _column(t: pa.Table, name: str) -> pa.Array:
+    if name not in t.column_names:
+        return pa.nulls(len(t), pa.string())
+    return t.column(name).combine_chunks()
+
+
+def _urls(t: pa.Table) -> pa.Array:
+    col = _column(t, LINK_COL)
+    s = pd.Series(pd.arrays.ArrowStringArray(col.cast(pa.large_string())))
+    return pa.array(canonical_urls(s).array).cast(pa.string())
+
+
+def _hash(arr: pa.Array) -> np.ndarray:
+    return pd.util.hash_array(arr.to_numpy(zero_copy_only=False), categorize=False)
+
+
+def _keys(t: pa.Table, urls: pa.Array) -> np.ndarray:
+    """(platform, kanonik url) -> uint64 ürün anahtarı."""
+    return _hash(
+        pc.binary_join_element_wise(
+            _column(t, PLATFORM_COL), pc.fill_null(urls, ""), "|"
+        )
+    )
+
+
+def _spec_hash(t: pa.Table) -> np.ndarray:
+    """Spec kolonları tek metne birleştirilip hash'lenir (eksik -> \\x00)."""
+    cols = [pc.fill_null(_column(t, c), "\x00") for c in SPEC_COLS]
+    return _hash(pc.binary_join_element_wise(*cols, "\x1f"))
+
+
+def _chunk_index(t: pa.Table) -> dict[str, np.ndarray]:
+    return {
+        "key": _keys(t, _urls(t)),
+        "price": _hash(pc.fill_null(_column(t, PRICE_COL), "")),
+        "spec": _spec_hash(t),
+    }
+
+
+def build_index(chunks: Iterable[pa.Table]) -> pd.DataFrame:
+    """
+    Snapshot başına ürün anahtarı (platform|kanonik url hash'i) -> satır
+    pozisyonu, fiyat metni hash'i, spec hash'i; satır başına 32 bayt, metin
+    tutulmaz. Aynı ürün birden çok kez geçiyorsa son satır geçerlidir.
+    """
+    parts = [_chunk_index(t) for t in chunks]
+    cols = ("key", "price", "spec")
+    idx = pd.DataFrame(
+        {
+            c: (
+                np.concatenate([p[c] for p in parts])
+                if parts
+                else np.array([], dtype=np.uint64)
+            )
+            for c in cols
+        }
+    )
+    idx["pos"] = np.arange(len(idx))
+    return idx.drop_duplicates("key", keep="last").set_index("key")
+
+
+# -----------------------------
+# Join
+# -----------------------------
+def join_indexes(old: pd.DataFrame, new: pd.DataFrame) -> dict[str, np.ndarray]:
+    """
+    İki indeksin hash join'i (anahtar -> pozisyon). Dönen pozisyon dizileri:
+      new              -> yeni snapshot'ta olup eskide olmayanlar
+      removed          -> eskide olup yenide olmayanlar
+      price_old/new    -> eşleşen, fiyat metni değişen satır çiftleri
+      spec_old/new     -> eşleşen, spec hash'i değişen satır çiftleri
+    """
+    hit = old.index.get_indexer(new.index)
+    matched = hit >= 0
+    o = old.iloc[hit[matched]]
+    n = new.iloc[np.flatnonzero(matched)]
+
+    price = o["price"].to_numpy() != n["price"].to_numpy()
+    spec = o["spec"].to_numpy() != n["spec"].to_numpy()
+    removed = ~old.index.isin(new.index)
+
+    return {
+        "new": np.sort(new["pos"].to_numpy()[~matched]),
+        "removed": np.sort(old["pos"].to_numpy()[removed]),
+        "price_old": o["pos"].to_numpy()[price],
+        "price_new": n["pos"].to_numpy()[price],
+        "spec_old": o["pos"].to_numpy()[spec],
+        "spec_new": n["pos"].to_numpy()[spec],
+    }
+
+
+# -----------------------------
+# 2. geçiş: olaylar
+# -----------------------------
+def _select(
+    chunks: Iterable[pa.Table], positions: np.ndarray, columns: list[str]
+) -> Iterator[tuple[np.ndarray, dict[str, list]]]:
+    """İstenen (sıralı) pozisyonlardaki satırlar: (pozisyonlar, kolon -> liste)."""
+    start = 0
+    for t in chunks:
+        stop = start + len(t)
+        lo, hi = np.searchsorted(positions, [start, stop])
+        if hi > lo:
+            pos = positions[lo:hi]
+            rows = t.take(pa.array(pos - start))
+            fields = {c: _column(rows, c).to_pylist() for c in columns}
+            fields["url"] = _urls(rows).to_pylist()
+            yield pos, fields
+        start = stop
+
+
+def _price(text) -> float | None:
+    v = parse_price_try(text, min_value=0, max_value=np.inf)
+    return None if pd.isna(v) else float(v)
+
+
+def _event(kind: str, f: dict, i: int, **extra) -> dict:
+    ev = {
+        "event": kind,
+        "platform": f[PLATFORM_COL][i],
+        "url": f["url"][i],
+        "title": f[TITLE_COL][i],
+    }
+    ev.update(extra)
+    return ev
+
+
+def _price_changed(old: float | None, new: float | None, min_abs, min_pct) -> bool:
+    if old is None or new is None or old == new:
+        return False
+    diff = abs(new - old)
+    pct = diff / old * 100 if old > 0 else np.inf
+    return diff >= min_abs and pct >= min_pct
+
+
+def iter_events(
+    old_chunks: Callable[[], Iterable[pa.Table]],
+    new_chunks: Callable[[], Iterable[pa.Table]],
+    min_abs: float = 0.0,
+    min_pct: float = 0.0,
+) -> Iterator[dict]:
+    """
+    old_chunks / new_chunks: chunk üreten fabrikalar (sıfır argümanlı
+    callable; ikinci geçiş için her snapshot iki kez okunur).
+
+    1. geçiş: her snapshot'tan sadece anahtar / fiyat / spec hash indeksi.
+    2. geçiş: eski snapshot'tan kaldırılan ve değişen satırlar, yeni
+       snapshot'tan olay üreten satırlar alınır; olaylar blok okundukça
+       üretilir. Fiyat sadece metni değişen satırlarda parse edilir.
+       Bellek: indeksler + değişen eski satırlar.
+    Sıra: removed olayları, sonra yeni snapshot sırasıyla new /
+    price_change / spec_change.
+    """
+    old_idx = build_index(old_chunks())
+    new_idx = build_index(new_chunks())
+    j = join_indexes(old_idx, new_idx)
+
+    # eski pozisyon -> yeni pozisyon
+    price_pair = dict(zip(j["price_old"].tolist(), j["price_new"].tolist()))
+    spec_pair = dict(zip(j["spec_old"].tolist(), j["spec_new"].tolist()))
+    old_price: dict[int, float | None] = {}
+    old_spec: dict[int, dict] = {}
+
+    removed = set(j["removed"].tolist())
+    columns = [PLATFORM_COL, TITLE_COL, TIME_COL, PRICE_COL]
+    need = np.union1d(np.union1d(j["removed"], j["price_old"]), j["spec_old"])
+    for positions, f in _select(old_chunks(), need, columns + SPEC_COLS):
+        for i, pos in enumerate(positions.tolist()):
+            if pos in removed:
+                yield _event(
+                    "removed",
+                    f,
+                    i,
+                    price=_price(f[PRICE_COL][i]),
+                    last_seen=f[TIME_COL][i],
+                )
+                continue
+            if pos in price_pair:
+                old_price[price_pair[pos]] = _price(f[PRICE_COL][i])
+            if pos in spec_pair:
+                old_spec[spec_pair[pos]] = {c: f[c][i] for c in SPEC_COLS}
+
+    new = set(j["new"].tolist())
+    need = np.union1d(np.union1d(j["new"], j["price_new"]), j["spec_new"])
+    for positions, f in _select(new_chunks(), need, columns + SPEC_COLS):
+        for i, pos in enumerate(positions.tolist()):
+            ts = f[TIME_COL][i]
+            if pos in new:
+                yield _event("new", f, i, price=_price(f[PRICE_COL][i]), scraped_at=ts)
+                continue
+            if pos in old_price:
+                before, after = old_price.pop(pos), _price(f[PRICE_COL][i])
+                if _price_changed(before, after, min_abs, min_pct):
+                    pct = (after - before) / before * 100 if before > 0 else None
+                    yield _event(
+                        "price_change",
+                        f,
+                        i,
+                        old_price=before,
+                        new_price=after,
+                        change_pct=None if pct is None else round(pct, 2),
+                        scraped_at=ts,
+                    )
+            if pos in old_spec:
+                prev = old_spec.pop(pos)
+                changes = {
+                    COLS_EN.get(c, c): [prev[c], f[c][i]]
+                    for c in SPEC_COLS
+                    if prev[c] != f[c][i]
+                }
+                yield _event("spec_change", f, i, changes=changes, scraped_at=ts)
+
+
+def write_events(events: Iterable[dict], path: str) -> dict[str, int]:
+    """Olayları JSONL olarak yazar (satır başına bir olay); tür başına sayım döndürür."""
+    counts = dict.fromkeys(EVENTS, 0)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        for ev in events:
+            counts[ev["event"]] += 1
+            f.write(json.dumps(ev, ensure_ascii=False) + "\n")
+    tmp.replace(path)
+    return counts
+
+
+def diff_snapshots(
+    old_paths: list[str],
+    new_paths: list[str],
+    out: str,
+    chunk_bytes: int = CHUNK_BYTES,
+    min_abs: float = 0.0,
+    min_pct: float = 0.0,
+) -> dict[str, int]:
+    """İki snapshot (HB + TY dosyaları) arasındaki olayları out'a (jsonl) yazar."""
+    events = iter_events(
+        lambda: read_snapshot_chunks(old_paths, chunk_bytes),
+        lambda: read_snapshot_chunks(new_paths, chunk_bytes),
+        min_abs=min_abs,
+        min_pct=min_pct,
+    )
+    return write_events(events, out)
+
+
+def diff_frames(
+    old: pd.DataFrame,
+    new: pd.DataFrame,
+    min_abs: float = 0.0,
+    min_pct: float = 0.0,
+) -> list[dict]:
+    """Bellekteki iki merge_ty_hb çıktısı için olay listesi."""
+    return list(
+        iter_events(
+            lambda: frame_chunks(old),
+            lambda: frame_chunks(new),
+            min_abs=min_abs,
+            min_pct=min_pct,
+        )
+    )
+
+
+def _last_two(pattern: str) -> tuple[str, str]:
+    files = list_snapshots(pattern)
+    if len(files) < 2:
+        raise FileNotFoundError(f"Need two snapshots for pattern: {pattern}")
+    return files[-2], files[-1]
+
+
+def main(argv: list[str] | None = None) -> None:
+    p = argparse.ArgumentParser(description="İki snapshot arasındaki olaylar (jsonl)")
+    p.add_argument("--old", nargs="*", help="Eski snapshot csv'leri (HB/TY)")
+    p.add_argument("--new", nargs="*", help="Yeni snapshot csv'leri (HB/TY)")
+    p.add_argument("--out", default="snapshot_events.jsonl")
+    p.add_argument("--chunk-mb", type=int, default=CHUNK_BYTES >> 20)
+    p.add_argument("--min-abs", type=float, default=0.0, help="Min fiyat farkı (TL)")
+    p.add_argument("--min-pct", type=float, default=0.0, help="Min fiyat farkı (%%)")
+    args = p.parse_args(argv)
+
+    if not args.old or not args.new:
+        # her platformun son iki snapshot'ı
+        pairs = [
+            _last_two(str(SCRAPPED_DIR / pat))
+            for pat in ("HB_Details_*.csv", "TY_Details_*.csv")
+        ]
+        args.old = [a for a, _ in pairs]
+        args.new = [b for _, b in pairs]
+
+    counts = diff_snapshots(
+        args.old,
+        args.new,
+        args.out,
+        chunk_bytes=args.chunk_mb << 20,
+        min_abs=args.min_abs,
+        min_pct=args.min_pct,
+    )
+    print(json.dumps(counts))
+    print("Olaylar:", args.out)
+
+
+if __name__ == "__main__":
+    main()
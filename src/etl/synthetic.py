@@ -0,0 +1,187 @@
+from __future__ import annotations
+import os
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.etl.column_parsers import parse_price_try
+from src.etl.loaders import list_snapshots
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SCRAPPED_DIR = PROJECT_ROOT / "data" / "scrapped"
+
+PLATFORM_FILES = {"hepsiburada": "HB_Details_*.csv", "trendyol": "TY_Details_*.csv"}
+
+# ham snapshot'taki meta kolonlar; geri kalan her şey spec kolonu sayılır
+TITLE_COL = "Başlık"
+TIME_COL = "Çekilme Zamanı"
+PRICE_COL = "Fiyat (TRY)"
+LINK_COL = "Link"
+
+# HB: ...-p-HBCV00008749UT / ...-pm-HBC00006IUW8W, TY: ...-p-68042136
+PRODUCT_ID_RE = r"^(.*?-pm?-)[A-Za-z0-9]+(.*)$"
+
+
+# -----------------------------
+# Referans snapshot
+# -----------------------------
+def load_reference(
+    platform: str, source_dir: str | Path = SCRAPPED_DIR
+) -> pd.DataFrame:
+    """Platformun en yeni gerçek snapshot'ı (dağılımlar buradan örneklenir)."""
+    files = list_snapshots(str(Path(source_dir) / PLATFORM_FILES[platform]))
+    if not files:
+        raise FileNotFoundError(f"No snapshot for {platform} in {source_dir}")
+    return pd.read_csv(files[-1])
+
+
+# -----------------------------
+# Biçimlendirme
+# -----------------------------
+def format_try(values: np.ndarray, decimals: np.ndarray) -> pd.Series:
+    """61899.0 -> '61.899 TL', decimals=True ise '61.899,23 TL' (snapshot biçimi)."""
+    values = np.asarray(values, dtype=float)
+    ok = np.isfinite(values)
+    cents_total = np.round(np.where(ok, values, 0) * 100).astype(np.int64)
+    ip, cents = cents_total // 100, cents_total % 100
+
+    def _s(a):
+        return pd.Series(a).astype(str)
+
+    mil, th, un = ip // 1_000_000, (ip // 1000) % 1000, ip % 1000
+    out = _s(un)
+    out = out.where(ip < 1000, _s(th) + "." + _s(un).str.zfill(3))
+    out = out.where(
+        ip < 1_000_000, _s(mil) + "." + _s(th).str.zfill(3) + "." + _s(un).str.zfill(3)
+    )
+    out = out.where(~np.asarray(decimals, bool), out + "," + _s(cents).str.zfill(2))
+    return (out + " TL").where(ok, np.nan)
+
+
+def _random_codes(rng: np.random.Generator, n: int, length: int) -> np.ndarray:
+    alphabet = np.array(list("ABCDEFGHJKLMNPRSTUVWXYZ0123456789"))
+    picks = alphabet[rng.integers(0, len(alphabet), size=(n, length))]
+    return picks.view(f"<U{length}").ravel()
+
+
+# -----------------------------
+# Üretici
+# -----------------------------
+def generate_raw_snapshot(
+    n: int,
+    platform: str = "hepsiburada",
+    seed: int = 0,
+    reference: pd.DataFrame | None = None,
+    mix_prob: float = 0.15,
+    dup_title_rate: float = 0.05,
+    price_sigma: float = 0.1,
+    start: str = "2025-12-03 00:00:00",
+    span_hours: float = 1.0,
+) -> pd.DataFrame:
+    """
+    Gerçek snapshot'tan n satırlık sentetik ham HB/TY tablosu.
+
+    - Satırlar referanstan bootstrap edilir (spec kombinasyonları gerçekçi kalır).
+    - Her spec hücresi mix_prob olasılıkla kolonun marjinal dağılımından
+      yeniden örneklenir (yeni kombinasyonlar, eksiklik oranı korunur).
+    - Başlıklara rastgele model kodu eklenir; dup_title_rate kadarı orijinal
+      başlığı korur (duplicate oranı gerçekçi olsun diye).
+    - Fiyat lognormal gürültüyle oynatılıp snapshot biçiminde yazılır,
+      linklerdeki ürün id'leri benzersiz yapılır.
+    """
+    rng = np.random.default_rng(seed)
+    ref = reference if reference is not None else load_reference(platform)
+    ref = ref.reset_index(drop=True)
+
+    idx = rng.integers(0, len(ref), size=n)
+
+    # her kolon referanstan take ile kurulur; spec hücrelerinin mix_prob'u
+    # başka bir referans satırından (marjinal dağılım) gelir
+    meta = {TITLE_COL, TIME_COL, PRICE_COL, LINK_COL}
+    cols = {}
+    for c in ref.columns:
+        src = idx
+        if c not in meta:
+            swap = rng.random(n) < mix_prob
+            src = np.where(swap, rng.integers(0, len(ref), size=n), idx)
+        cols[c] = ref[c].take(src).reset_index(drop=True)
+    out = pd.DataFrame(cols)
+
+    # regex/parse işleri referans satırlarda bir kez yapılır, idx ile yayılır
+    ref_price = ref[PRICE_COL].astype("string")
+    base = ref_price.map(
+        lambda x: parse_price_try(x, min_value=0, max_value=np.inf)
+    ).to_numpy(dtype=float)[idx]
+    has_dec = ref_price.str.contains(",", na=False).to_numpy()[idx]
+    links = ref[LINK_COL].astype("string").fillna("")
+    parts = links.str.extract(PRODUCT_ID_RE)
+
+    # başlık
+    titles = out[TITLE_COL].astype("string").fillna("")
+    keep = rng.random(n) < dup_title_rate
+    codes = pd.Series(_random_codes(rng, n, 8), index=out.index)
+    out[TITLE_COL] = titles.where(keep, titles + " " + codes)
+
+    # fiyat
+    noisy = np.round(base * rng.lognormal(0.0, price_sigma, size=n))
+    cents = np.where(has_dec, rng.integers(0, 100, size=n) / 100, 0.0)
+    out[PRICE_COL] = format_try(noisy + cents, has_dec).to_numpy()
+
+    # zaman
+    t0 = pd.Timestamp(start)
+    secs = np.sort(rng.uniform(0, span_hours * 3600, size=n))
+    out[TIME_COL] = (t0 + pd.to_timedelta(secs, unit="s")).strftime("%Y-%m-%d %H:%M:%S")
+
+    # link: ürün id'si benzersiz
+    ids = pd.Series(_random_codes(rng, n, 12))
+    pre = parts[0].to_numpy(dtype=object)[idx]
+    post = parts[1].to_numpy(dtype=object)[idx]
+    raw = links.to_numpy(dtype=object)[idx]
+    out[LINK_COL] = (
+        (pd.Series(pre, dtype="string") + ids + pd.Series(post, dtype="string"))
+        .fillna(pd.Series(raw, dtype="string") + "#" + ids)
+        .to_numpy()
+    )
+
+    return out
+
+
+def generate_raw_catalog(
+    n: int, seed: int = 0, source_dir: str | Path = SCRAPPED_DIR, **kwargs
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    (hb, ty) sentetik ham tablolar; n toplam satır, gerçek snapshot'lardaki
+    platform oranıyla bölünür.
+    """
+    hb_ref = load_reference("hepsiburada", source_dir)
+    ty_ref = load_reference("trendyol", source_dir)
+    n_hb = int(round(n * len(hb_ref) / (len(hb_ref) + len(ty_ref))))
+
+    hb = generate_raw_snapshot(
+        n_hb, "hepsiburada", seed=seed, reference=hb_ref, **kwargs
+    )
+    ty = generate_raw_snapshot(
+        n - n_hb, "trendyol", seed=seed + 1, reference=ty_ref, **kwargs
+    )
+    return hb, ty
+
+
+def write_synthetic_snapshots(
+    out_dir: str | Path, n: int, seed: int = 0, stamp: str | None = None, **kwargs
+) -> tuple[str, str]:
+    """
+    HB_Details_<stamp>.csv / TY_Details_<stamp>.csv yazar; ETL pipeline'ı
+    --hb/--ty pattern'leriyle bu klasöre yönlendirilebilir.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stamp = stamp or datetime.now().strftime("%Y%m%d%H%M")
+
+    hb, ty = generate_raw_catalog(n, seed=seed, **kwargs)
+    hb_path = os.path.join(out_dir, f"HB_Details_{stamp}.csv")
+    ty_path = os.path.join(out_dir, f"TY_Details_{stamp}.csv")
+    hb.to_csv(hb_path, index=False)
+    ty.to_csv(ty_path, index=False)
+    return hb_path, ty_path
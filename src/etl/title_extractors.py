@@ -98,6 +98,35 @@ APPLE_RETINA_RES = {
     (3840, 2400),
 }
 
+# İşlemci ailesi: (regex, format); sıra önemli (ultra > i3-9 > core 5/7)
+CPU_FAMILY_RES = [
+    (re.compile(r"\b(?:core\s*)?ultra\s*([579])\b"), "Intel Core Ultra {}"),
+    (re.compile(r"\bryzen\s*ai\s*([579])\b"), "AMD Ryzen AI {}"),
+    (re.compile(r"\bryzen\s*([3579])\b"), "AMD Ryzen {}"),
+    (re.compile(r"\b(?:core\s*)?i([3579])(?=\b|\d)"), "Intel Core i{}"),
+    (re.compile(r"\bcore\s*([3579])\s+\d{3}"), "Intel Core {}"),
+    (re.compile(r"\b(n[12]00)\b"), "Intel {}"),
+    (re.compile(r"\bceleron\b"), "Intel Celeron"),
+    (re.compile(r"\bsnapdragon\s*x\b"), "Qualcomm Snapdragon X"),
+]
+APPLE_M_RE = re.compile(r"\bm([1-5])(?:\s+(pro|max))?\b")
+
+# Ekran kartı: harici modeller numarasıyla, entegreler adıyla
+NVIDIA_RE = re.compile(r"\b(rtx|gtx)\s*-?\s*(\d{4})(\s*ti)?\b")
+NVIDIA_MX_RE = re.compile(r"\bmx\s*(\d{3})\b")
+RADEON_RX_RE = re.compile(r"\brx\s*(\d{4})(m|s|xt)?\b")
+INTEGRATED_GPUS = [
+    ("iris xe", "Intel Iris Xe Graphics"),
+    ("intel arc", "Intel Arc Graphics"),
+    ("uhd graphics", "Intel UHD Graphics"),
+    ("radeon graphics", "AMD Radeon Graphics"),
+]
+
+# Ekran boyutu: 15.6" / 15,6 inç / 16 inch
+SCREEN_SIZE_RE = re.compile(
+    r"(?<![\d.,])(1\d(?:[.,]\d{1,2})?)\s*(?:\"|''|”|inç|inc|inch|in\b)", re.IGNORECASE
+)
+
 
 # -----------------------------
 # Row-level extractors (string -> value)
@@ -186,6 +215,50 @@ def screen_feature_from_title(title: str) -> str | pd._libs.missing.NAType:
     return pd.NA
 
 
+def cpu_family_from_title(title: str) -> str | pd._libs.missing.NAType:
+    """Detay sayfasındaki 'İşlemci Tipi' biçiminde: 'Intel Core i7', 'AMD Ryzen 5'..."""
+    low = _norm(title).lower()
+    for rx, fmt in CPU_FAMILY_RES:
+        m = rx.search(low)
+        if m:
+            return fmt.format(*(g.upper() for g in m.groups()))
+    if "apple" in low or "macbook" in low:
+        m = APPLE_M_RE.search(low)
+        if m:
+            return f"Apple M{m.group(1)}" + (
+                f" {m.group(2).title()}" if m.group(2) else ""
+            )
+    return pd.NA
+
+
+def gpu_from_title(title: str) -> str | pd._libs.missing.NAType:
+    """Detay sayfasındaki 'Ekran Kartı' biçiminde: 'Nvidia GeForce RTX 4060'..."""
+    low = _norm(title).lower()
+    m = NVIDIA_RE.search(low)
+    if m:
+        ti = " Ti" if m.group(3) else ""
+        return f"Nvidia GeForce {m.group(1).upper()} {m.group(2)}{ti}"
+    m = NVIDIA_MX_RE.search(low)
+    if m:
+        return f"Nvidia GeForce MX{m.group(1)}"
+    m = RADEON_RX_RE.search(low)
+    if m:
+        return f"AMD Radeon RX {m.group(1)}{(m.group(2) or '').upper()}"
+    for key, name in INTEGRATED_GPUS:
+        if key in low:
+            return name
+    return pd.NA
+
+
+def screen_size_from_title(title: str) -> str | pd._libs.missing.NAType:
+    """'15,6 inç' biçiminde (10–19 inç arası)."""
+    for m in SCREEN_SIZE_RE.finditer(str(title)):
+        v = float(m.group(1).replace(",", "."))
+        if 10 <= v < 20:
+            return f"{v:g}".replace(".", ",") + " inç"
+    return pd.NA
+
+
 # -----------------------------
 # Column-level extractors (Series -> Series)
 # -----------------------------
@@ -215,6 +288,28 @@ def extract_screen_feature_from_title(title_series: pd.Series) -> pd.Series:
     )
 
 
+def extract_cpu_family_from_title(title_series: pd.Series) -> pd.Series:
+    return (
+        title_series.fillna("")
+        .astype(str)
+        .apply(cpu_family_from_title)
+        .astype("object")
+    )
+
+
+def extract_gpu_from_title(title_series: pd.Series) -> pd.Series:
+    return title_series.fillna("").astype(str).apply(gpu_from_title).astype("object")
+
+
+def extract_screen_size_from_title(title_series: pd.Series) -> pd.Series:
+    return (
+        title_series.fillna("")
+        .astype(str)
+        .apply(screen_size_from_title)
+        .astype("object")
+    )
+
+
 # -----------------------------
 # Optional: fill helper (only missing)
 # -----------------------------
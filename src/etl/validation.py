@@ -0,0 +1,403 @@
+from __future__ import annotations
+import argparse
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from src.etl.normalize import DEFAULT_PARSERS, parse_columns
+
+ACTIONS = ("report", "mask")
+
+
+# -----------------------------
+# Kolon önbelleği
+# -----------------------------
+class _Columns:
+    """
+    Kuralların ortak kullandığı kolon görünümleri; her kolon bir kez
+    dönüştürülür (sayısal dizi veya factorize kodları) ve tüm kurallar
+    aynı diziler üzerinde çalışır.
+
+    invalidate() ile hücre kuralının reddettiği değerler eksik sayılır;
+    sonraki (cross-field) kurallar bu değerleri görmez.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._num: dict[str, np.ndarray] = {}
+        self._codes: dict[str, tuple[np.ndarray, pd.Index]] = {}
+        self._na: dict[str, np.ndarray] = {}
+
+    def __contains__(self, col: str) -> bool:
+        return col in self.df.columns
+
+    def na(self, col: str) -> np.ndarray:
+        if col not in self._na:
+            self._na[col] = self.df[col].isna().to_numpy()
+        return self._na[col]
+
+    def num(self, col: str) -> np.ndarray:
+        if col not in self._num:
+            v = pd.to_numeric(self.df[col], errors="coerce").to_numpy(
+                dtype=float, na_value=np.nan
+            )
+            self._num[col] = np.where(self.na(col), np.nan, v)
+        return self._num[col]
+
+    def codes(self, col: str) -> tuple[np.ndarray, pd.Index]:
+        """(satır kodları, benzersiz değerler); eksik -> -1."""
+        if col not in self._codes:
+            codes, uniques = pd.factorize(self.df[col], use_na_sentinel=True)
+            codes = np.where(self.na(col), -1, codes)
+            self._codes[col] = (codes, pd.Index(uniques))
+        return self._codes[col]
+
+    def isin(self, col: str, values) -> np.ndarray:
+        """Değer kümesi sadece benzersiz değerlerde aranır, kodlarla yayılır."""
+        codes, uniques = self.codes(col)
+        table = np.append(uniques.isin(list(values)), False)  # -1 -> False
+        return table[codes]
+
+    def map_uniques(self, col: str, fn: Callable) -> np.ndarray:
+        """fn(benzersiz değer) -> float; satırlara yayılır (eksik -> NaN)."""
+        codes, uniques = self.codes(col)
+        table = np.append(np.array([fn(u) for u in uniques], dtype=float), np.nan)
+        return table[codes]
+
+    def invalidate(self, col: str, mask: np.ndarray) -> None:
+        self._na[col] = self.na(col) | mask
+        if col in self._num:
+            self._num[col] = np.where(mask, np.nan, self._num[col])
+        if col in self._codes:
+            codes, uniques = self._codes[col]
+            self._codes[col] = (np.where(mask, -1, codes), uniques)
+
+
+# -----------------------------
+# Kurallar
+# -----------------------------
+@dataclass
+class Rule:
+    """
+    check(cols) -> (uygulanan satırlar, ihlal eden satırlar) bool dizileri.
+    kind: range / enum hücre kuralıdır (target = kolonun kendisi);
+    cross kuralları birden çok kolona bakar, target verilmezse sadece raporlanır.
+    """
+
+    name: str
+    kind: str
+    columns: tuple[str, ...]
+    check: Callable[[_Columns], tuple[np.ndarray, np.ndarray]]
+    target: str | None = None
+
+
+def range_rule(col: str, min_value: float, max_value: float) -> Rule:
+    def check(cols: _Columns):
+        v = cols.num(col)
+        has = ~np.isnan(v)
+        return has, has & ~((v >= min_value) & (v <= max_value))
+
+    return Rule(f"{col}_range", "range", (col,), check, target=col)
+
+
+def _resolution_wh(value) -> tuple[float, float]:
+    w, sep, h = str(value).partition("x")
+    try:
+        return float(w), float(h)
+    except ValueError:
+        return np.nan, np.nan
+
+
+def resolution_rule(
+    col: str, min_w: float, min_h: float, max_w: float, max_h: float
+) -> Rule:
+    """'1920x1080' biçimindeki kolonda genişlik/yükseklik aralığı."""
+
+    def check(cols: _Columns):
+        w = cols.map_uniques(col, lambda u: _resolution_wh(u)[0])
+        h = cols.map_uniques(col, lambda u: _resolution_wh(u)[1])
+        has = ~cols.na(col)
+        ok = (w >= min_w) & (w <= max_w) & (h >= min_h) & (h <= max_h)
+        return has, has & ~ok
+
+    return Rule(f"{col}_range", "range", (col,), check, target=col)
+
+
+def enum_rule(col: str, allowed) -> Rule:
+    allowed = frozenset(allowed)
+
+    def check(cols: _Columns):
+        has = ~cols.na(col)
+        return has, has & ~cols.isin(col, allowed)
+
+    return Rule(f"{col}_enum", "enum", (col,), check, target=col)
+
+
+def cross_rule(
+    name: str,
+    columns: tuple[str, ...],
+    check: Callable[[_Columns], tuple[np.ndarray, np.ndarray]],
+    target: str | None = None,
+) -> Rule:
+    return Rule(name, "cross", tuple(columns), check, target=target)
+
+
+# -----------------------------
+# Parser eşlemesinden kurallar
+# -----------------------------
+def _bound_pairs(kwargs: dict) -> dict[str, tuple[float, float]]:
+    """{'min_ram': 4, 'max_ram': 256} -> {'ram': (4, 256)}."""
+    out = {}
+    for k, v in kwargs.items():
+        if k.startswith("min_") and f"max_{k[4:]}" in kwargs:
+            out[k[4:]] = (v, kwargs[f"max_{k[4:]}"])
+    return out
+
+
+def range_rules_from_parsers(parsers: dict | None = None) -> list[Rule]:
+    """DEFAULT_PARSERS'taki min_*/max_* argümanlarından aralık kuralları."""
+    rules = []
+    for col, spec in (parsers or DEFAULT_PARSERS).items():
+        if not isinstance(spec, tuple):
+            continue
+        pairs = _bound_pairs(spec[1])
+        if set(pairs) == {"w", "h"}:
+            (min_w, max_w), (min_h, max_h) = pairs["w"], pairs["h"]
+            rules.append(resolution_rule(col, min_w, min_h, max_w, max_h))
+        elif len(pairs) == 1:
+            lo, hi = next(iter(pairs.values()))
+            rules.append(range_rule(col, lo, hi))
+    return rules
+
+
+def unbounded_parsers(parsers: dict | None = None) -> dict:
+    """
+    min_*/max_* argümanları -inf/inf yapılmış parser eşlemesi: parser'lar
+    sadece biçimi çözer, aralık dışı değerler NaN'a dönmeden validate()'e gelir.
+    """
+    out = {}
+    for col, spec in (parsers or DEFAULT_PARSERS).items():
+        if not isinstance(spec, tuple):
+            out[col] = spec
+            continue
+        fn, kwargs = spec
+        kwargs = dict(kwargs)
+        for suffix in _bound_pairs(kwargs):
+            kwargs[f"min_{suffix}"], kwargs[f"max_{suffix}"] = -np.inf, np.inf
+        out[col] = (fn, kwargs)
+    return out
+
+
+# -----------------------------
+# Varsayılan kurallar
+# -----------------------------
+# column_parsers'ın üretebildiği kategoriler
+ENUMS = {
+    "gpu_type": {"integrated", "dedicated", "dedicated_high_end", "shared"},
+    "gpu_vram_type": {
+        "shared",
+        "ddr3",
+        "ddr4",
+        "ddr5",
+        "gddr4",
+        "gddr5",
+        "gddr5x",
+        "gddr6",
+        "gddr6x",
+        "gddr7",
+    },
+    "ram_type": {
+        "ddr3",
+        "ddr4",
+        "ddr5",
+        "lpddr3",
+        "lpddr4",
+        "lpddr4x",
+        "lpddr5",
+        "lpddr5x",
+        "unified",
+    },
+    "display_standard": {
+        "hd",
+        "fhd",
+        "wuxga",
+        "qhd",
+        "qhd_plus",
+        "wqhd",
+        "wqxga",
+        "uhd_4k",
+        "oled",
+        "other",
+    },
+    "intended_use": {"oyun", "ofis-is", "ev-okul", "tasarım", "ev"},
+    "operating_system": {
+        "freedos",
+        "windows home",
+        "windows pro",
+        "linux",
+        "ubuntu",
+    },
+}
+
+DEDICATED_GPU = ("dedicated", "dedicated_high_end")
+SHARED_GPU = ("integrated", "shared")
+
+# ekran standardı -> kabul edilen çözünürlükler (sadece tek anlamlı olanlar)
+STANDARD_RESOLUTIONS = {
+    "hd": {"1366x768", "1280x720", "1600x900"},
+    "fhd": {"1920x1080"},
+    "wuxga": {"1920x1200"},
+    "qhd": {"2560x1440"},
+    "wqxga": {"2560x1600"},
+    "uhd_4k": {"3840x2160"},
+}
+
+
+def _dedicated_gpu_has_vram(cols: _Columns):
+    """Harici GPU'da VRAM 0 (paylaşımlı) olamaz."""
+    applies = cols.isin("gpu_type", DEDICATED_GPU) & ~np.isnan(cols.num("gpu_vram_gb"))
+    return applies, applies & (cols.num("gpu_vram_gb") <= 0)
+
+
+def _shared_gpu_no_vram(cols: _Columns):
+    """Dahili/paylaşımlı GPU'da ayrı VRAM beklenmez (genelde yanlış gpu_type)."""
+    applies = cols.isin("gpu_type", SHARED_GPU) & ~np.isnan(cols.num("gpu_vram_gb"))
+    return applies, applies & (cols.num("gpu_vram_gb") > 0)
+
+
+def _dedicated_gpu_vram_type(cols: _Columns):
+    """Harici GPU'nun bellek tipi 'shared' olamaz."""
+    applies = cols.isin("gpu_type", DEDICATED_GPU) & ~cols.na("gpu_vram_type")
+    return applies, applies & cols.isin("gpu_vram_type", {"shared"})
+
+
+def _standard_matches_resolution(cols: _Columns):
+    std_known = cols.isin("display_standard", STANDARD_RESOLUTIONS)
+    applies = std_known & ~cols.na("resolution")
+    bad = np.zeros(len(applies), dtype=bool)
+    for std, resolutions in STANDARD_RESOLUTIONS.items():
+        bad |= cols.isin("display_standard", {std}) & ~cols.isin(
+            "resolution", resolutions
+        )
+    return applies, applies & bad
+
+
+CROSS_RULES = [
+    cross_rule(
+        "dedicated_gpu_has_vram",
+        ("gpu_type", "gpu_vram_gb"),
+        _dedicated_gpu_has_vram,
+    ),
+    cross_rule("shared_gpu_no_vram", ("gpu_type", "gpu_vram_gb"), _shared_gpu_no_vram),
+    cross_rule(
+        "dedicated_gpu_vram_type",
+        ("gpu_type", "gpu_vram_type"),
+        _dedicated_gpu_vram_type,
+    ),
+    cross_rule(
+        "display_standard_resolution",
+        ("display_standard", "resolution"),
+        _standard_matches_resolution,
+    ),
+]
+
+
+def default_rules(parsers: dict | None = None) -> list[Rule]:
+    """Parser aralıkları + ENUMS + CROSS_RULES."""
+    return (
+        range_rules_from_parsers(parsers)
+        + [enum_rule(col, allowed) for col, allowed in ENUMS.items()]
+        + CROSS_RULES
+    )
+
+
+# -----------------------------
+# Doğrulama
+# -----------------------------
+REPORT_COLS = ["rule", "kind", "column", "missing", "checked", "rejected", "pct"]
+
+
+def validate(
+    df: pd.DataFrame, rules: list[Rule] | None = None, action: str = "report"
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Tüm kuralları tek geçişte uygular; (df, rapor) döndürür.
+
+    Her kolon bir kez diziye çevrilir (sayısal / factorize kodları), kurallar
+    bu diziler üzerinde vektörel maskeler üretir. Hücre kuralları (range/enum)
+    önce çalışır; reddettikleri değerler cross-field kurallarında eksik sayılır.
+
+    action='report': df değişmez.
+    action='mask'  : target'ı olan kuralların reddettiği hücreler NA yapılır
+                     (parser'ların min/max ile yaptığı şey, ama sayılarak).
+
+    Rapor satırı kural başına: missing (kolonda zaten eksik), checked (kuralın
+    uygulandığı satır), rejected, pct (rejected / checked * 100).
+    Kolonu df'te olmayan kurallar atlanır.
+    """
+    if action not in ACTIONS:
+        raise ValueError(f"Unknown action: {action}")
+
+    rules = default_rules() if rules is None else rules
+    rules = sorted(
+        (r for r in rules if all(c in df.columns for c in r.columns)),
+        key=lambda r: r.kind == "cross",
+    )
+    cols = _Columns(df)
+    rows, masks = [], {}
+
+    for rule in rules:
+        missing = int(cols.na(rule.columns[0]).sum())
+        applies, bad = rule.check(cols)
+        checked, rejected = int(applies.sum()), int(bad.sum())
+        if rule.kind != "cross" and rejected:
+            cols.invalidate(rule.target, bad)
+        if rule.target and rejected:
+            masks[rule.target] = masks.get(rule.target, False) | bad
+        rows.append(
+            {
+                "rule": rule.name,
+                "kind": rule.kind,
+                "column": ",".join(rule.columns),
+                "missing": missing,
+                "checked": checked,
+                "rejected": rejected,
+                "pct": round(100 * rejected / checked, 2) if checked else 0.0,
+            }
+        )
+
+    if action == "mask":
+        for col, mask in masks.items():
+            df.loc[mask, col] = np.nan
+
+    return df, pd.DataFrame(rows, columns=REPORT_COLS)
+
+
+def parse_and_validate(
+    df: pd.DataFrame, parsers: dict | None = None, rules: list[Rule] | None = None
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    parse_columns(df) ile aynı tablo + hangi kuralın kaç değeri attığı.
+    Parser'lar sınırsız çalışır, aralıklar validate(action='mask') ile uygulanır.
+    """
+    parsers = parsers or DEFAULT_PARSERS
+    df = parse_columns(df, unbounded_parsers(parsers))
+    rules = default_rules(parsers) if rules is None else rules
+    return validate(df, rules, action="mask")
+
+
+def main(argv: list[str] | None = None) -> None:
+    from src.etl.pipeline import OUTPUT_PATH
+
+    p = argparse.ArgumentParser(description="İşlenmiş tablo için kalite raporu")
+    p.add_argument("csv", nargs="?", default=OUTPUT_PATH)
+    args = p.parse_args(argv)
+
+    _, report = validate(pd.read_csv(args.csv))
+    print(report.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+from __future__ import annotations
+import re
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+
+
+# -----------------------------
+# Skor tabloları
+# -----------------------------
+# parse_cpu_family çıktılarına göre kaba performans sırası
+CPU_TIER_SCORES = {
+    "intel celeron": 1.0,
+    "intel n-series": 1.0,
+    "amd legacy": 1.0,
+    "mediatek": 1.0,
+    "intel": 1.5,
+    "intel core m": 2.0,
+    "intel core i3": 3.0,
+    "amd ryzen 3": 3.0,
+    "amd ryzen": 5.0,
+    "intel core i5": 5.0,
+    "amd ryzen 5": 5.0,
+    "qualcomm snapdragon x": 5.5,
+    "intel core ultra 5": 6.0,
+    "intel core i7": 7.0,
+    "amd ryzen 7": 7.0,
+    "amd ryzen ai": 7.5,
+    "intel core ultra 7": 8.0,
+    "amd ryzen ai 7": 8.0,
+    "intel core i9": 9.0,
+    "amd ryzen 9": 9.0,
+    "intel core ultra 9": 10.0,
+    "amd ryzen ai 9": 10.0,
+}
+
+# parse_gpu_model çıktıları: entegre -> 1, rtx xx50..xx90 -> 5..9 (+nesil/ti düzeltmesi)
+GPU_FIXED_SCORES = {
+    "integrated": 1.0,
+    "intel integrated": 1.0,
+    "amd integrated": 1.0,
+    "qualcomm adreno": 1.0,
+    "nvidia (other)": 3.0,
+    "nvidia rtx ada": 7.0,
+}
+
+# piksel sayısı eşikleri: hd | fhd/wuxga | qhd/wqxga | 3k | 4k+
+RES_TIER_EDGES = np.array([1366 * 768, 1920 * 1200, 2560 * 1600, 3200 * 2000])
+
+RES_RE = re.compile(r"(\d{3,5})\s*[x×]\s*(\d{3,5})")
+NV_RE = re.compile(r"nvidia (rtx|gtx|mx) (\d{3,4})( ti)?")
+
+
+# -----------------------------
+# Tekil değer -> skor (unique değerler üzerinde çalışır)
+# -----------------------------
+def _parse_resolution(val) -> tuple[float, float]:
+    m = RES_RE.search(str(val).lower())
+    if not m:
+        return np.nan, np.nan
+    return float(m.group(1)), float(m.group(2))
+
+
+def gpu_tier_score(val) -> float:
+    s = str(val).strip().lower()
+    if s in GPU_FIXED_SCORES:
+        return GPU_FIXED_SCORES[s]
+
+    m = NV_RE.fullmatch(s)
+    if not m:
+        return np.nan
+
+    kind, num, ti = m.group(1), int(m.group(2)), 0.3 if m.group(3) else 0.0
+    if kind == "mx":
+        return 2.0
+    if kind == "gtx":
+        return 3.0 + ti
+
+    # rtx 4060 -> seri 4, sınıf 6
+    series, klass = num // 1000, (num % 1000) // 10
+    if not 5 <= klass <= 9:
+        return 7.0  # workstation (rtx 3500 vb.)
+    return klass + 0.5 * (series - 3) + ti
+
+
+def _map_unique(s: pd.Series, fn) -> np.ndarray:
+    """
+    fn'i sadece benzersiz değerlere uygular, sonucu numpy take ile yayar.
+    Katalog büyüse de benzersiz spec değeri sayısı küçük kaldığı için
+    maliyet satır sayısında lineer (tek factorize + take).
+    """
+    codes, uniques = pd.factorize(s, use_na_sentinel=True)
+    table = np.array([fn(u) for u in uniques] + [np.nan], dtype=float)
+    return table[codes]  # -1 (NA) -> son eleman (nan)
+
+
+def _map_unique_pair(s: pd.Series, fn) -> tuple[np.ndarray, np.ndarray]:
+    codes, uniques = pd.factorize(s, use_na_sentinel=True)
+    table = np.array([fn(u) for u in uniques] + [(np.nan, np.nan)], dtype=float).reshape(-1, 2)
+    return table[codes, 0], table[codes, 1]
+
+
+# -----------------------------
+# Vektörel türetilmiş özellikler
+# -----------------------------
+def ppi_from_resolution(resolution: pd.Series, screen_size_inch: pd.Series) -> np.ndarray:
+    """'1920x1080' + 15.6 -> ppi (geçersizse NaN)."""
+    w, h = _map_unique_pair(resolution, _parse_resolution)
+    inch = pd.to_numeric(screen_size_inch, errors="coerce").to_numpy(dtype=float)
+    diag_px = np.sqrt(w**2 + h**2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(inch > 0, diag_px / inch, np.nan)
+
+
+def add_derived_features(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    ppi, resolution_tier, cpu_tier_score, gpu_tier_score, storage_total_gb ekler.
+    Kolon yoksa ilgili özellik atlanır.
+    """
+    out = df.copy()
+
+    if "resolution" in out.columns:
+        w, h = _map_unique_pair(out["resolution"], _parse_resolution)
+        px = w * h
+        tier = np.searchsorted(RES_TIER_EDGES, px, side="left").astype(float)
+        out["resolution_tier"] = np.where(np.isnan(px), np.nan, tier)
+
+        if "screen_size_inch" in out.columns:
+            inch = pd.to_numeric(out["screen_size_inch"], errors="coerce").to_numpy(dtype=float)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                out["ppi"] = np.where(inch > 0, np.sqrt(w**2 + h**2) / inch, np.nan)
+
+    if "cpu_family" in out.columns:
+        out["cpu_tier_score"] = _map_unique(
+            out["cpu_family"], lambda v: CPU_TIER_SCORES.get(str(v), np.nan)
+        )
+
+    if "gpu_model" in out.columns:
+        out["gpu_tier_score"] = _map_unique(out["gpu_model"], gpu_tier_score)
+
+    storage = [c for c in ("ssd_gb", "hdd_gb") if c in out.columns]
+    if storage:
+        vals = out[storage].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+        total = np.nansum(vals, axis=1)
+        out["storage_total_gb"] = np.where(np.isnan(vals).all(axis=1), np.nan, total)
+
+    return out
+
+
+# -----------------------------
+# sklearn transformer
+# -----------------------------
+class SpecFeatureTransformer(BaseEstimator, TransformerMixin):
+    """
+    Türetilmiş spec özelliklerini ekler ve eksikleri doldurur.
+
+    fit: türetilmiş kolonlar dahil numerik median / kategorik mode öğrenilir.
+    transform: aynı istatistikler uygulanır (test verisinden sızıntı yok).
+    Çıktı DataFrame'dir; ardından gelen ColumnTransformer kolon adıyla çalışabilir.
+    """
+
+    def __init__(self, derive: bool = True, missing_token: str = "missing"):
+        self.derive = derive
+        self.missing_token = missing_token
+
+    def _prepare(self, X: pd.DataFrame) -> pd.DataFrame:
+        X = pd.DataFrame(X)
+        return add_derived_features(X) if self.derive else X.copy()
+
+    def fit(self, X, y=None):
+        Xd = self._prepare(X)
+        num_cols = Xd.select_dtypes(include=["number"]).columns
+        cat_cols = Xd.columns.difference(num_cols, sort=False)
+
+        fill = Xd[num_cols].median().to_dict()
+        if len(cat_cols):
+            modes = Xd[cat_cols].mode(dropna=True)
+            first = modes.iloc[0] if len(modes) else pd.Series(index=cat_cols, dtype=object)
+            fill.update(first.fillna(self.missing_token).to_dict())
+
+        self.fill_values_ = fill
+        self.feature_names_in_ = np.asarray(pd.DataFrame(X).columns, dtype=object)
+        self.feature_names_out_ = np.asarray(Xd.columns, dtype=object)
+        return self
+
+    def transform(self, X):
+        Xd = self._prepare(X)
+        return Xd.fillna(self.fill_values_)
+
+    def get_feature_names_out(self, input_features=None):
+        return self.feature_names_out_
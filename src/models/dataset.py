@@ -0,0 +1,117 @@
+from __future__ import annotations
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder
+
+from src.features.spec_features import SpecFeatureTransformer, ppi_from_resolution
+
+
+# -----------------------------
+# model.ipynb ile aynı kolon seçimi
+# -----------------------------
+PROCESSED_PATH = "../data/processed/laptop_data_processed.csv"
+
+TARGET_COL = "price_try"
+
+DROP_COLS = [
+    "title",
+    "cpu_model",
+    "cpu_cores",
+    "hdd_gb",
+    "scraped_at",
+    "url",
+    "platform",
+    "source_file",
+]
+
+# notebook'taki cat_idx = [0, 1, 2, 3, 4, 8, 9, 10, 12, 15, 16, 18, 19] karşılığı
+CAT_COLS = [
+    "brand",
+    "intended_use",
+    "color",
+    "weight",
+    "cpu_family",
+    "ram_type",
+    "gpu_model",
+    "gpu_type",
+    "gpu_vram_type",
+    "resolution",
+    "display_standard",
+    "panel_type",
+    "operating_system",
+]
+
+
+# -----------------------------
+# Hazırlık adımları
+# -----------------------------
+def add_ppi(df: pd.DataFrame) -> pd.DataFrame:
+    """resolution + screen_size_inch -> ppi (res_w/res_h ara kolonları tutulmaz)."""
+    df["ppi"] = ppi_from_resolution(df["resolution"], df["screen_size_inch"])
+    return df
+
+
+def impute_median_mode(df: pd.DataFrame) -> pd.DataFrame:
+    """Numerik kolonlar median, kategorikler mode (yoksa 'missing') ile doldurulur."""
+    return SpecFeatureTransformer(derive=False).fit_transform(df)
+
+
+def prepare_model_frame(df: pd.DataFrame, dedupe: bool = True) -> pd.DataFrame:
+    """
+    model.ipynb'deki hazırlık (index korunur):
+    drop_cols -> duplicate -> price_try null -> median/mode impute -> ppi.
+    """
+    df = df.drop(columns=[c for c in DROP_COLS if c in df.columns])
+    if dedupe:
+        df = df.drop_duplicates(keep="first")
+    df = df.dropna(subset=[TARGET_COL])
+    df = impute_median_mode(df)
+    df = add_ppi(df)
+    return df
+
+
+def load_model_frame(path: str = PROCESSED_PATH) -> pd.DataFrame:
+    """İşlenmiş csv'yi okuyup modele hazır hale getirir."""
+    df = pd.read_csv(path)
+    return prepare_model_frame(df).reset_index(drop=True)
+
+
+def split_log_price(
+    df: pd.DataFrame, test_size: float = 0.15, random_state: int = 2
+) -> tuple[pd.DataFrame, pd.DataFrame, pd.Series, pd.Series]:
+    """X / log(price_try) ayrımı ve notebook ile aynı train/test split."""
+    X = df.drop(columns=[TARGET_COL])
+    y = np.log(df[TARGET_COL])
+    return train_test_split(X, y, test_size=test_size, random_state=random_state)
+
+
+def build_preprocessor(cat_cols: list[str] | None = None) -> ColumnTransformer:
+    """notebook'taki step1: kategoriklere OneHotEncoder, kalanlar passthrough."""
+    return ColumnTransformer(
+        transformers=[
+            (
+                "col_tnf",
+                OneHotEncoder(
+                    handle_unknown="ignore", sparse_output=False, drop="first"
+                ),
+                cat_cols if cat_cols is not None else CAT_COLS,
+            )
+        ],
+        remainder="passthrough",
+    )
+
+
+def build_feature_preprocessor(cat_cols: list[str] | None = None) -> Pipeline:
+    """
+    SpecFeatureTransformer (türetilmiş özellikler + fit'te öğrenilen impute)
+    ardından step1. Ham (impute edilmemiş) X ile kullanılır.
+    """
+    return Pipeline(
+        [
+            ("features", SpecFeatureTransformer()),
+            ("step1", build_preprocessor(cat_cols)),
+        ]
+    )
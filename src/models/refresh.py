@@ -0,0 +1,347 @@
+from __future__ import annotations
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.pipeline import Pipeline
+
+from src.models.dataset import (
+    CAT_COLS,
+    DROP_COLS,
+    TARGET_COL,
+    build_preprocessor,
+    prepare_model_frame,
+)
+
+
+# -----------------------------
+# Varsayılanlar
+# -----------------------------
+KEY_COLS = ["platform", "url"]
+
+STATE_FILE = "state.joblib"
+
+
+def default_models() -> dict[str, object]:
+    """model.ipynb'deki RF ve XGB ayarları (xgboost yoksa sadece RF)."""
+    models = {
+        "random_forest": RandomForestRegressor(
+            n_estimators=100,
+            random_state=3,
+            max_samples=0.5,
+            max_features=0.75,
+            max_depth=15,
+            n_jobs=-1,
+        ),
+    }
+    try:
+        from xgboost import XGBRegressor
+
+        models["xgboost"] = XGBRegressor(
+            n_estimators=45,
+            max_depth=5,
+            learning_rate=0.5,
+            verbosity=0,
+            random_state=42,
+        )
+    except ImportError:
+        pass
+    return models
+
+
+# -----------------------------
+# Satır kimliği / değişiklik tespiti
+# -----------------------------
+def row_keys(df: pd.DataFrame) -> pd.Series:
+    return df["platform"].astype("string") + "|" + df["url"].astype("string")
+
+
+def row_hashes(df: pd.DataFrame, cols: list[str]) -> pd.Series:
+    """
+    Satır içeriğinin (özellikler + fiyat) 64-bit hash'i. Numerikler float64'e
+    çevrilir: NaN'lı / NaN'sız snapshot'ta aynı değer (16 / 16.0) aynı hash'i alır.
+    """
+    frame = df[cols]
+    num = frame.select_dtypes("number").columns
+    frame = frame.astype({c: "float64" for c in num})
+    return pd.util.hash_pandas_object(frame, index=False)
+
+
+def diff_rows(prev: pd.Series | None, curr: pd.Series) -> dict[str, pd.Index]:
+    """
+    prev/curr: key -> hash.
+    new: önceki eğitimde olmayan, changed: hash'i değişen, removed: artık olmayan.
+    """
+    if prev is None or prev.empty:
+        return {"new": curr.index, "changed": pd.Index([]), "removed": pd.Index([])}
+
+    common = curr.index.intersection(prev.index)
+    changed = common[curr.loc[common].values != prev.loc[common].values]
+    return {
+        "new": curr.index.difference(prev.index),
+        "changed": changed,
+        "removed": prev.index.difference(curr.index),
+    }
+
+
+# -----------------------------
+# Drift
+# -----------------------------
+def reference_stats(X: pd.DataFrame, y: pd.Series, n_bins: int = 10) -> dict:
+    """PSI için referans dağılımlar: numerikte quantile kovaları, kategorikte oranlar."""
+    stats = {"numeric": {}, "categorical": {}}
+
+    frame = X.assign(**{TARGET_COL: y})
+    for c in frame.columns:
+        s = frame[c]
+        if c in CAT_COLS:
+            stats["categorical"][c] = s.astype("string").value_counts(normalize=True)
+            continue
+
+        values = s.to_numpy(dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            continue
+        edges = np.unique(np.quantile(values, np.linspace(0, 1, n_bins + 1)))
+        if len(edges) < 2:
+            continue
+        counts = np.histogram(np.clip(values, edges[0], edges[-1]), bins=edges)[0]
+        stats["numeric"][c] = (edges, counts / max(counts.sum(), 1))
+
+    return stats
+
+
+def _psi(expected: np.ndarray, actual: np.ndarray, eps: float = 1e-4) -> float:
+    e = np.clip(expected, eps, None)
+    a = np.clip(actual, eps, None)
+    return float(np.sum((a - e) * np.log(a / e)))
+
+
+def drift_report(ref: dict, X: pd.DataFrame, y: pd.Series) -> dict[str, float]:
+    """Kolon bazında PSI (Population Stability Index)."""
+    out = {}
+    frame = X.assign(**{TARGET_COL: y})
+
+    for c, (edges, expected) in ref["numeric"].items():
+        if c not in frame.columns:
+            continue
+        values = frame[c].to_numpy(dtype=float)
+        values = values[~np.isnan(values)]
+        counts = np.histogram(np.clip(values, edges[0], edges[-1]), bins=edges)[0]
+        out[c] = _psi(expected, counts / max(counts.sum(), 1))
+
+    for c, expected in ref["categorical"].items():
+        if c not in frame.columns:
+            continue
+        actual = frame[c].astype("string").value_counts(normalize=True)
+        cats = expected.index.union(actual.index)
+        out[c] = _psi(
+            expected.reindex(cats, fill_value=0).to_numpy(),
+            actual.reindex(cats, fill_value=0).to_numpy(),
+        )
+
+    return out
+
+
+# -----------------------------
+# Eğitim adımları
+# -----------------------------
+def _full_fit(models: dict[str, object], X: pd.DataFrame, y: pd.Series) -> dict[str, Pipeline]:
+    fitted = {}
+    for name, model in models.items():
+        pipe = Pipeline([("step1", build_preprocessor()), ("step2", clone(model))])
+        fitted[name] = pipe.fit(X, y)
+    return fitted
+
+
+def _is_xgb(est) -> bool:
+    return type(est).__module__.startswith("xgboost")
+
+
+def n_trees(pipe: Pipeline) -> int | None:
+    """Modeldeki ağaç / boosting turu sayısı (bilinmiyorsa None)."""
+    est = pipe.named_steps["step2"]
+    if _is_xgb(est):
+        return int(est.get_booster().num_boosted_rounds())
+    estimators = getattr(est, "estimators_", None)
+    return len(estimators) if estimators is not None else None
+
+
+def _incremental_fit(
+    pipe: Pipeline,
+    X: pd.DataFrame,
+    y: pd.Series,
+    add_trees: int,
+    max_trees: int | None,
+) -> bool:
+    """
+    Mevcut pipeline'a ağaç ekler. step1 (OneHot) yeniden fit edilmez ki
+    özellik uzayı eski ağaçlarla aynı kalsın. Desteklenmeyen modelde ve
+    eklemeyle max_trees'i aşacak XGB booster'ında False döner (tam eğitim):
+    boosting'de eski turlar atılamaz, sonraki turlar onlara göre öğrenilmiş.
+    """
+    pre = pipe.named_steps["step1"]
+    est = pipe.named_steps["step2"]
+    Xt = pre.transform(X)
+
+    if _is_xgb(est):
+        # continued boosting: mevcut booster'ın üzerine add_trees tur daha
+        booster = est.get_booster()
+        if max_trees is not None and booster.num_boosted_rounds() + add_trees > max_trees:
+            return False
+        est.set_params(n_estimators=add_trees)
+        est.fit(Xt, y, xgb_model=booster)
+        return True
+
+    params = est.get_params()
+    if "warm_start" not in params or "n_estimators" not in params:
+        return False
+
+    est.set_params(warm_start=True, n_estimators=params["n_estimators"] + add_trees)
+    est.fit(Xt, y)
+    est.set_params(warm_start=False)
+
+    # ormanı sınırla: en eski ağaçları at (sadece bagging ormanlarında güvenli)
+    if max_trees is not None and hasattr(est, "estimators_") and isinstance(est.estimators_, list):
+        if len(est.estimators_) > max_trees:
+            est.estimators_ = est.estimators_[-max_trees:]
+            est.set_params(n_estimators=max_trees)
+
+    return True
+
+
+# -----------------------------
+# Refresh
+# -----------------------------
+def refresh_models(
+    df_processed: pd.DataFrame,
+    state_dir: str = "../models/refresh",
+    models: dict[str, object] | None = None,
+    drift_threshold: float = 0.2,
+    add_trees: int = 20,
+    max_trees: int | None = 400,
+    replay_ratio: float = 1.0,
+    random_state: int = 42,
+    force_full: bool = False,
+) -> dict:
+    """
+    Yeni işlenmiş snapshot ile modelleri günceller.
+
+    - (platform, url) anahtarı + satır hash'i ile yeni/değişen satırlar bulunur.
+    - Son tam eğitimin referans dağılımına göre PSI hesaplanır; herhangi bir
+      kolonda drift_threshold aşılırsa (ya da state yoksa) tam eğitim yapılır.
+    - Aksi halde yalnızca delta + replay_ratio oranında eski satır örneğiyle
+      ağaç eklenir: RF/ET için warm_start, XGB için continued boosting.
+    - Hash ve PSI impute edilmemiş ham değerlerden hesaplanır.
+    - max_trees: ormanda en eski ağaçlar atılır; XGB booster'ı sınırı
+      aşacaksa o model tam eğitilir. Rapor: refit (tam eğitilen modeller),
+      trees (model başına ağaç sayısı), over_max_trees (sınırı aşan; boş olmalı).
+    """
+    t0 = time.perf_counter()
+    models = models if models is not None else default_models()
+    os.makedirs(state_dir, exist_ok=True)
+    state_path = Path(state_dir) / STATE_FILE
+    state = joblib.load(state_path) if state_path.exists() else None
+
+    raw = (
+        df_processed.dropna(subset=[TARGET_COL])
+        .drop_duplicates(subset=KEY_COLS, keep="last")
+        .reset_index(drop=True)
+    )
+    keys = row_keys(raw)
+
+    # değişiklik ve drift impute edilmemiş değerlerden: median/mode snapshot'a
+    # göre kaydığı için impute sonrası değişmemiş satırlar da farklı görünür
+    raw_model = raw.drop(columns=[c for c in DROP_COLS if c in raw.columns])
+    raw_model.index = keys.values
+    raw_X = raw_model.drop(columns=[TARGET_COL])
+    raw_y = np.log(raw_model[TARGET_COL])
+
+    hashes = row_hashes(raw_model, list(raw_model.columns))
+    hashes.index = raw_model.index
+
+    frame = prepare_model_frame(raw, dedupe=False)
+    frame.index = keys.values
+    X = frame.drop(columns=[TARGET_COL])
+    y = np.log(frame[TARGET_COL])
+
+    delta = diff_rows(state["row_hashes"] if state else None, hashes)
+    delta_idx = delta["new"].append(delta["changed"])
+
+    report = {
+        "n_rows": int(len(frame)),
+        "n_new": int(len(delta["new"])),
+        "n_changed": int(len(delta["changed"])),
+        "n_removed": int(len(delta["removed"])),
+        "refit": [],
+    }
+
+    drift = drift_report(state["reference"], raw_X, raw_y) if state else {}
+    max_drift = max(drift.values()) if drift else 0.0
+    report["max_psi"] = max_drift
+    report["drifted_cols"] = sorted(c for c, v in drift.items() if v > drift_threshold)
+
+    full = force_full or state is None or max_drift > drift_threshold
+    if not full and set(models) - set(state["models"]):
+        full = True
+
+    if full:
+        fitted = _full_fit(models, X, y)
+        reference = reference_stats(raw_X, raw_y)
+        report["mode"] = "full"
+        report["refit"] = sorted(fitted)
+    elif len(delta_idx) == 0:
+        fitted = state["models"]
+        reference = state["reference"]
+        report["mode"] = "noop"
+    else:
+        rng = np.random.default_rng(random_state)
+        rest = frame.index.difference(delta_idx)
+        n_replay = min(len(rest), int(len(delta_idx) * replay_ratio))
+        replay = rest[rng.choice(len(rest), size=n_replay, replace=False)] if n_replay else rest[:0]
+        train_idx = delta_idx.append(replay)
+
+        fitted = {}
+        for name, pipe in state["models"].items():
+            if name not in models:
+                continue
+            if _incremental_fit(pipe, X.loc[train_idx], y.loc[train_idx], add_trees, max_trees):
+                fitted[name] = pipe
+            else:
+                # desteklenmeyen model veya ağaç sınırını aşacak booster
+                fitted.update(_full_fit({name: models[name]}, X, y))
+                report["refit"].append(name)
+        reference = state["reference"]
+        report["mode"] = "incremental"
+
+    report["trees"] = {name: n_trees(pipe) for name, pipe in fitted.items()}
+    # max_trees sınırı her modelde tutuyor mu (XGB dahil)
+    report["over_max_trees"] = sorted(
+        name
+        for name, n in report["trees"].items()
+        if max_trees is not None and n is not None and n > max_trees
+    )
+
+    joblib.dump(
+        {
+            "row_hashes": hashes,
+            "reference": reference,
+            "models": fitted,
+            "trained_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        },
+        state_path,
+    )
+
+    report["seconds"] = round(time.perf_counter() - t0, 3)
+    return report
+
+
+def load_models(state_dir: str = "../models/refresh") -> dict[str, Pipeline]:
+    """Son refresh'te kaydedilen pipeline'ları döndürür."""
+    return joblib.load(Path(state_dir) / STATE_FILE)["models"]
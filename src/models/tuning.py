@@ -0,0 +1,415 @@
+from __future__ import annotations
+import hashlib
+import json
+import math
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.ensemble import (
+    ExtraTreesRegressor,
+    GradientBoostingRegressor,
+    RandomForestRegressor,
+)
+from sklearn.linear_model import Lasso, Ridge
+from sklearn.metrics import mean_absolute_error, r2_score
+from sklearn.model_selection import KFold
+from sklearn.neighbors import KNeighborsRegressor
+from sklearn.pipeline import Pipeline
+from sklearn.svm import SVR
+
+from src.models.dataset import build_preprocessor
+
+
+# -----------------------------
+# Arama uzayları
+# -----------------------------
+@dataclass(frozen=True)
+class SearchSpace:
+    """
+    Tek bir model ailesi için arama uzayı.
+
+    resource:
+      - "n_estimators": bütçe ağaç/boosting adım sayısıdır
+      - "n_samples": bütçe fold içi eğitim satırı oranıdır
+    """
+
+    estimator: object
+    params: dict[str, list]
+    resource: str = "n_samples"
+    min_resource: int = 25
+    max_resource: int = 400
+
+
+def _xgb_space() -> SearchSpace | None:
+    try:
+        from xgboost import XGBRegressor
+    except ImportError:
+        return None
+
+    return SearchSpace(
+        estimator=XGBRegressor(verbosity=0, random_state=42, n_jobs=1),
+        params={
+            "max_depth": [3, 4, 5, 6, 8],
+            "learning_rate": [0.03, 0.05, 0.1, 0.2, 0.3, 0.5],
+            "subsample": [0.6, 0.8, 1.0],
+            "colsample_bytree": [0.5, 0.75, 1.0],
+            "min_child_weight": [1, 3, 5],
+        },
+        resource="n_estimators",
+        min_resource=25,
+        max_resource=600,
+    )
+
+
+def default_search_spaces() -> dict[str, SearchSpace]:
+    """model.ipynb'de elle seçilen modellerin arama uzayları."""
+    spaces = {
+        "random_forest": SearchSpace(
+            estimator=RandomForestRegressor(random_state=3, n_jobs=1),
+            params={
+                "max_depth": [8, 10, 15, 20, None],
+                "max_samples": [0.5, 0.75, None],
+                "max_features": [0.5, 0.75, 1.0],
+                "min_samples_leaf": [1, 2, 4],
+            },
+            resource="n_estimators",
+            min_resource=25,
+            max_resource=400,
+        ),
+        "extra_trees": SearchSpace(
+            estimator=ExtraTreesRegressor(random_state=3, bootstrap=True, n_jobs=1),
+            params={
+                "max_depth": [8, 10, 15, 20, None],
+                "max_samples": [0.5, 0.75, None],
+                "max_features": [0.5, 0.75, 1.0],
+                "min_samples_leaf": [1, 2, 4],
+            },
+            resource="n_estimators",
+            min_resource=25,
+            max_resource=400,
+        ),
+        "gradient_boosting": SearchSpace(
+            estimator=GradientBoostingRegressor(random_state=42),
+            params={
+                "max_depth": [2, 3, 4, 5],
+                "learning_rate": [0.03, 0.05, 0.1, 0.2],
+                "subsample": [0.6, 0.8, 1.0],
+                "max_features": [0.5, 0.75, None],
+            },
+            resource="n_estimators",
+            min_resource=50,
+            max_resource=800,
+        ),
+        "ridge": SearchSpace(
+            estimator=Ridge(),
+            params={"alpha": [0.1, 0.3, 1, 3, 10, 30, 100]},
+        ),
+        "lasso": SearchSpace(
+            estimator=Lasso(max_iter=20000),
+            params={"alpha": [1e-4, 3e-4, 1e-3, 3e-3, 1e-2]},
+        ),
+        "knn": SearchSpace(
+            estimator=KNeighborsRegressor(),
+            params={"n_neighbors": [2, 3, 5, 7, 10], "weights": ["uniform", "distance"]},
+        ),
+        "svr": SearchSpace(
+            estimator=SVR(kernel="rbf"),
+            params={
+                "C": [1, 10, 100, 1000, 10000],
+                "epsilon": [0.01, 0.05, 0.1],
+                "gamma": ["scale", 0.01, 0.001],
+            },
+        ),
+    }
+
+    xgb = _xgb_space()
+    if xgb is not None:
+        spaces["xgboost"] = xgb
+
+    return spaces
+
+
+# -----------------------------
+# Fold cache
+# -----------------------------
+def _frame_hash(X: pd.DataFrame, y: pd.Series) -> str:
+    h = hashlib.sha1()
+    h.update(pd.util.hash_pandas_object(X, index=True).values.tobytes())
+    h.update(pd.util.hash_pandas_object(y, index=True).values.tobytes())
+    h.update(",".join(map(str, X.columns)).encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+def prepare_folds(
+    X: pd.DataFrame,
+    y: pd.Series,
+    cv: int = 5,
+    random_state: int = 42,
+    cache_dir: str | None = None,
+) -> list[tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Her fold için preprocessor'ı fold train'ine fit edip dönüştürülmüş
+    (X_tr, y_tr, X_val, y_val) döndürür. cache_dir verilirse diske yazılır ve
+    aynı veri + split için tekrar hesaplanmaz.
+    """
+    cache_path = None
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        key = f"{_frame_hash(X, y)}_cv{cv}_rs{random_state}"
+        cache_path = Path(cache_dir) / f"folds_{key}.joblib"
+        if cache_path.exists():
+            return joblib.load(cache_path)
+
+    folds = []
+    kf = KFold(n_splits=cv, shuffle=True, random_state=random_state)
+    y_arr = np.asarray(y, dtype=float)
+
+    for tr_idx, val_idx in kf.split(X):
+        pre = build_preprocessor()
+        X_tr = pre.fit_transform(X.iloc[tr_idx]).astype(np.float64)
+        X_val = pre.transform(X.iloc[val_idx]).astype(np.float64)
+        folds.append((X_tr, y_arr[tr_idx], X_val, y_arr[val_idx]))
+
+    if cache_path is not None:
+        joblib.dump(folds, cache_path)
+
+    return folds
+
+
+# -----------------------------
+# Checkpoint
+# -----------------------------
+def _trial_key(data_key: str, model: str, params: dict, resource: int, fold: int) -> str:
+    payload = json.dumps(
+        [data_key, model, params, resource, fold], sort_keys=True, default=str
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _load_checkpoint(path: Path) -> dict[str, dict]:
+    done = {}
+    if not path.exists():
+        return done
+
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                # yarım yazılmış son satır (kesinti) -> yok say
+                continue
+            done[row["key"]] = row
+    return done
+
+
+# -----------------------------
+# Değerlendirme (worker)
+# -----------------------------
+def _score(y_true, y_pred, scoring: str) -> float:
+    if scoring == "r2":
+        return float(r2_score(y_true, y_pred))
+    if scoring == "neg_mae":
+        return -float(mean_absolute_error(y_true, y_pred))
+    raise ValueError(f"Unknown scoring: {scoring}")
+
+
+def _fit_and_score(space, params, resource, fold, scoring, seed):
+    X_tr, y_tr, X_val, y_val = fold
+    est = clone(space.estimator).set_params(**params)
+
+    if space.resource == "n_estimators":
+        est.set_params(n_estimators=int(resource))
+    elif resource < space.max_resource:
+        # n_samples: bütçe oranı kadar satırla eğit
+        n = max(int(len(y_tr) * resource / space.max_resource), 10)
+        idx = np.random.default_rng(seed).choice(len(y_tr), size=n, replace=False)
+        X_tr, y_tr = X_tr[idx], y_tr[idx]
+
+    est.fit(X_tr, y_tr)
+    return _score(y_val, est.predict(X_val), scoring)
+
+
+def _run_trial(key, space, params, resource, fold, scoring, seed):
+    return key, _fit_and_score(space, params, resource, fold, scoring, seed)
+
+
+# -----------------------------
+# Successive halving
+# -----------------------------
+@dataclass
+class TuningResult:
+    leaderboard: pd.DataFrame
+    best_model: str
+    best_params: dict
+    best_score: float
+    spaces: dict[str, SearchSpace] = field(repr=False, default_factory=dict)
+
+    def best_estimator(self):
+        """En iyi adayı tam bütçe ile (fit edilmemiş) döndürür."""
+        space = self.spaces[self.best_model]
+        est = clone(space.estimator).set_params(**self.best_params)
+        if space.resource == "n_estimators":
+            est.set_params(n_estimators=space.max_resource)
+        if "n_jobs" in est.get_params():
+            est.set_params(n_jobs=-1)
+        return est
+
+    def best_pipeline(self) -> Pipeline:
+        return Pipeline([("step1", build_preprocessor()), ("step2", self.best_estimator())])
+
+
+def _sample_candidates(
+    spaces: dict[str, SearchSpace], n_candidates: int, rng: np.random.Generator
+) -> list[tuple[str, dict]]:
+    cands = []
+    for name, space in spaces.items():
+        keys = sorted(space.params)
+        grid_size = math.prod(len(space.params[k]) for k in keys)
+        seen = set()
+
+        for _ in range(min(n_candidates, grid_size) * 10):
+            if len(seen) >= min(n_candidates, grid_size):
+                break
+            params = {k: space.params[k][rng.integers(len(space.params[k]))] for k in keys}
+            sig = json.dumps(params, sort_keys=True, default=str)
+            if sig in seen:
+                continue
+            seen.add(sig)
+            cands.append((name, params))
+    return cands
+
+
+def _resource_at(space: SearchSpace, rung: int, n_rungs: int, eta: int) -> int:
+    frac = float(eta) ** (rung - (n_rungs - 1))
+    return max(space.min_resource, int(round(space.max_resource * frac)))
+
+
+def successive_halving_search(
+    X_train: pd.DataFrame,
+    y_train: pd.Series,
+    spaces: dict[str, SearchSpace] | None = None,
+    n_candidates: int = 12,
+    eta: int = 3,
+    cv: int = 5,
+    scoring: str = "r2",
+    n_jobs: int = -1,
+    random_state: int = 42,
+    checkpoint_dir: str | None = "../models/tuning",
+    verbose: bool = True,
+) -> TuningResult:
+    """
+    Çoklu model arama uzayında successive halving.
+
+    - Her modelden n_candidates rastgele konfigürasyon örneklenir.
+    - Tüm adaylar küçük bütçeyle (az ağaç / az satır) CV'de skorlanır,
+      en iyi 1/eta'lık kısım bir sonraki basamağa (eta kat bütçe) geçer.
+    - (aday, fold) işleri joblib ile tüm çekirdeklere dağıtılır.
+    - Biten her iş checkpoint_dir/trials.jsonl'a yazılır; aynı çağrı
+      tekrarlandığında bitmiş işler atlanır (resume).
+    - Ön işlenmiş fold'lar checkpoint_dir/folds_*.joblib olarak cache'lenir.
+    """
+    spaces = spaces if spaces is not None else default_search_spaces()
+    rng = np.random.default_rng(random_state)
+
+    folds = prepare_folds(X_train, y_train, cv=cv, random_state=random_state, cache_dir=checkpoint_dir)
+
+    # veri/split/skor değişirse eski checkpoint satırları eşleşmez
+    data_key = f"{_frame_hash(X_train, y_train)}_cv{cv}_rs{random_state}_{scoring}"
+
+    ckpt_path = None
+    done: dict[str, dict] = {}
+    if checkpoint_dir is not None:
+        ckpt_path = Path(checkpoint_dir) / "trials.jsonl"
+        done = _load_checkpoint(ckpt_path)
+
+    candidates = _sample_candidates(spaces, n_candidates, rng)
+    n_rungs = max(1, int(math.floor(math.log(max(len(candidates), 1), eta))) + 1)
+
+    history = []
+    survivors = candidates
+
+    for rung in range(n_rungs):
+        jobs, keys = [], []
+        for name, params in survivors:
+            space = spaces[name]
+            resource = _resource_at(space, rung, n_rungs, eta)
+            for f_i in range(len(folds)):
+                key = _trial_key(data_key, name, params, resource, f_i)
+                keys.append((key, name, params, resource, f_i))
+                if key not in done:
+                    jobs.append((key, name, params, resource, f_i))
+
+        if jobs:
+            out = Parallel(n_jobs=n_jobs, return_as="generator_unordered")(
+                delayed(_run_trial)(
+                    key, spaces[name], params, resource, folds[f_i], scoring, random_state + f_i
+                )
+                for key, name, params, resource, f_i in jobs
+            )
+            fh = open(ckpt_path, "a", encoding="utf-8") if ckpt_path is not None else None
+            try:
+                for key, score in out:
+                    row = {"key": key, "score": score}
+                    done[key] = row
+                    if fh is not None:
+                        fh.write(json.dumps(row) + "\n")
+                        fh.flush()
+            finally:
+                if fh is not None:
+                    fh.close()
+
+        # aday bazında fold ortalaması
+        agg: dict[tuple[str, str], list[float]] = {}
+        meta: dict[tuple[str, str], tuple[str, dict, int]] = {}
+        for key, name, params, resource, _ in keys:
+            sig = (name, json.dumps(params, sort_keys=True, default=str))
+            agg.setdefault(sig, []).append(done[key]["score"])
+            meta[sig] = (name, params, resource)
+
+        rung_rows = []
+        for sig, scores in agg.items():
+            name, params, resource = meta[sig]
+            rung_rows.append(
+                {
+                    "rung": rung,
+                    "model": name,
+                    "params": params,
+                    "resource": resource,
+                    "score_mean": float(np.mean(scores)),
+                    "score_std": float(np.std(scores)),
+                }
+            )
+        rung_rows.sort(key=lambda r: r["score_mean"], reverse=True)
+        history.extend(rung_rows)
+
+        if verbose:
+            top = rung_rows[0]
+            print(
+                f"[rung {rung}] {len(rung_rows)} aday | en iyi: {top['model']} "
+                f"{scoring}={top['score_mean']:.4f} (resource={top['resource']})"
+            )
+
+        n_keep = max(1, len(rung_rows) // eta)
+        survivors = [(r["model"], r["params"]) for r in rung_rows[:n_keep]]
+
+    leaderboard = pd.DataFrame(history).sort_values(
+        ["rung", "score_mean"], ascending=[False, False]
+    ).reset_index(drop=True)
+    best = leaderboard.iloc[0]
+
+    return TuningResult(
+        leaderboard=leaderboard,
+        best_model=best["model"],
+        best_params=best["params"],
+        best_score=float(best["score_mean"]),
+        spaces=spaces,
+    )
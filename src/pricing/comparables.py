@@ -0,0 +1,200 @@
+from __future__ import annotations
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import BallTree
+
+from src.features.spec_features import add_derived_features
+
+
+# -----------------------------
+# Spec vektörü
+# -----------------------------
+# (kolon, ağırlık, log2 ölçek?) -- cpu_family/gpu_model tier skorlarıyla temsil edilir
+SPEC_COLS = [
+    ("cpu_tier_score", 2.0, False),
+    ("cpu_generation", 1.0, False),
+    ("gpu_tier_score", 2.0, False),
+    ("gpu_vram_gb", 0.5, True),
+    ("ram_gb", 1.5, True),
+    ("ssd_gb", 1.0, True),
+    ("screen_size_inch", 1.0, False),
+    ("resolution_tier", 0.5, False),
+    ("refresh_rate_hz", 0.5, False),
+]
+
+META_COLS = ["platform", "url", "title", "brand", "price_try", "scraped_at"]
+
+
+class _PlatformIndex:
+    """Tek platformun BallTree'si + henüz ağaca girmemiş ekleme tamponu."""
+
+    def __init__(self, leaf_size: int):
+        self.leaf_size = leaf_size
+        self.tree: BallTree | None = None
+        self.base = np.empty((0, 0))
+        self.buffer: list[np.ndarray] = []
+        self.meta = pd.DataFrame()
+
+    def __len__(self) -> int:
+        return len(self.meta)
+
+    def build(self, vecs: np.ndarray, meta: pd.DataFrame) -> None:
+        self.base = vecs
+        self.buffer = []
+        self.meta = meta.reset_index(drop=True)
+        self.tree = BallTree(vecs, leaf_size=self.leaf_size) if len(vecs) else None
+
+    def add(self, vecs: np.ndarray, meta: pd.DataFrame, rebuild_ratio: float) -> None:
+        self.buffer.append(vecs)
+        self.meta = pd.concat([self.meta, meta], ignore_index=True)
+
+        n_buf = sum(len(b) for b in self.buffer)
+        if self.tree is None or n_buf > rebuild_ratio * max(len(self.base), 1):
+            all_vecs = np.vstack([self.base.reshape(-1, vecs.shape[1])] + self.buffer)
+            self.build(all_vecs, self.meta)
+
+    def query(self, Q: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """(distances, positions) -- her ikisi (n_query, <=k), mesafeye göre sıralı."""
+        dists, pos = [], []
+
+        if self.tree is not None:
+            kk = min(k, len(self.base))
+            d, i = self.tree.query(Q, k=kk)
+            dists.append(d)
+            pos.append(i)
+
+        if self.buffer:
+            # tampon küçük tutulur (rebuild_ratio) -> brute-force ucuz
+            buf = np.vstack(self.buffer)
+            sq = (Q**2).sum(axis=1)[:, None] + (buf**2).sum(axis=1)[None, :] - 2 * Q @ buf.T
+            d = np.sqrt(np.clip(sq, 0, None))
+            dists.append(d)
+            pos.append(np.broadcast_to(np.arange(len(buf)) + len(self.base), d.shape))
+
+        if not dists:
+            return np.empty((len(Q), 0)), np.empty((len(Q), 0), dtype=int)
+
+        d = np.hstack(dists)
+        p = np.hstack(pos)
+        kk = min(k, d.shape[1])
+        order = np.argsort(d, axis=1)[:, :kk]
+        return np.take_along_axis(d, order, axis=1), np.take_along_axis(p, order, axis=1)
+
+
+# -----------------------------
+# Comparables index
+# -----------------------------
+class ComparablesIndex:
+    """
+    laptop_data_processed üzerinden "benzer rakip ilanlar" indeksi.
+
+    - Spec'ler normalize edilmiş ağırlıklı vektöre çevrilir (ölçek fit'te öğrenilir).
+    - Platform başına bir BallTree tutulur; böylece "sadece rakip platform"
+      sorguları filtre gerektirmeden ilgili ağaçlara gider.
+    - add() yeni satırları tampona ekler; tampon ağacın rebuild_ratio'sunu
+      geçince ağaç yeniden kurulur (amortize O(log n) ekleme).
+    """
+
+    def __init__(self, leaf_size: int = 40, rebuild_ratio: float = 0.1):
+        self.leaf_size = leaf_size
+        self.rebuild_ratio = rebuild_ratio
+        self.indexes: dict[str, _PlatformIndex] = {}
+
+    # ---- vektörleştirme ----
+    def _raw_matrix(self, df: pd.DataFrame) -> np.ndarray:
+        d = add_derived_features(df)
+        cols = []
+        for c, _, use_log in SPEC_COLS:
+            v = (
+                pd.to_numeric(d[c], errors="coerce").to_numpy(dtype=float)
+                if c in d.columns
+                else np.full(len(d), np.nan)
+            )
+            cols.append(np.log2(np.clip(v, 0, None) + 1) if use_log else v)
+        return np.column_stack(cols)
+
+    def transform(self, df: pd.DataFrame) -> np.ndarray:
+        M = self._raw_matrix(df)
+        M = np.where(np.isnan(M), self.center_, M)
+        return (M - self.center_) / self.scale_ * self.weights_
+
+    # ---- kurulum ----
+    def fit(self, df: pd.DataFrame) -> "ComparablesIndex":
+        M = self._raw_matrix(df)
+        self.center_ = np.nan_to_num(np.nanmedian(M, axis=0))
+        scale = np.nanstd(M, axis=0)
+        self.scale_ = np.where(np.nan_to_num(scale) > 0, scale, 1.0)
+        self.weights_ = np.array([w for _, w, _ in SPEC_COLS])
+
+        vecs = self.transform(df)
+        meta = self._meta(df)
+        self.indexes = {}
+        for platform, idx in meta.groupby("platform", sort=False).groups.items():
+            pi = _PlatformIndex(self.leaf_size)
+            pi.build(vecs[meta.index.get_indexer(idx)], meta.loc[idx])
+            self.indexes[platform] = pi
+        return self
+
+    def add(self, df: pd.DataFrame) -> None:
+        """Yeni ilanları ekler (tam yeniden kurulum gerekmez)."""
+        vecs = self.transform(df)
+        meta = self._meta(df)
+        for platform, idx in meta.groupby("platform", sort=False).groups.items():
+            pi = self.indexes.setdefault(platform, _PlatformIndex(self.leaf_size))
+            pi.add(vecs[meta.index.get_indexer(idx)], meta.loc[idx], self.rebuild_ratio)
+
+    @staticmethod
+    def _meta(df: pd.DataFrame) -> pd.DataFrame:
+        meta = df.reindex(columns=META_COLS).reset_index(drop=True)
+        meta["platform"] = meta["platform"].fillna("unknown").astype(str)
+        return meta
+
+    def __len__(self) -> int:
+        return sum(len(pi) for pi in self.indexes.values())
+
+    # ---- sorgu ----
+    def query(
+        self,
+        df: pd.DataFrame,
+        k: int = 10,
+        platforms: list[str] | None = None,
+        exclude_own_platform: bool = False,
+    ) -> pd.DataFrame:
+        """
+        df'teki her laptop için en yakın k ilan (batch).
+        exclude_own_platform=True -> sadece diğer platformların ilanları (rakip).
+        Dönen tablo: query_idx, rank, distance + META_COLS.
+        """
+        Q = self.transform(df)
+        q_platform = (
+            df["platform"].astype(str).to_numpy()
+            if "platform" in df.columns
+            else np.full(len(df), "")
+        )
+        targets = platforms if platforms is not None else list(self.indexes)
+
+        # platform bazında sorgula, sonra sorgu başına k en yakını birleştir
+        parts = []
+        for platform in targets:
+            pi = self.indexes.get(platform)
+            if pi is None or len(pi) == 0:
+                continue
+            q_rows = np.flatnonzero(q_platform != platform) if exclude_own_platform else np.arange(len(Q))
+            if len(q_rows) == 0:
+                continue
+            d, p = pi.query(Q[q_rows], k)
+            m = pi.meta.iloc[p.ravel()].reset_index(drop=True)
+            m.insert(0, "distance", d.ravel())
+            m.insert(0, "query_idx", np.repeat(q_rows, d.shape[1]))
+            parts.append(m)
+
+        if not parts:
+            return pd.DataFrame(columns=["query_idx", "rank", "distance"] + META_COLS)
+
+        out = pd.concat(parts, ignore_index=True).sort_values(
+            ["query_idx", "distance"], kind="stable"
+        )
+        out["rank"] = out.groupby("query_idx").cumcount()
+        out = out[out["rank"] < k]
+        out["query_idx"] = df.index.to_numpy()[out["query_idx"].to_numpy()]
+        return out[["query_idx", "rank", "distance"] + META_COLS].reset_index(drop=True)
@@ -0,0 +1,399 @@
+"""
+Ortak tarama motoru + pazar yeri adaptörleri.
+
+Scrape iskeleti tek yerde: dizinler, driver yaşam döngüsü (supervisor),
+hız sınırlama + yeniden deneme, selector devre kesici, öğrenilen
+beklemeler, HTML arşivi, listing-only / bütçe modları ve csv çıktısı.
+Pazar yerine özel olan her şey bir MarketplaceAdapter'da:
+
+    prefix                     "HB"; dosya adları, crawl_state, arşiv manifesti
+    name                       modül / logger adı ("scrapper.<name>")
+    target_fields              detay csv'sinin spec kolonları
+    listing_url(base, page)    listeleme sayfası url'i
+    read_listing(url, d, w)    kartlar -> [{"Name", "Price", "Link", ...}]
+    read_details(link, d, archive=, strategy=, waits=)
+                               detay sayfası -> features (bkz. add_feature)
+    extract_details_from_html  arşivlenmiş HTML'den offline aynı çıkarım
+    spec_selectors             devre kesici açılınca eşleşme sayısı loglanan selector'lar
+
+Her site modülü modül seviyesinde ADAPTER tanımlar ve ADAPTER_MODULES'e
+eklenir. Yeni pazar yeri = yeni adaptör modülü; hız/dayanıklılık
+özellikleri motorda olduğu için hepsine birden gelir.
+
+Eşzamanlılık: driver yerine driver listesi verilirse (scrape'te workers=N)
+sayfalar bu driver'lara dağıtılır; her driver bir thread'de kendi
+run_with_retries döngüsünü çalıştırır. AIMDLimiter, WaitProfile ve
+HtmlArchive paylaşılır; host hızı tüm worker'lar için toplamda sınırlanır,
+paralellik sadece sayfa yükleme/bekleme sürelerini örtüştürür.
+
+    adapter = get_adapter("HB")
+    scrape(adapter, base_url, total_pages=3, crawl_budget=200, workers=3)
+"""
+
+from __future__ import annotations
+import importlib
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from html_archive import HtmlArchive
+    from throttle import AIMDLimiter, CrawlStats, RetryPolicy
+    from wait_profile import WaitProfile
+
+LINK_DIR = "../../data/link"
+SCRAPPED_DIR = "../../data/scrapped"
+PROCESSED_DIR = "../../data/processed"
+
+# platform öneki -> adaptör modülü (modülde ADAPTER)
+ADAPTER_MODULES = {"HB": "hepsiburada", "TY": "trendyol"}
+
+
+@dataclass(frozen=True)
+class MarketplaceAdapter:
+    prefix: str
+    name: str
+    target_fields: list[str]
+    listing_url: Callable[[str, int], str]
+    read_listing: Callable[..., list[dict]]
+    read_details: Callable[..., dict]
+    extract_details_from_html: Callable[[str], dict]
+    spec_selectors: dict[str, str]
+
+    @property
+    def logger(self) -> logging.Logger:
+        return logging.getLogger(f"scrapper.{self.name}")
+
+
+def get_adapter(prefix: str) -> MarketplaceAdapter:
+    """'HB' / 'hb' -> hepsiburada.ADAPTER (modül ilk çağrıda import edilir)."""
+    prefix = prefix.upper()
+    if prefix not in ADAPTER_MODULES:
+        raise ValueError(
+            f"Bilinmeyen platform: {prefix} (seçenekler: {', '.join(ADAPTER_MODULES)})"
+        )
+    return importlib.import_module(ADAPTER_MODULES[prefix]).ADAPTER
+
+
+# -----------------------------
+# Özellik yardımcıları (adaptörler de kullanır)
+# -----------------------------
+def now_str() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def empty_features(target_fields: list[str]) -> dict:
+    return {field: None for field in target_fields}
+
+
+def add_feature(features: dict, label: str, value: str) -> None:
+    """Sadece hedef alanlar; aynı etiket tekrar gelirse (ör. Renk) '; ' ile birleştirir."""
+    if label in features and value:
+        if features[label] and features[label] != value:
+            features[label] = f"{features[label]}; {value}"
+        else:
+            features[label] = value
+
+
+def has_details(features: dict | None) -> bool:
+    """Detay sayfası gerçekten okundu mu (rate limit / hata sayfasında başlık yok)."""
+    return bool(features) and features.get("Başlık") is not None
+
+
+# -----------------------------
+# Driver havuzu
+# -----------------------------
+def run_on_drivers(
+    items,
+    fetch: Callable,
+    drivers,
+    stop: Callable[[], bool] | None = None,
+    **kwargs,
+) -> tuple[list, CrawlStats]:
+    """
+    run_with_retries'in çok driver'lı hali. fetch(item, supervisor);
+    drivers tek driver / supervisor ya da listesi. Öğeler driver'lara sırayla
+    dağıtılır (items[k::n]), her driver kendi thread'inde çalışır. Sonuçlar
+    items ile hizalı, istatistikler birleştirilmiş döner. Bir worker exception
+    fırlatırsa diğerleri durdurulur ve exception çağırana geçer.
+    kwargs (limiter, policy, log, ...) run_with_retries'e aynen geçer.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from driver_supervisor import DriverSupervisor
+    from throttle import CrawlStats, run_with_retries
+
+    if not isinstance(drivers, (list, tuple)):
+        drivers = [drivers]
+    supervisors = [DriverSupervisor.wrap(d) for d in drivers]
+    items = list(items)
+    n = max(1, min(len(supervisors), len(items)))
+    if n == 1:
+        return run_with_retries(
+            items, lambda item: fetch(item, supervisors[0]), stop=stop, **kwargs
+        )
+
+    failed = threading.Event()
+
+    def _stop() -> bool:
+        return failed.is_set() or (stop is not None and stop())
+
+    def _worker(k: int) -> tuple[list, CrawlStats]:
+        try:
+            return run_with_retries(
+                items[k::n],
+                lambda item: fetch(item, supervisors[k]),
+                stop=_stop,
+                **kwargs,
+            )
+        except BaseException:
+            failed.set()
+            raise
+
+    with ThreadPoolExecutor(n, thread_name_prefix="crawl") as pool:
+        parts = [f.result() for f in [pool.submit(_worker, k) for k in range(n)]]
+
+    results: list = [None] * len(items)
+    for k, (part, _) in enumerate(parts):
+        results[k::n] = part
+    return results, CrawlStats.merge([stats for _, stats in parts])
+
+
+# -----------------------------
+# Listeleme + detay döngüleri
+# -----------------------------
+def get_product_links(
+    adapter: MarketplaceAdapter,
+    base_url: str,
+    total_pages: int = 1,
+    driver=None,
+    limiter: AIMDLimiter | None = None,
+    policy: RetryPolicy | None = None,
+    waits: WaitProfile | None = None,
+) -> pd.DataFrame:
+    """
+    Listeleme sayfalarındaki ürün adı, fiyat ve linkleri. driver liste ise
+    sayfalar paralel çekilir (bkz. run_on_drivers); sıra sayfa sırasıdır.
+    """
+    import pandas as pd
+
+    from throttle import AIMDLimiter
+
+    log = adapter.logger
+    limiter = limiter or AIMDLimiter()
+
+    def _url(page: int) -> str:
+        return adapter.listing_url(base_url, page)
+
+    def _fetch(page: int, supervisor) -> list[dict]:
+        log.info("Sayfa %d işleniyor: %s", page, _url(page))
+        return supervisor.call(
+            lambda d: adapter.read_listing(_url(page), d, waits), ok=bool
+        )
+
+    pages, stats = run_on_drivers(
+        range(1, total_pages + 1),
+        _fetch,
+        driver,
+        url_of=_url,
+        ok=bool,
+        limiter=limiter,
+        policy=policy,
+        log=log,
+        stage="listing",
+    )
+    log.info("Listeleme: %s", stats.summary(limiter))
+
+    return pd.DataFrame([row for rows in pages if rows for row in rows])
+
+
+def scrape_all_details(
+    adapter: MarketplaceAdapter,
+    links_df: pd.DataFrame,
+    driver,
+    limiter: AIMDLimiter | None = None,
+    policy: RetryPolicy | None = None,
+    archive: HtmlArchive | None = None,
+    waits: WaitProfile | None = None,
+) -> pd.DataFrame:
+    """
+    Linklerin detay sayfaları; satırlar links_df sırasında (düşen linkler
+    boş özelliklerle). Selector'lar kırılırsa RuntimeError. driver liste
+    ise detaylar paralel çekilir (bkz. run_on_drivers); devre kesici ortak.
+    """
+    import pandas as pd
+
+    from selector_health import SelectorBreaker, count_selectors
+    from throttle import AIMDLimiter
+
+    log = adapter.logger
+    links = list(links_df["Link"])
+    prices = list(links_df["Price"])
+    limiter = limiter or AIMDLimiter()
+    breaker = SelectorBreaker(log=log)
+    breaker_lock = threading.Lock()
+
+    def _details(link: str, d) -> dict:
+        features = adapter.read_details(
+            link, d, archive=archive, strategy=breaker.strategy, waits=waits
+        )
+        # yüklenemeyen sayfa (429/503, ölü session; başlık yok) selector'lar
+        # hakkında bilgi vermez: yeniden deneme / supervisor'a kalır
+        if not has_details(features):
+            return features
+        with breaker_lock:
+            tripped = breaker.record(features) is not None
+        if tripped:
+            log.error(
+                "Selector eşleşmeleri (%s): %s",
+                link,
+                count_selectors(d, adapter.spec_selectors),
+            )
+        return features
+
+    def _fetch(i: int, supervisor) -> dict:
+        if (i + 1) % 50 == 0 or i == 0:
+            log.info("%d. ürün işleniyor: %s", i + 1, links[i])
+        return supervisor.call(lambda d: _details(links[i], d), ok=has_details)
+
+    details_list, stats = run_on_drivers(
+        range(len(links)),
+        _fetch,
+        driver,
+        url_of=links.__getitem__,
+        ok=has_details,
+        limiter=limiter,
+        policy=policy,
+        log=log,
+        stop=lambda: breaker.open,
+        stage="detail",
+    )
+    log.info("Detaylar: %s | %s", stats.summary(limiter), breaker.summary())
+    if breaker.open:
+        raise RuntimeError(f"Spec selector'ları kırık ({breaker.reason})")
+
+    results = []
+    for details, link, price in zip(details_list, links, prices):
+        details = details or empty_features(adapter.target_fields)
+        details["Fiyat (TRY)"] = price
+        details["Link"] = link
+        if not details.get("Çekilme Zamanı"):
+            details["Çekilme Zamanı"] = now_str()
+        results.append(details)
+
+    return pd.DataFrame(results)
+
+
+# -----------------------------
+# Tam scrape
+# -----------------------------
+def scrape(
+    adapter: MarketplaceAdapter,
+    base_url: str,
+    total_pages: int,
+    listing_only: bool = False,
+    archive_html: bool = False,
+    crawl_budget: int | None = None,
+    workers: int = 1,
+) -> None:
+    """
+    Listeleme + detay scrape'i; linkler LINK_DIR'e, detaylar SCRAPPED_DIR'e
+    <PREFIX>_Links_/<PREFIX>_Details_<zaman>.csv olarak yazılır.
+    listing_only: spec'ler listeleme başlıklarından çıkarılır, detay sayfasına
+    sadece gerekli ürünler için gidilir (bkz. listing_mode).
+    archive_html: detay sayfalarının spec HTML'i arşive yazılır (bkz. html_archive).
+    crawl_budget: en fazla bu kadar detay sayfası ziyaret edilir; hangi ürünlerin
+    yenileneceğini ürün bazlı değişim istatistikleri belirler (bkz. crawl_scheduler).
+    workers: bu kadar Chrome paralel çalışır; istek hızı yine tek limiter'dan.
+    """
+    from driver_supervisor import DriverSupervisor, chrome_factory
+    from scrape_log import start_logging
+    from throttle import AIMDLimiter
+    from wait_profile import WaitProfile
+
+    start_logging()
+    log = adapter.logger
+    prefix = adapter.prefix
+
+    os.makedirs(LINK_DIR, exist_ok=True)
+    os.makedirs(SCRAPPED_DIR, exist_ok=True)
+    os.makedirs(PROCESSED_DIR, exist_ok=True)
+
+    previous = None
+    if listing_only or crawl_budget is not None:
+        from listing_mode import previous_snapshot
+
+        # yeni link csv'si yazılmadan önce: karşılaştırma bir önceki snapshot'la
+        previous = previous_snapshot(prefix, LINK_DIR, SCRAPPED_DIR)
+
+    if workers < 1:
+        raise ValueError(f"workers >= 1 olmalı: {workers}")
+    # çökünce / belleği şişince driver'ı yenileyen supervisor'lar (worker
+    # başına bir); scrape fonksiyonlarına driver yerine geçer. Chrome ilk
+    # sayfada açılır, kullanılmayan worker driver başlatmaz.
+    drivers = [DriverSupervisor(chrome_factory, log=log) for _ in range(workers)]
+    # listeleme ve detay aynı host'a gidiyor: tüm worker'lar için tek limiter
+    limiter = AIMDLimiter()
+    # koşul başına bekleme süreleri; run'lar arası data/crawl_state'te saklanır
+    waits = WaitProfile(prefix)
+    archive = None
+    if archive_html:
+        from html_archive import HtmlArchive
+
+        archive = HtmlArchive(prefix)
+
+    def _details(df: pd.DataFrame) -> pd.DataFrame:
+        return scrape_all_details(
+            adapter, df, drivers, limiter=limiter, archive=archive, waits=waits
+        )
+
+    try:
+        links_df = get_product_links(
+            adapter, base_url, total_pages, drivers, limiter=limiter, waits=waits
+        )
+        link_path = os.path.join(
+            LINK_DIR, f"{prefix}_Links_{datetime.now().strftime('%Y%m%d%H%M')}.csv"
+        )
+        links_df.to_csv(link_path, index=False)
+        log.info("Linkler kaydedildi: %s", link_path)
+
+        if crawl_budget is not None:
+            from crawl_scheduler import CrawlScheduler, build_scheduled_details
+
+            details_df = build_scheduled_details(
+                links_df,
+                adapter.target_fields,
+                _details,
+                previous,
+                CrawlScheduler(prefix),
+                crawl_budget,
+                log=log,
+            )
+        elif listing_only:
+            from listing_mode import build_listing_details
+
+            details_df = build_listing_details(
+                links_df, adapter.target_fields, _details, previous, log=log
+            )
+        else:
+            details_df = _details(links_df)
+        scrapped_path = os.path.join(
+            SCRAPPED_DIR,
+            f"{prefix}_Details_{datetime.now().strftime('%Y%m%d%H%M')}.csv",
+        )
+        details_df.to_csv(scrapped_path, index=False)
+        log.info("Detaylar kaydedildi: %s", scrapped_path)
+
+    finally:
+        for k, driver in enumerate(drivers, 1):
+            driver.quit()
+            log.info("Driver %d/%d: %s", k, len(drivers), driver.summary())
+        waits.save()
+        log.info("Beklemeler: %s", waits.summary())
+        if archive is not None:
+            archive.close()
@@ -0,0 +1,476 @@
+"""
+Fiyat oynaklığına göre öncelikli detay tarama.
+
+Her çalıştırmada listeleme sayfaları tüm ürünlerin güncel fiyatını ucuza
+verir; pahalı olan detay sayfalarıdır. Scheduler ürün başına şu durumu
+tutar (data/crawl_state/<HB|TY>.parquet, canonical link anahtarlı):
+
+    first_seen, last_seen, last_price, n_obs, n_changes, last_change,
+    last_visit, n_visits, rank (listeleme sırası)
+
+ve sabit bir bütçe (detay sayfası sayısı) içinde en yüksek skorlu
+ürünleri seçer:
+
+    λ      = (n_changes + PRIOR_CHANGES) / (gözlem süresi sa + PRIOR_HOURS)
+    bayat  = 1 - exp(-λ * son ziyaretten beri geçen sa)
+             (son ziyaretten sonra fiyatı değiştiyse 1)
+    ağırlık = 1 / log2(rank + 1)      (listede üstte olan daha önemli)
+    kalıcı = exp(-VOLATILITY_PENALTY * λ * H)  (ziyaret sonrası bir sonraki
+             çalıştırmaya, H saat, kadar taze kalma; sürekli değişen ürüne
+             her tur bütçe harcamak tazeliği artırmaz)
+    skor   = ağırlık * bayat * kalıcı;  hiç ziyaret edilmemiş ürünler önce
+
+Oynak ürünler fiyatları değiştikçe (bayat = 1) sık ziyaret edilir, stabil
+ürünler seyrek; sentetik katalogda aynı bütçeyle ağırlıklı tazelik en
+eski önce politikasına göre belirgin artar (bkz. simulate).
+
+Ziyaret edilmeyen ürünlerin satırı önceki detay snapshot'ından taşınır
+(fiyat/link güncel listelemeden); önceki satırı olmayanlar başlıktan
+doldurulur (listing_mode.specs_from_titles).
+
+Politikayı denemek için: python crawl_scheduler.py simulate
+"""
+
+from __future__ import annotations
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+STATE_DIR = PROJECT_ROOT / "data" / "crawl_state"
+
+# λ için önsel: iki haftada bir değişim
+PRIOR_CHANGES = 0.5
+PRIOR_HOURS = 24 * 7.0
+# kalıcılık terimindeki λ çarpanı (simülasyonda 2-3 arası en iyi)
+VOLATILITY_PENALTY = 2.0
+# önceki çalıştırma bilinmiyorsa planlama ufku (sa)
+DEFAULT_HORIZON_HOURS = 24.0
+
+STATE_COLUMNS = {
+    "first_seen": "datetime64[ns]",
+    "last_seen": "datetime64[ns]",
+    "last_price": "float64",
+    "n_obs": "int64",
+    "n_changes": "int64",
+    "last_change": "datetime64[ns]",
+    "last_visit": "datetime64[ns]",
+    "n_visits": "int64",
+    "rank": "int64",
+}
+
+
+def _etl():
+    """src.etl modülleri; scrapper dizininden çalıştırılınca proje kökü path'e eklenir."""
+    if str(PROJECT_ROOT) not in sys.path:
+        sys.path.insert(0, str(PROJECT_ROOT))
+    from src.etl import column_parsers, loaders
+
+    return column_parsers, loaders
+
+
+# -----------------------------
+# Skor
+# -----------------------------
+def change_rate(n_changes: np.ndarray, observed_hours: np.ndarray) -> np.ndarray:
+    """Saatlik fiyat değişim oranı (önselle yumuşatılmış)."""
+    return (n_changes + PRIOR_CHANGES) / (observed_hours + PRIOR_HOURS)
+
+
+def rank_weight(rank: np.ndarray) -> np.ndarray:
+    import numpy as np
+
+    return 1.0 / np.log2(np.maximum(rank, 1) + 1.0)
+
+
+def staleness(
+    rate: np.ndarray, age_hours: np.ndarray, changed_since_visit: np.ndarray
+) -> np.ndarray:
+    """Detay satırının son ziyaretten beri eskimiş olma olasılığı."""
+    import numpy as np
+
+    p = -np.expm1(-rate * np.maximum(age_hours, 0.0))
+    return np.where(changed_since_visit, 1.0, p)
+
+
+def weighted_freshness(
+    weight: np.ndarray, rate: np.ndarray, age_hours: np.ndarray
+) -> float:
+    """Σ w·P(taze) / Σ w; 1 = tüm önemli ürünler taze."""
+    import numpy as np
+
+    if not len(weight):
+        return 1.0
+    return float(np.sum(weight * np.exp(-rate * age_hours)) / np.sum(weight))
+
+
+# -----------------------------
+# Scheduler
+# -----------------------------
+class CrawlScheduler:
+    """
+    sched = CrawlScheduler("HB")
+    plan = sched.plan(links_df, budget=300)   # plan["visit"] -> bool
+    ...
+    sched.update(links_df, plan["visit"]); sched.save()
+    """
+
+    def __init__(self, prefix: str, state_dir: str | Path = STATE_DIR):
+        import pandas as pd
+
+        self.prefix = prefix
+        self.path = Path(state_dir) / f"{prefix}.parquet"
+        if self.path.exists():
+            self.state = pd.read_parquet(self.path)
+        else:
+            self.state = pd.DataFrame(
+                {c: pd.Series(dtype=t) for c, t in STATE_COLUMNS.items()},
+                index=pd.Index([], dtype=object, name="key"),
+            )
+
+    def _current(self, links_df: pd.DataFrame) -> pd.DataFrame:
+        """Listeleme -> key, price, rank (ilk görülen sıra; tekrar eden linkler tekil)."""
+        import pandas as pd
+
+        column_parsers, loaders = _etl()
+        cur = pd.DataFrame(
+            {
+                "key": loaders.canonical_urls(links_df["Link"]).to_numpy(),
+                "price": links_df["Price"]
+                .map(column_parsers.parse_price_try)
+                .astype("float64")
+                .to_numpy(),
+                "rank": range(1, len(links_df) + 1),
+            }
+        )
+        return cur
+
+    def plan(
+        self,
+        links_df: pd.DataFrame,
+        budget: int,
+        now: datetime | None = None,
+        horizon_hours: float | None = None,
+    ) -> pd.DataFrame:
+        """
+        links_df ile hizalı plan: key, price, rank, rate, weight, stale,
+        score, new, visit. En fazla budget satırda visit=True.
+        horizon_hours: bir sonraki çalıştırmaya kadar süre; verilmezse son
+        iki çalıştırma arası (son listeleme zamanından bu yana) kabul edilir.
+        """
+        import numpy as np
+        import pandas as pd
+
+        now = pd.Timestamp(now or datetime.now())
+        cur = self._current(links_df)
+        st = self.state.reindex(cur["key"])
+
+        new = st["last_visit"].isna().to_numpy()
+        observed = (now - st["first_seen"]).dt.total_seconds().fillna(
+            0
+        ).to_numpy() / 3600
+        age = (now - st["last_visit"]).dt.total_seconds().fillna(0).to_numpy() / 3600
+        rate = change_rate(st["n_changes"].fillna(0).to_numpy(), observed)
+
+        # son ziyaretten sonra (listelemede ya da şimdi) fiyat değişti mi
+        last_price = st["last_price"].to_numpy()
+        price_moved = ~np.isnan(last_price) & (last_price != cur["price"].to_numpy())
+        changed_since_visit = (
+            price_moved | (st["last_change"] > st["last_visit"]).to_numpy()
+        )
+
+        if horizon_hours is None:
+            gap = (now - self.state["last_seen"].max()).total_seconds() / 3600
+            horizon_hours = gap if gap > 0 else DEFAULT_HORIZON_HOURS
+
+        weight = rank_weight(cur["rank"].to_numpy())
+        stale = staleness(rate, age, changed_since_visit)
+        keep = np.exp(-VOLATILITY_PENALTY * rate * horizon_hours)
+        score = np.where(new, 1.0 + weight, weight * stale * keep)
+
+        # aynı link listede iki kez geçerse bir kez ziyaret edilir
+        dup = cur["key"].duplicated().to_numpy()
+        score = np.where(dup, -np.inf, score)
+
+        visit = np.zeros(len(cur), dtype=bool)
+        k = min(max(int(budget), 0), int((~dup).sum()))
+        if k:
+            top = np.argpartition(-score, k - 1)[:k]
+            visit[top] = True
+
+        return cur.assign(
+            rate=rate,
+            weight=weight,
+            stale=stale,
+            score=score,
+            new=new,
+            age_h=age,
+            visit=visit,
+        )
+
+    def freshness(self, plan: pd.DataFrame) -> tuple[float, float]:
+        """
+        Bu çalıştırma sonrası beklenen ağırlıklı tazelik: (plan, aynı bütçeyle
+        en eski ziyaret önce politikası). Yeni ürünler ziyaret edilmezse bayat sayılır.
+        """
+        import numpy as np
+
+        keep = ~plan["key"].duplicated().to_numpy()
+        p = plan[keep]
+        k = int(p["visit"].sum())
+
+        def _fresh(visit: np.ndarray) -> float:
+            age = np.where(visit, 0.0, np.where(p["new"], np.inf, p["age_h"]))
+            return weighted_freshness(p["weight"].to_numpy(), p["rate"].to_numpy(), age)
+
+        # referans: yeniler + en uzun süredir ziyaret edilmeyenler
+        order = np.argsort(-np.where(p["new"], np.inf, p["age_h"]), kind="stable")
+        oldest = np.zeros(len(p), dtype=bool)
+        oldest[order[:k]] = True
+        return _fresh(p["visit"].to_numpy()), _fresh(oldest)
+
+    def update(
+        self,
+        links_df: pd.DataFrame,
+        visited: np.ndarray | pd.Series,
+        now: datetime | None = None,
+    ) -> None:
+        """Listelemede görülen tüm ürünlerin istatistiklerini ve ziyaretleri işler."""
+        import numpy as np
+        import pandas as pd
+
+        now = pd.Timestamp(now or datetime.now())
+        cur = self._current(links_df).assign(visit=np.asarray(visited, dtype=bool))
+        cur = cur.groupby("key", sort=False).agg(
+            price=("price", "first"), rank=("rank", "first"), visit=("visit", "any")
+        )
+
+        st = self.state.reindex(self.state.index.union(cur.index))
+        idx = cur.index
+        old_price = st.loc[idx, "last_price"]
+        changed = old_price.notna() & cur["price"].notna() & (old_price != cur["price"])
+
+        st.loc[idx, "first_seen"] = st.loc[idx, "first_seen"].fillna(now)
+        st.loc[idx, "last_seen"] = now
+        st.loc[idx, "last_price"] = cur["price"].combine_first(old_price)
+        st.loc[idx, "n_obs"] = st.loc[idx, "n_obs"].fillna(0) + 1
+        st.loc[idx, "n_changes"] = st.loc[idx, "n_changes"].fillna(0) + changed
+        st.loc[changed[changed].index, "last_change"] = now
+        visited_keys = cur.index[cur["visit"].to_numpy()]
+        st.loc[visited_keys, "last_visit"] = now
+        st.loc[idx, "n_visits"] = st.loc[idx, "n_visits"].fillna(0) + cur["visit"]
+        st.loc[idx, "rank"] = cur["rank"]
+
+        for c in ("n_obs", "n_changes", "n_visits", "rank"):
+            st[c] = st[c].fillna(0).astype("int64")
+        self.state = st.astype(STATE_COLUMNS)
+        self.state.index.name = "key"
+
+    def save(self) -> None:
+        import os
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        self.state.to_parquet(tmp)
+        os.replace(tmp, self.path)
+
+
+# -----------------------------
+# Detay tablosu
+# -----------------------------
+def build_scheduled_details(
+    links_df: pd.DataFrame,
+    target_fields: list[str],
+    fetch_details: Callable[[pd.DataFrame], pd.DataFrame],
+    previous: tuple[pd.Series, pd.DataFrame],
+    scheduler: CrawlScheduler,
+    budget: int,
+    log=None,
+) -> pd.DataFrame:
+    """
+    Bütçe kadar ürünün detayını çeker; kalanlar önceki detay satırından
+    (yoksa başlıktan) gelir. Scheduler durumu güncellenip kaydedilir.
+    """
+    import pandas as pd
+
+    from listing_mode import specs_from_titles
+
+    _, prev_details = previous
+    links_df = links_df.reset_index(drop=True)
+    plan = scheduler.plan(links_df, budget)
+    visit = plan["visit"].to_numpy()
+
+    out = specs_from_titles(links_df, target_fields)
+    prev = prev_details.reindex(plan["key"], columns=target_fields)
+    prev.index = out.index
+    has_prev = prev.notna().any(axis=1) & ~plan["visit"]
+    out.loc[has_prev] = prev.loc[has_prev].combine_first(out.loc[has_prev])
+
+    if visit.any():
+        fetched = fetch_details(links_df[visit]).reset_index(drop=True)
+        fetched.index = out.index[visit]
+        cols = [f for f in target_fields if f in fetched]
+        out.loc[visit, cols] = fetched[cols].combine_first(out.loc[visit, cols])
+
+    out["Çekilme Zamanı"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    out["Fiyat (TRY)"] = links_df["Price"]
+    out["Link"] = links_df["Link"]
+
+    fresh, oldest = scheduler.freshness(plan)
+    scheduler.update(links_df, visit)
+    scheduler.save()
+
+    if log is not None:
+        log.info(
+            "Scheduler: %d ürün, bütçe %d | ziyaret %d (yeni %d) | önceki detaydan "
+            "%d | beklenen ağırlıklı tazelik %.3f (en eski önce: %.3f)",
+            len(out),
+            budget,
+            visit.sum(),
+            (plan["new"] & plan["visit"]).sum(),
+            has_prev.sum(),
+            fresh,
+            oldest,
+        )
+    return out
+
+
+# -----------------------------
+# Simülasyon
+# -----------------------------
+def simulate(
+    n_products: int = 2000,
+    budget: int = 200,
+    runs: int = 40,
+    interval_hours: float = 24.0,
+    hidden: float = 0.5,
+    seed: int = 0,
+) -> dict[str, float]:
+    """
+    Sentetik katalog: ürün başına log-normal fiyat değişim oranı; popüler
+    (listede üstte) ürünler daha oynak. Detay satırı fiyat değişiminde veya
+    listelemeden görünmeyen bir değişimde (oran hidden * λ) bayatlar.
+    Her çalıştırmada iki politika bütçe kadar ürünü ziyaret eder:
+      priority: CrawlScheduler.plan
+      oldest:   hiç ziyaret edilmemiş, sonra en uzun süredir ziyaret edilmemiş
+    Ölçülen: ziyaret sonrası gerçek ağırlıklı tazelik, ısınma sonrası ortalama.
+    """
+    import tempfile
+
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    rate = np.exp(rng.normal(np.log(1 / 240), 1.2, n_products))  # saatlik
+    order = np.argsort(-(np.log(rate) + rng.normal(0, 1.0, n_products)))
+    links = np.array([f"https://example.com/p-{i}" for i in range(n_products)])[order]
+    rate = rate[order]  # bundan sonra her şey listeleme sırasında
+    weight = rank_weight(np.arange(1, n_products + 1))
+    p_change = -np.expm1(-rate * interval_hours)
+    p_hidden = -np.expm1(-hidden * rate * interval_hours)
+
+    # iki politika aynı değişim dizisini görsün
+    draws = [
+        (rng.random(n_products) < p_change, rng.random(n_products) < p_hidden)
+        for _ in range(runs)
+    ]
+    t0 = pd.Timestamp("2025-01-01")
+    warmup = runs // 4
+
+    results = {}
+    for policy in ("priority", "oldest"):
+        price = np.full(n_products, 50_000.0)
+        stale = np.ones(n_products, dtype=bool)
+        ever = np.zeros(n_products, dtype=bool)
+        last_visit = np.full(n_products, -np.inf)
+        hist = []
+        with tempfile.TemporaryDirectory() as tmp:
+            sched = CrawlScheduler("SIM", tmp)
+            for r, (changed, hidden_changed) in enumerate(draws):
+                now = t0 + pd.Timedelta(hours=interval_hours * r)
+                price = np.where(changed, price + 100.0 * (r + 1), price)
+                stale |= changed | hidden_changed
+                links_df = pd.DataFrame(
+                    {"Link": links, "Price": [f"{p:.0f} TL" for p in price]}
+                )
+
+                if policy == "priority":
+                    plan = sched.plan(
+                        links_df, budget, now=now, horizon_hours=interval_hours
+                    )
+                    visit = plan["visit"].to_numpy()
+                else:
+                    age = np.where(ever, r - last_visit, np.inf)
+                    visit = np.zeros(n_products, dtype=bool)
+                    visit[np.argsort(-age, kind="stable")[:budget]] = True
+                sched.update(links_df, visit, now=now)
+
+                stale[visit] = False
+                ever[visit] = True
+                last_visit[visit] = r
+                if r >= warmup:
+                    fresh = ever & ~stale
+                    hist.append(float((weight * fresh).sum() / weight.sum()))
+        results[policy] = float(np.mean(hist))
+    return results
+
+
+def main(argv: list[str] | None = None) -> None:
+    p = argparse.ArgumentParser(description="Oynaklık öncelikli tarama scheduler'ı")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    s = sub.add_parser("simulate", help="Öncelikli vs en eski önce, sentetik katalog")
+    s.add_argument("--products", type=int, default=2000)
+    s.add_argument("--budget", type=int, default=200)
+    s.add_argument("--runs", type=int, default=40)
+    s.add_argument("--interval-hours", type=float, default=24.0)
+    s.add_argument(
+        "--hidden", type=float, default=0.5, help="Görünmeyen değişim oranı / λ"
+    )
+    s.add_argument("--seed", type=int, default=0)
+
+    show = sub.add_parser("show", help="Kayıtlı durumdan en öncelikli ürünler")
+    show.add_argument("prefix", choices=["HB", "TY"])
+    show.add_argument("--top", type=int, default=20)
+    args = p.parse_args(argv)
+
+    if args.command == "simulate":
+        res = simulate(
+            args.products,
+            args.budget,
+            args.runs,
+            args.interval_hours,
+            args.hidden,
+            args.seed,
+        )
+        print(
+            f"ağırlıklı tazelik | öncelikli: {res['priority']:.3f} | "
+            f"en eski önce: {res['oldest']:.3f} "
+            f"(bütçe {args.budget}/{args.products}, {args.runs} çalıştırma)"
+        )
+    else:
+        sched = CrawlScheduler(args.prefix)
+        st = sched.state
+        if st.empty:
+            print("Durum yok:", sched.path)
+            return
+        links_df = st.sort_values("rank").assign(
+            Link=lambda d: d.index, Price=lambda d: d["last_price"].astype(str)
+        )
+        plan = sched.plan(links_df[["Link", "Price"]], budget=args.top)
+        cols = ["key", "rank", "rate", "age_h", "stale", "score"]
+        print(
+            plan.sort_values("score", ascending=False)[cols]
+            .head(args.top)
+            .to_string(index=False)
+        )
+
+
+if __name__ == "__main__":
+    main()
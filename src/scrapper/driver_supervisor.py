@@ -0,0 +1,247 @@
+"""
+Selenium driver yaşam döngüsü: çökme kurtarma + bellek bazlı geri dönüşüm.
+
+    driver = DriverSupervisor(chrome_factory, log=logger)
+    features = driver.call(lambda d: get_product_details(link, d), ok=has_details)
+    ...
+    driver.quit()
+
+- Başarısız sayfadan sonra driver'a ping atılır (execute_script). Session
+  ölmüşse veya chromedriver süreci bitmişse driver yeniden başlatılır ve
+  aynı link hemen bir kez daha denenir. Bu deneme yeniden deneme
+  politikasından (throttle.RetryPolicy) sayılmaz.
+- Her check_every sayfada bir, chromedriver + Chrome süreç ağacının toplam
+  RSS'i /proc'tan okunur. max_rss_mb aşılırsa driver sayfa arasında
+  yenilenir. recycle_every verilirse o kadar sayfada bir koşulsuz yenilenir.
+- Yenilemede eski driver quit edilir; kapanmayan alt süreçler öldürülür.
+
+/proc olmayan sistemlerde bellek kontrolü atlanır; çökme kurtarma çalışır.
+"""
+
+from __future__ import annotations
+import logging
+import os
+import signal
+import time
+from collections import Counter
+from typing import Callable, TypeVar
+
+logger = logging.getLogger("scrapper.driver_supervisor")
+
+T = TypeVar("T")
+
+MAX_RSS_MB = 2500.0
+CHECK_EVERY = 25
+PAGE_LOAD_TIMEOUT = 60
+
+
+def chrome_factory(page_load_timeout: int = PAGE_LOAD_TIMEOUT, headless: bool = False):
+    """Varsayılan driver: asılı kalan sayfa yüklemesi exception'a dönsün."""
+    from selenium import webdriver
+
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+    driver = webdriver.Chrome(options=options)
+    driver.set_page_load_timeout(page_load_timeout)
+    return driver
+
+
+# -----------------------------
+# Süreç ağacı (/proc)
+# -----------------------------
+def _children_map() -> dict[int, list[int]]:
+    children: dict[int, list[int]] = {}
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat", "rb") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # "pid (comm) state ppid ..."; comm boşluk / parantez içerebilir
+        ppid = int(stat[stat.rindex(b")") + 2 :].split()[1])
+        children.setdefault(ppid, []).append(int(name))
+    return children
+
+
+def process_tree(pid: int) -> list[int]:
+    """pid ve tüm alt süreçleri (Linux); /proc yoksa boş liste."""
+    if not os.path.isdir("/proc"):
+        return []
+    children = _children_map()
+    tree, stack = [], [pid]
+    while stack:
+        p = stack.pop()
+        tree.append(p)
+        stack.extend(children.get(p, ()))
+    return tree
+
+
+def tree_rss_mb(pid: int) -> float | None:
+    """Süreç ağacının toplam RSS'i (MB); okunamazsa None."""
+    pids = process_tree(pid)
+    if not pids:
+        return None
+    page = os.sysconf("SC_PAGE_SIZE")
+    total = 0
+    for p in pids:
+        try:
+            with open(f"/proc/{p}/statm") as f:
+                total += int(f.read().split()[1]) * page
+        except (OSError, IndexError, ValueError):
+            continue
+    return total / 1e6
+
+
+def _service_pid(driver) -> int | None:
+    process = getattr(getattr(driver, "service", None), "process", None)
+    return getattr(process, "pid", None)
+
+
+# -----------------------------
+# Supervisor
+# -----------------------------
+class DriverSupervisor:
+    """Tek driver'ı sahiplenir; çökünce / şişince yenisiyle değiştirir."""
+
+    def __init__(
+        self,
+        factory: Callable[[], object] | None = chrome_factory,
+        max_rss_mb: float | None = MAX_RSS_MB,
+        check_every: int = CHECK_EVERY,
+        recycle_every: int | None = None,
+        log: logging.Logger | None = None,
+        driver=None,
+    ):
+        self.factory = factory
+        self.max_rss_mb = max_rss_mb
+        self.check_every = check_every
+        self.recycle_every = recycle_every
+        self.log = log or logger
+        self._driver = driver
+        self.pages = 0
+        self.pages_on_driver = 0
+        self.restarts: Counter[str] = Counter()
+        self.peak_rss_mb = 0.0
+
+    @classmethod
+    def wrap(cls, driver) -> DriverSupervisor:
+        """Supervisor değilse dışarıdan verilen driver'ı sarar (yeniden başlatamaz)."""
+        if isinstance(driver, cls):
+            return driver
+        return cls(factory=None, max_rss_mb=None, driver=driver)
+
+    @property
+    def driver(self):
+        if self._driver is None:
+            if self.factory is None:
+                raise RuntimeError("Driver yok ve factory verilmemiş")
+            t0 = time.monotonic()
+            self._driver = self.factory()
+            self.pages_on_driver = 0
+            self.log.info("Driver başlatıldı (%.1fs)", time.monotonic() - t0)
+        return self._driver
+
+    # selenium driver'ı bekleyen kod (ör. quit, get) supervisor'la da çalışsın
+    def __getattr__(self, name):
+        return getattr(self.driver, name)
+
+    def alive(self) -> bool:
+        """chromedriver süreci ayakta ve session komutlara cevap veriyor mu."""
+        driver = self._driver
+        if driver is None:
+            return False
+        process = getattr(getattr(driver, "service", None), "process", None)
+        if process is not None and process.poll() is not None:
+            return False
+        try:
+            driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def rss_mb(self) -> float | None:
+        pid = _service_pid(self._driver)
+        return tree_rss_mb(pid) if pid is not None else None
+
+    def restart(self, reason: str) -> None:
+        if self.factory is None:
+            return
+        self.restarts[reason] += 1
+        self.log.warning(
+            "Driver yeniden başlatılıyor (%s; %d sayfa)", reason, self.pages_on_driver
+        )
+        self._close()
+
+    def quit(self) -> None:
+        self._close()
+
+    def _close(self) -> None:
+        driver, self._driver = self._driver, None
+        if driver is None:
+            return
+        pid = _service_pid(driver)
+        tree = process_tree(pid) if pid is not None else []
+        try:
+            driver.quit()
+        except Exception as e:
+            self.log.warning("Driver kapatılamadı: %s: %s", type(e).__name__, e)
+        # çöken Chrome'da quit alt süreçleri bırakabiliyor; pid yeniden
+        # kullanılmış olabileceği için sadece hâlâ chrome olanlar öldürülür
+        for p in tree:
+            try:
+                with open(f"/proc/{p}/comm") as f:
+                    if "chrom" not in f.read().lower():
+                        continue
+                os.kill(p, signal.SIGKILL)
+            except OSError:
+                pass
+
+    def call(
+        self, fn: Callable[[object], T], ok: Callable[[T], bool] | None = None
+    ) -> T:
+        """
+        fn(driver) çalıştırır. Exception veya ok(sonuç) False olur ve driver
+        cevap vermiyorsa driver yenilenip fn bir kez daha çalıştırılır.
+        Sonuç (veya son exception) çağırana döner.
+        """
+        for attempt in range(2):
+            error = None
+            try:
+                result = fn(self.driver)
+            except Exception as e:
+                result, error = None, e
+            good = error is None and (ok is None or ok(result))
+            if good or attempt == 1 or self.factory is None or self.alive():
+                break
+            self.restart("çöktü / cevap vermiyor")
+
+        self._after_page()
+        if error is not None:
+            raise error
+        return result
+
+    def _after_page(self) -> None:
+        self.pages += 1
+        self.pages_on_driver += 1
+        if self.factory is None or self._driver is None:
+            return
+        if self.recycle_every and self.pages_on_driver >= self.recycle_every:
+            self.restart(f"{self.recycle_every} sayfada bir yenileme")
+        elif self.max_rss_mb and self.pages_on_driver % self.check_every == 0:
+            rss = self.rss_mb()
+            if rss is None:
+                return
+            self.peak_rss_mb = max(self.peak_rss_mb, rss)
+            if rss > self.max_rss_mb:
+                self.log.info("RSS %.0f MB > %.0f MB", rss, self.max_rss_mb)
+                self.restart("bellek limiti")
+
+    def summary(self) -> str:
+        restarts = ", ".join(f"{r}: {n}" for r, n in self.restarts.items()) or "yok"
+        text = f"{self.pages} sayfa, yeniden başlatma: {restarts}"
+        if self.peak_rss_mb:
+            text += f", tepe RSS {self.peak_rss_mb:.0f} MB"
+        return text
@@ -1,48 +1,23 @@
-import os
-import logging
-from pathlib import Path
-import pandas as pd
-from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException
-
-
-LINK_DIR = "../../data/link"
-SCRAPPED_DIR = "../../data/scrapped"
-PROCESSED_DIR = "../../data/processed"
+"""
+Hepsiburada adaptörü (bkz. crawl_engine): listeleme kartları, detay sayfası
+spec tablosu ve arşivden offline çıkarım. Tarama döngüsü, driver, yeniden
+deneme ve çıktı crawl_engine'de.
+"""
 
-# Use an absolute log folder so logs don't end up in an unexpected CWD
-BASE_DIR = Path(__file__).resolve().parent
-LOG_DIR = BASE_DIR / "logs"
-LOG_DIR.mkdir(parents=True, exist_ok=True)
+from __future__ import annotations
+import logging
+from typing import TYPE_CHECKING
 
-timestamp = datetime.now().strftime("%Y%m%d%H%M")
-log_file = LOG_DIR / f"HB_Scraper_{timestamp}.log"
+# selenium ağır; sadece scrape sırasında (fonksiyon içinde) import edilir.
+# Böylece `scrap.py --help` veya TARGET_FIELDS'i yeniden kullanmak hızlı kalır.
+if TYPE_CHECKING:
+    from html_archive import HtmlArchive
 
-LOG_FORMAT = "%(asctime)s [%(levelname)s] %(message)s"
+from crawl_engine import MarketplaceAdapter, add_feature, empty_features, now_str
+from selector_health import structural_pairs
+from wait_profile import WaitProfile, wait_until
 
-# Dedicated logger to avoid clashing with Trendyol (or other modules) in the same process.
 logger = logging.getLogger("scrapper.hepsiburada")
-logger.setLevel(logging.INFO)
-
-if not logger.handlers:
-    formatter = logging.Formatter(LOG_FORMAT)
-
-    stream_handler = logging.StreamHandler()
-    stream_handler.setFormatter(formatter)
-
-    file_handler = logging.FileHandler(str(log_file), encoding="utf-8")
-    file_handler.setFormatter(formatter)
-
-    logger.addHandler(stream_handler)
-    logger.addHandler(file_handler)
-
-# Prevent logs from bubbling up to the root logger (which may have TY_Scraper handlers)
-logger.propagate = False
-
 
 # Hepsiburada - Ürün detay sayfasında gözüken teknik özellik alanlarının hedef listesi
 # (label'lar, sayfada görünen isimlerle birebir eşleşmelidir)
@@ -85,15 +60,23 @@ TARGET_FIELDS = [
 ]
 
 
-def _wait_dom_interactive(driver, timeout: int = 10) -> None:
+def _wait_dom_interactive(
+    driver, timeout: int = 10, waits: WaitProfile | None = None
+) -> None:
     """Wait until the DOM is at least interactive (fast) so selectors become available."""
-    WebDriverWait(driver, timeout).until(
+    wait_until(
+        driver,
         lambda d: d.execute_script("return document.readyState")
-        in ("interactive", "complete")
+        in ("interactive", "complete"),
+        timeout,
+        "dom_interactive",
+        waits,
     )
 
 
-def wait_for_tech_specs_with_scroll(driver, timeout: int = 20):
+def wait_for_tech_specs_with_scroll(
+    driver, timeout: int = 20, waits: WaitProfile | None = None
+):
     """Hepsiburada sometimes lazy-loads #techSpecs until user scrolls.
 
     Some product pages contain long brochure/marketing blocks. Large scroll jumps may
@@ -102,11 +85,12 @@ def wait_for_tech_specs_with_scroll(driver, timeout: int = 20):
       2) If #techSpecs exists, scroll it into view directly
       3) Otherwise scroll in smaller steps until it appears
 
-    No time.sleep is used.
+    No time.sleep is used. waits verilirse timeout gözlenen gecikmeden öğrenilir.
     """
-    _wait_dom_interactive(driver, timeout=min(10, timeout))
+    from selenium.common.exceptions import NoSuchElementException
+    from selenium.webdriver.common.by import By
 
-    wait = WebDriverWait(driver, timeout, poll_frequency=0.35)
+    _wait_dom_interactive(driver, timeout=min(10, timeout), waits=waits)
 
     def _try_jump_to_specs(d) -> None:
         """Some pages have a shortcut/tab that jumps to tech specs."""
@@ -180,84 +164,141 @@ def wait_for_tech_specs_with_scroll(driver, timeout: int = 20):
 
         return False
 
-    return wait.until(_cond)
+    return wait_until(driver, _cond, timeout, "tech_specs", waits, poll=0.35)
 
 
-def get_product_links(base_url: str, total_pages: int = 1, driver=None) -> pd.DataFrame:
-    """Hepsiburada'dan ürün başlıklarını, fiyatlarını ve linklerini çeker."""
-    all_results = []
+def listing_url(base_url: str, page: int) -> str:
+    """Sayfa numarası url'in sonuna eklenir (..&sayfa=<n>)."""
+    return base_url + str(page)
 
-    for page in range(1, total_pages + 1):
-        logger.info(f"Processing page {page}...")
-        driver.get(base_url + str(page))
 
-        wait = WebDriverWait(driver, 15)
-        # Wait until at least one price element is present on the listing
-        wait.until(
-            EC.presence_of_element_located(
-                (By.CSS_SELECTOR, "[data-test-id^='final-price']")
-            )
-        )
+def get_listing_page(url: str, driver, waits: WaitProfile | None = None) -> list[dict]:
+    """Tek listeleme sayfasındaki ürünler; sayfa yüklenmezse exception fırlatır."""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
 
-        items = driver.find_elements(By.TAG_NAME, "li")
+    driver.get(url)
 
-        for item in items:
-            try:
-                a_tag = item.find_element(By.TAG_NAME, "a")
-                title = a_tag.get_attribute("title")
-                link = a_tag.get_attribute("href")
+    # Wait until at least one price element is present on the listing
+    wait_until(
+        driver,
+        EC.presence_of_element_located(
+            (By.CSS_SELECTOR, "[data-test-id^='final-price']")
+        ),
+        15,
+        "listing",
+        waits,
+    )
 
-                price_tag = item.find_element(
-                    By.CSS_SELECTOR, "[data-test-id^='final-price']"
-                )
-                price = price_tag.text.replace("\n", " ").strip()
+    items = driver.find_elements(By.TAG_NAME, "li")
+    results = []
 
-                all_results.append({"Name": title, "Price": price, "Link": link})
-            except Exception:
-                continue
+    for item in items:
+        try:
+            a_tag = item.find_element(By.TAG_NAME, "a")
+            title = a_tag.get_attribute("title")
+            link = a_tag.get_attribute("href")
 
-    return pd.DataFrame(all_results)
+            price_tag = item.find_element(
+                By.CSS_SELECTOR, "[data-test-id^='final-price']"
+            )
+            price = price_tag.text.replace("\n", " ").strip()
 
+            results.append({"Name": title, "Price": price, "Link": link})
+        except Exception:
+            continue
+
+    return results
+
+
+# Teknik özellik tablosu class'ları (hem canlı hem offline çıkarımda)
+SPEC_ROW_CLASS = "jkj4C4LML4qv2Iq8GkL3"
+SPEC_LABEL_CLASS = "OXP5AzPvafgN_i3y6wGp"
+SPEC_VALUE_CLASS = "AxM3TmSghcDRH1F871Vh"
+
+# devre kesici açılınca hangi selector'ın kırıldığını görmek için
+SPEC_SELECTORS = {
+    "title": '[data-test-id="title"]',
+    "brand": '[data-test-id="brand"]',
+    "techSpecs": "#techSpecs",
+    "row": f".{SPEC_ROW_CLASS}",
+    "label": f".{SPEC_LABEL_CLASS}",
+    "value": f".{SPEC_VALUE_CLASS}",
+}
+
+
+def get_product_details(
+    link: str,
+    driver,
+    archive: HtmlArchive | None = None,
+    strategy: str = "classes",
+    waits: WaitProfile | None = None,
+) -> dict:
+    """
+    Tek bir ürünün detay özelliklerini çeker.
+    archive verilirse başlık/marka/teknik özellik elemanlarının HTML'i saklanır.
+    strategy="structural": spec satırları class adları yerine #techSpecs içindeki
+    iki çocuklu etiket/değer elemanlarından okunur (bkz. selector_health).
+    waits: bekleme timeout'ları gözlenen gecikmeden öğrenilir (bkz. wait_profile).
+    """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
 
-def get_product_details(link: str, driver) -> dict:
-    """Tek bir ürünün detay özelliklerini çeker."""
-    features = {field: None for field in TARGET_FIELDS}
+    features = empty_features(TARGET_FIELDS)
+    html_parts = []
 
     try:
         driver.get(link)
-        _wait_dom_interactive(driver, timeout=10)
-        wait = WebDriverWait(driver, 15)
+        _wait_dom_interactive(driver, timeout=10, waits=waits)
 
         try:
-            title_element = wait.until(
+            title_element = wait_until(
+                driver,
                 EC.presence_of_element_located(
                     (By.CSS_SELECTOR, '[data-test-id="title"]')
-                )
+                ),
+                15,
+                "title",
+                waits,
             )
-            brand_element = wait.until(
+            brand_element = wait_until(
+                driver,
                 EC.presence_of_element_located(
                     (By.CSS_SELECTOR, '[data-test-id="brand"]')
-                )
+                ),
+                15,
+                "brand",
+                waits,
             )
 
             features["Başlık"] = title_element.text.strip()
             features["Marka"] = brand_element.get_attribute("title").strip()
+            if archive is not None:
+                html_parts.append(title_element.get_attribute("outerHTML"))
+                html_parts.append(brand_element.get_attribute("outerHTML"))
 
         except Exception as e:
-            logger.warning(f"Başlık veya marka bilgisi alınamadı: {link} - {e}")
+            logger.warning("Başlık veya marka bilgisi alınamadı: %s - %s", link, e)
 
         try:
-            tech_specs = wait_for_tech_specs_with_scroll(driver, timeout=20)
-            rows = tech_specs.find_elements(By.CLASS_NAME, "jkj4C4LML4qv2Iq8GkL3")
+            tech_specs = wait_for_tech_specs_with_scroll(
+                driver, timeout=20, waits=waits
+            )
+            if archive is not None:
+                html_parts.append(tech_specs.get_attribute("outerHTML"))
+            if strategy == "structural":
+                for label, value in structural_pairs(driver, "#techSpecs"):
+                    add_feature(features, label, value)
+                rows = []
+            else:
+                rows = tech_specs.find_elements(By.CLASS_NAME, SPEC_ROW_CLASS)
 
             for row in rows:
                 try:
                     label = row.find_element(
-                        By.CLASS_NAME, "OXP5AzPvafgN_i3y6wGp"
+                        By.CLASS_NAME, SPEC_LABEL_CLASS
                     ).text.strip()
-                    value_element = row.find_element(
-                        By.CLASS_NAME, "AxM3TmSghcDRH1F871Vh"
-                    )
+                    value_element = row.find_element(By.CLASS_NAME, SPEC_VALUE_CLASS)
 
                     if value_element.find_elements(By.TAG_NAME, "a"):
                         value = (
@@ -268,68 +309,65 @@ def get_product_details(link: str, driver) -> dict:
                     else:
                         value = value_element.text.strip()
 
-                    if label in features and value:
-                        # Aynı etiket tekrar gelirse (ör. Renk) değerleri kaybetmeden birleştir
-                        if features[label] and features[label] != value:
-                            features[label] = f"{features[label]}; {value}"
-                        else:
-                            features[label] = value
+                    add_feature(features, label, value)
 
                 except Exception:
                     continue
 
         except Exception as e:
             logger.warning(
-                f"Teknik özellikler tablosu bulunamadı (lazy-load olabilir): {link} - {e}"
+                "Teknik özellikler tablosu bulunamadı (lazy-load olabilir): %s - %s",
+                link,
+                e,
             )
 
     except Exception as e:
-        logger.error(f"Ürün detayları alınamadı: {e}")
+        logger.error("Ürün detayları alınamadı: %s", e)
 
-    features["Çekilme Zamanı"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    return features
-
-
-def scrape_all_details(links_df: pd.DataFrame, driver) -> pd.DataFrame:
-    """Ürün linkleri DataFrame'inden tüm ürün detaylarını döndüren DataFrame'i oluşturur."""
-    results = []
+    if html_parts:
+        try:
+            archive.put(link, "\n".join(html_parts))
+        except Exception as e:
+            logger.warning("HTML arşive yazılamadı: %s - %s", link, e)
 
-    for i, (link, price) in enumerate(
-        zip(links_df["Link"], links_df["Price"]), start=1
-    ):
-        if i % 50 == 0 or i == 1:
-            logger.info(f"{i}. ürün işleniyor: {link}")
+    features["Çekilme Zamanı"] = now_str()
+    return features
 
-        details = get_product_details(link, driver)
-        details["Fiyat (TRY)"] = price
-        details["Link"] = link
-        details["Çekilme Zamanı"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        results.append(details)
 
-    return pd.DataFrame(results)
+def extract_details_from_html(html: str) -> dict:
+    """get_product_details'in arşivlenmiş HTML üzerinde offline karşılığı."""
+    from html_archive import has_attr, has_class, parse_html, tag
 
+    features = empty_features(TARGET_FIELDS)
+    root = parse_html(html)
 
-def scrape_hepsiburada(base_url: str, total_pages: int):
-    os.makedirs(LINK_DIR, exist_ok=True)
-    os.makedirs(SCRAPPED_DIR, exist_ok=True)
-    os.makedirs(PROCESSED_DIR, exist_ok=True)
+    title = root.find(has_attr("data-test-id", "title"))
+    brand = root.find(has_attr("data-test-id", "brand"))
+    if title is not None and brand is not None:
+        features["Başlık"] = title.text()
+        features["Marka"] = brand.attrs.get("title", "").strip()
 
-    driver = webdriver.Chrome()
+    tech_specs = root.find(has_attr("id", "techSpecs"))
+    if tech_specs is not None:
+        for row in tech_specs.find_all(has_class(SPEC_ROW_CLASS)):
+            label_el = row.find(has_class(SPEC_LABEL_CLASS))
+            value_el = row.find(has_class(SPEC_VALUE_CLASS))
+            if label_el is None or value_el is None:
+                continue
+            a_tag = value_el.find(tag("a"))
+            value = a_tag.attrs.get("title", "").strip() if a_tag else value_el.text()
+            add_feature(features, label_el.text(), value)
 
-    try:
-        links_df = get_product_links(base_url, total_pages, driver)
-        link_path = os.path.join(
-            LINK_DIR, f"HB_Links_{datetime.now().strftime('%Y%m%d%H%M')}.csv"
-        )
-        links_df.to_csv(link_path, index=False)
-        logger.info(f"Linkler kaydedildi: {link_path}")
+    return features
 
-        details_df = scrape_all_details(links_df, driver)
-        scrapped_path = os.path.join(
-            SCRAPPED_DIR, f"HB_Details_{datetime.now().strftime('%Y%m%d%H%M')}.csv"
-        )
-        details_df.to_csv(scrapped_path, index=False)
-        logger.info(f"Detaylar kaydedildi: {scrapped_path}")
 
-    finally:
-        driver.quit()
+ADAPTER = MarketplaceAdapter(
+    prefix="HB",
+    name="hepsiburada",
+    target_fields=TARGET_FIELDS,
+    listing_url=listing_url,
+    read_listing=get_listing_page,
+    read_details=get_product_details,
+    extract_details_from_html=extract_details_from_html,
+    spec_selectors=SPEC_SELECTORS,
+)
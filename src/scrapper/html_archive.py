@@ -0,0 +1,329 @@
+"""
+Ham HTML arşivi (zstd, içerik adresli) + offline yeniden çıkarım.
+
+Scrape sırasında (archive=True) detay sayfasının sadece spec'lerle ilgili
+kısımları (başlık, marka, teknik özellik bölümü; outerHTML) saklanır:
+
+    data/html_archive/
+      objects/ab/cdef....html.zst      sha256(html) adlı, tek zstd frame
+      manifest/HB_202512030147.jsonl   {"Link", "key", "scraped_at"} / satır
+
+Aynı HTML tekrar gelirse obje yeniden yazılmaz. Selector düzeltilince veya
+TARGET_FIELDS'e alan eklenince:
+
+    python html_archive.py backfill ../../data/scrapped/HB_Details_X.csv
+
+detay csv'sindeki her link için o scrape'teki arşiv HTML'i process
+pool'da yeniden parse edilir; spec kolonları yenilenir, fiyat/link aynı
+kalır. Tarayıcı ve ağ gerekmez.
+
+Saklanan parçalar birkaç KB olduğu için parse için stdlib html.parser
+üzerine küçük bir ağaç yeterli; ek bağımlılık yok (zstd: pyarrow).
+"""
+
+from __future__ import annotations
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterator
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+BASE_DIR = Path(__file__).resolve().parent
+ARCHIVE_DIR = BASE_DIR.parents[1] / "data" / "html_archive"
+
+
+# -----------------------------
+# Arşiv
+# -----------------------------
+class HtmlArchive:
+    """
+    archive = HtmlArchive("HB")
+    archive.put(link, html)  # -> key
+    archive.get(key)         # -> html
+    """
+
+    def __init__(self, prefix: str, root: str | Path = ARCHIVE_DIR):
+        self.prefix = prefix
+        self.root = Path(root)
+        stamp = datetime.now().strftime("%Y%m%d%H%M")
+        self.manifest_path = self.root / "manifest" / f"{prefix}_{stamp}.jsonl"
+        self._manifest = None
+        # paralel detay worker'ları aynı manifest'e yazar
+        self._lock = threading.Lock()
+
+    def _object_path(self, key: str) -> Path:
+        return self.root / "objects" / key[:2] / f"{key[2:]}.html.zst"
+
+    def put(self, link: str, html: str) -> str:
+        import pyarrow as pa
+
+        data = html.encode("utf-8")
+        key = hashlib.sha256(data).hexdigest()
+        path = self._object_path(key)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".tmp{os.getpid()}_{threading.get_ident()}")
+            with pa.output_stream(str(tmp), compression="zstd") as f:
+                f.write(data)
+            os.replace(tmp, path)
+
+        record = {
+            "Link": link,
+            "key": key,
+            "scraped_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        with self._lock:
+            if self._manifest is None:
+                self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+                self._manifest = open(self.manifest_path, "a", encoding="utf-8")
+            self._manifest.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._manifest.flush()
+        return key
+
+    def get(self, key: str) -> str:
+        return read_object(self.root, key)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._manifest is not None:
+                self._manifest.close()
+                self._manifest = None
+
+
+def read_object(root: str | Path, key: str) -> str:
+    import pyarrow as pa
+
+    path = Path(root) / "objects" / key[:2] / f"{key[2:]}.html.zst"
+    with pa.input_stream(str(path), compression="zstd") as f:
+        return f.read().decode("utf-8")
+
+
+def load_manifest(prefix: str, root: str | Path = ARCHIVE_DIR) -> pd.DataFrame:
+    """Platformun tüm manifest kayıtları (scraped_at sıralı)."""
+    import pandas as pd
+
+    rows = []
+    for path in sorted(glob.glob(str(Path(root) / "manifest" / f"{prefix}_*.jsonl"))):
+        with open(path, encoding="utf-8") as f:
+            rows.extend(json.loads(line) for line in f if line.strip())
+    df = pd.DataFrame(rows, columns=["Link", "key", "scraped_at"])
+    df["scraped_at"] = pd.to_datetime(df["scraped_at"])
+    return df.sort_values("scraped_at", kind="stable").reset_index(drop=True)
+
+
+# -----------------------------
+# Küçük DOM (stdlib html.parser)
+# -----------------------------
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "source", "track", "wbr",
+}  # fmt: skip
+
+
+class Node:
+    __slots__ = ("tag", "attrs", "children", "parent")
+
+    def __init__(self, tag: str, attrs: dict, parent: Node | None = None):
+        self.tag = tag
+        self.attrs = attrs
+        self.children: list[Node | str] = []
+        self.parent = parent
+
+    @property
+    def classes(self) -> set[str]:
+        return set((self.attrs.get("class") or "").split())
+
+    def iter(self) -> Iterator[Node]:
+        """Kendisi + tüm alt elemanlar (belge sırasıyla)."""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(c for c in reversed(node.children) if isinstance(c, Node))
+
+    def find_all(self, pred: Callable[[Node], bool]) -> list[Node]:
+        return [n for n in self.iter() if n is not self and pred(n)]
+
+    def find(self, pred: Callable[[Node], bool]) -> Node | None:
+        return next((n for n in self.iter() if n is not self and pred(n)), None)
+
+    def text(self) -> str:
+        """Selenium .text'e yakın: alt metinler, boşluklar tekilleştirilmiş."""
+        parts = []
+        stack: list[Node | str] = [self]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, str):
+                parts.append(node)
+            elif node.tag not in ("script", "style"):
+                stack.extend(reversed(node.children))
+        return re.sub(r"\s+", " ", " ".join(parts)).strip()
+
+
+def has_class(*names: str) -> Callable[[Node], bool]:
+    return lambda n: set(names) <= n.classes
+
+
+def has_attr(name: str, value: str | None = None) -> Callable[[Node], bool]:
+    return lambda n: name in n.attrs and (value is None or n.attrs[name] == value)
+
+
+def tag(name: str) -> Callable[[Node], bool]:
+    return lambda n: n.tag == name
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = self.cur = Node("#root", {})
+
+    def handle_starttag(self, name, attrs):
+        node = Node(name, {k: (v or "") for k, v in attrs}, self.cur)
+        self.cur.children.append(node)
+        if name not in VOID_TAGS:
+            self.cur = node
+
+    def handle_startendtag(self, name, attrs):
+        self.cur.children.append(Node(name, {k: (v or "") for k, v in attrs}, self.cur))
+
+    def handle_endtag(self, name):
+        # kapanmamış etiketleri tolere et: eşleşen ataya kadar çık
+        node = self.cur
+        while node is not None and node.tag != name:
+            node = node.parent
+        if node is not None and node.parent is not None:
+            self.cur = node.parent
+
+    def handle_data(self, data):
+        self.cur.children.append(data)
+
+
+def parse_html(html: str) -> Node:
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+
+# -----------------------------
+# Offline yeniden çıkarım
+# -----------------------------
+def _extract_chunk(args: tuple[str, str, list[str]]) -> list[dict]:
+    prefix, root, keys = args
+    from crawl_engine import get_adapter
+
+    extract = get_adapter(prefix).extract_details_from_html
+    return [extract(read_object(root, k)) for k in keys]
+
+
+def reextract(
+    prefix: str,
+    keys: list[str],
+    root: str | Path = ARCHIVE_DIR,
+    workers: int | None = None,
+    chunk: int = 200,
+) -> list[dict]:
+    """keys sırasıyla hizalı özellik dict'leri; aynı obje bir kez parse edilir."""
+    unique = list(dict.fromkeys(keys))
+    chunks = [unique[i : i + chunk] for i in range(0, len(unique), chunk)]
+    tasks = [(prefix, str(root), c) for c in chunks]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(chunks) <= 1:
+        results = map(_extract_chunk, tasks)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_extract_chunk, tasks))
+
+    parsed = {}
+    for c, out in zip(chunks, results):
+        parsed.update(zip(c, out))
+    return [dict(parsed[k]) for k in keys]
+
+
+def backfill(
+    details_csv: str,
+    prefix: str | None = None,
+    root: str | Path = ARCHIVE_DIR,
+    workers: int | None = None,
+) -> pd.DataFrame:
+    """
+    Detay csv'sindeki spec kolonlarını arşivden yeniden çıkarır. Her satır
+    için aynı linkin, satırın Çekilme Zamanı'ndan önceki en son arşiv
+    kaydı kullanılır; arşivde olmayan satırlar olduğu gibi kalır.
+    Yeni TARGET_FIELDS alanları kolon olarak eklenir.
+    """
+    import pandas as pd
+
+    from crawl_engine import get_adapter
+
+    prefix = prefix or os.path.basename(details_csv).split("_", 1)[0].upper()
+    adapter = get_adapter(prefix)
+
+    df = pd.read_csv(details_csv)
+    manifest = load_manifest(prefix, root)
+
+    rows = df[["Link"]].copy()
+    rows["_row"] = range(len(df))
+    rows["scraped_at"] = pd.to_datetime(df.get("Çekilme Zamanı"), errors="coerce")
+    # zaman bilgisi olmayan satırlar: linkin en son arşivi
+    rows["scraped_at"] = rows["scraped_at"].fillna(pd.Timestamp.max)
+    # scrape'te arşiv kaydı satır zaman damgasından hemen önce yazılır
+    matched = pd.merge_asof(
+        rows.sort_values("scraped_at"),
+        manifest.dropna(subset=["scraped_at"]),
+        on="scraped_at",
+        by="Link",
+        direction="backward",
+    ).dropna(subset=["key"])
+
+    feats = pd.DataFrame(
+        reextract(prefix, matched["key"].tolist(), root, workers),
+        index=matched["_row"].to_numpy(),
+    )
+    fields = [f for f in adapter.target_fields if f in feats and f != "Çekilme Zamanı"]
+    for f in fields:
+        if f not in df:
+            df[f] = pd.NA
+        df[f] = df[f].astype(object)
+        df.loc[feats.index, f] = feats[f].to_numpy()
+    return df
+
+
+def main(argv: list[str] | None = None) -> None:
+    p = argparse.ArgumentParser(description="Ham HTML arşivi araçları")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    b = sub.add_parser("backfill", help="Detay csv'sini arşivden yeniden çıkar")
+    b.add_argument("details_csv")
+    b.add_argument("--out", default=None, help="Varsayılan: girdinin üzerine yazar")
+    b.add_argument("--root", default=str(ARCHIVE_DIR))
+    b.add_argument("--workers", type=int, default=None)
+
+    s = sub.add_parser("stats", help="Arşiv boyutu / obje sayısı")
+    s.add_argument("--root", default=str(ARCHIVE_DIR))
+    args = p.parse_args(argv)
+
+    if args.command == "backfill":
+        out = args.out or args.details_csv
+        df = backfill(args.details_csv, root=args.root, workers=args.workers)
+        df.to_csv(out, index=False)
+        print(f"{len(df)} satır -> {out}")
+    else:
+        objs = glob.glob(str(Path(args.root) / "objects" / "*" / "*.html.zst"))
+        size = sum(os.path.getsize(o) for o in objs)
+        print(f"{len(objs)} obje, {size / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Listing-only hızlı scrape modu.
+
+Listeleme kartı başlıkları çoğu spec'i zaten içeriyor (RAM, SSD, CPU, ekran
+boyutu, çoğu zaman GPU / yenileme hızı). Bu modda:
+
+1. Spec'ler başlıktan src.etl.title_extractors ile çıkarılır.
+2. Önceki link snapshot'ında aynı başlıkla görülen ürünler için önceki
+   detay snapshot'ındaki satır kullanılır (eksik alanlar başlıktan dolar).
+3. Detay sayfası sadece şu ürünler için ziyaret edilir:
+   - başlığı önceki snapshot'a göre değişmiş olanlar
+   - REQUIRED_FIELDS'ten biri ne önceki detaydan ne başlıktan bulunabilenler
+
+Çıktı tam moddaki detay csv'si ile aynı şemadadır (TARGET_FIELDS + Fiyat + Link),
+ETL değişmeden okur.
+"""
+
+from __future__ import annotations
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# detay alanı -> title_extractors'taki kolon extractor'ı
+TITLE_FIELDS = {
+    "İşlemci Tipi": "extract_cpu_family_from_title",
+    "Ram (Sistem Belleği)": "extract_ram_from_title",
+    "SSD Kapasitesi": "extract_ssd_from_title",
+    "Ekran Kartı": "extract_gpu_from_title",
+    "Ekran Boyutu": "extract_screen_size_from_title",
+    "Ekran Yenileme Hızı": "extract_refresh_rate_from_title",
+    # HB ve TY'de ekran özelliği kolonunun adı farklı
+    "Ekran Özelliği": "extract_screen_feature_from_title",
+    "Çözünürlük Standartı": "extract_screen_feature_from_title",
+}
+
+# bunlardan biri çıkarılamazsa detay sayfasına gidilir (GPU çoğu entegre
+# modelde başlıkta yazmıyor; zorunlu tutulursa neredeyse her ürün ziyaret edilir)
+REQUIRED_FIELDS = (
+    "İşlemci Tipi",
+    "Ram (Sistem Belleği)",
+    "SSD Kapasitesi",
+    "Ekran Boyutu",
+)
+
+
+def _etl():
+    """src.etl modülleri; scrapper dizininden çalıştırılınca proje kökü path'e eklenir."""
+    if str(PROJECT_ROOT) not in sys.path:
+        sys.path.insert(0, str(PROJECT_ROOT))
+    from src.etl import loaders, title_extractors
+
+    return loaders, title_extractors
+
+
+# -----------------------------
+# Önceki snapshot
+# -----------------------------
+def previous_snapshot(
+    prefix: str, link_dir: str, scrapped_dir: str
+) -> tuple[pd.Series, pd.DataFrame]:
+    """
+    En yeni link ve detay csv'leri (yeni snapshot yazılmadan önce çağrılmalı).
+    Dönen: (canonical link -> başlık, canonical link indeksli detay tablosu).
+    """
+    import pandas as pd
+
+    loaders, _ = _etl()
+
+    def _latest(pattern: str) -> pd.DataFrame:
+        files = loaders.list_snapshots(pattern)
+        if not files:
+            return pd.DataFrame(columns=["Link"])
+        df = pd.read_csv(files[-1])
+        df.index = pd.Index(loaders.canonical_urls(df["Link"]).to_numpy(), name="key")
+        return df[~df.index.duplicated(keep="last")]
+
+    links = _latest(os.path.join(link_dir, f"{prefix}_Links_*.csv"))
+    details = _latest(os.path.join(scrapped_dir, f"{prefix}_Details_*.csv"))
+    titles = links["Name"] if "Name" in links else pd.Series(dtype=object)
+    return titles, details
+
+
+# -----------------------------
+# Başlıktan spec
+# -----------------------------
+def specs_from_titles(links_df: pd.DataFrame, target_fields: list[str]) -> pd.DataFrame:
+    """Listeleme başlıklarından detay şemasında (target_fields) tablo."""
+    import pandas as pd
+
+    _, te = _etl()
+
+    titles = links_df["Name"].astype(object)
+    out = pd.DataFrame(index=links_df.index, columns=target_fields, dtype=object)
+    out["Başlık"] = titles
+    if "Marka" in out:
+        # marka başlığın ilk kelimesi; ETL'deki parse_brand normalize eder
+        out["Marka"] = titles.fillna("").str.split().str[0]
+    for field, extractor in TITLE_FIELDS.items():
+        if field in out:
+            out[field] = getattr(te, extractor)(titles)
+    return out
+
+
+# -----------------------------
+# Detay ziyaret planı + birleştirme
+# -----------------------------
+def build_listing_details(
+    links_df: pd.DataFrame,
+    target_fields: list[str],
+    fetch_details: Callable[[pd.DataFrame], pd.DataFrame],
+    previous: tuple[pd.Series, pd.DataFrame],
+    required: tuple[str, ...] = REQUIRED_FIELDS,
+    log=None,
+) -> pd.DataFrame:
+    """
+    links_df (Name, Price, Link) -> detay tablosu; fetch_details sadece
+    ziyaret edilmesi gereken satırlarla (aynı şemada links_df alt kümesi) çağrılır.
+    """
+    import pandas as pd
+
+    loaders, te = _etl()
+    prev_titles, prev_details = previous
+
+    links_df = links_df.reset_index(drop=True)
+    keys = pd.Index(loaders.canonical_urls(links_df["Link"]).to_numpy())
+
+    out = specs_from_titles(links_df, target_fields)
+
+    # başlığı değişmemiş ürünlerde önceki detay satırı önceliklidir
+    old_title = pd.Series(prev_titles.reindex(keys).to_numpy(), index=out.index)
+    same_title = old_title.eq(links_df["Name"]).fillna(False)
+    title_changed = old_title.notna() & ~same_title
+
+    prev = prev_details.reindex(keys, columns=target_fields)
+    prev.index = out.index
+    has_prev = same_title & pd.Series(keys.isin(prev_details.index), index=out.index)
+    for field in target_fields:
+        if field == "Çekilme Zamanı":
+            continue
+        use = has_prev & ~te.missing_mask(prev[field])
+        out.loc[use, field] = prev.loc[use, field]
+
+    req = [f for f in required if f in out]
+    missing_req = pd.concat([te.missing_mask(out[f]) for f in req], axis=1).any(axis=1)
+    visit = title_changed | missing_req
+
+    if visit.any():
+        fetched = fetch_details(links_df[visit]).reset_index(drop=True)
+        fetched.index = out.index[visit]
+        # sayfadan okunamayan alanlar başlıktan çıkarılanla kalır
+        for field in target_fields:
+            if field in fetched:
+                ok = ~te.missing_mask(fetched[field])
+                out.loc[ok[ok].index, field] = fetched.loc[ok, field]
+
+    out["Çekilme Zamanı"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    out["Fiyat (TRY)"] = links_df["Price"]
+    out["Link"] = links_df["Link"]
+
+    if log is not None:
+        log.info(
+            "Listing-only: %d ürün | önceki detaydan %d | detay ziyareti %d "
+            "(başlık değişti %d, zorunlu alan eksik %d)",
+            len(out),
+            has_prev.sum(),
+            visit.sum(),
+            title_changed.sum(),
+            (missing_req & ~title_changed).sum(),
+        )
+    return out
@@ -0,0 +1,492 @@
+"""
+Yerel sahte pazar yeri: scraper yük / regresyon testi için.
+
+Canlı sitelere karşı hız ölçümü tekrarlanamıyor. Bu sunucu HB ve TY
+listeleme ve ürün sayfalarını gerçeklerinin şeklinde üretir:
+
+    HB listeleme  /hb/laptop?sayfa=N   li > a[title] + [data-test-id^='final-price']
+    HB ürün       /hb/p/<i>            [data-test-id=title|brand], kaydırınca
+                                       lazy_ms sonra gelen #techSpecs (aynı
+                                       üretilmiş class adları)
+    TY listeleme  /ty/sr?q=laptop&pi=N a.product-card (.product-brand, .product-name,
+                                       div[data-testid=single-price])
+    TY ürün       /ty/p/<i>            h1.product-title, 'Ürün Özellikleri' bölümünde
+                                       ilk 12 özellik; kalanı "Daha Fazla Göster"
+                                       tıklamasıyla. embed_state oranında gömülü
+                                       __PRODUCT_DETAIL_APP_INITIAL_STATE__
+
+Ürünler src.etl.synthetic ile gerçek snapshot'tan örneklenir. Gecikme,
+hata oranı (503), hız limiti (429), sayfa sayısı ve spec bölümü olmayan
+ürün oranı ayarlanabilir.
+
+    python mock_market.py serve --pages 5 --latency 0.2 --failure-rate 0.05
+    python scrap.py hb --url "http://127.0.0.1:8765/hb/laptop?sayfa=" --pages 5
+    python mock_market.py bench ty --pages 3 --rate 8   # sayfa/sn + spec doğruluğu
+    python mock_market.py bench hb --pages 5 --workers 3 # paralel driver havuzu
+
+bench dosya yazmaz: listeleme + detay fonksiyonlarını headless Chrome ile
+çalıştırır, çıkan spec'leri katalogla karşılaştırır.
+"""
+
+from __future__ import annotations
+import argparse
+import html
+import json
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+PLATFORMS = {"hb": "hepsiburada", "ty": "trendyol"}
+META_FIELDS = ("Başlık", "Marka", "Çekilme Zamanı", "Fiyat (TRY)", "Link")
+# TY'de bu kadar özellik görünür, kalanı "Daha Fazla Göster" arkasında
+TY_VISIBLE_ATTRIBUTES = 12
+
+
+@dataclass
+class MockConfig:
+    pages: int = 5
+    per_page: int = 24
+    latency: float = 0.05  # istek başına ortalama gecikme (sn)
+    jitter: float = 0.5  # gecikme * U(1 - jitter, 1 + jitter)
+    failure_rate: float = 0.0  # rastgele 503 oranı
+    rate_limit: float | None = None  # istek/sn üstü 429 (token bucket)
+    lazy_ms: int = 300  # HB #techSpecs kaydırmadan sonra gelir
+    missing_specs: float = 0.0  # spec bölümü olmayan ürün oranı
+    embed_state: float = 0.5  # TY gömülü ürün JSON'u olan ürün oranı
+    seed: int = 0
+
+
+# -----------------------------
+# Katalog
+# -----------------------------
+def build_catalog(platform: str, n: int, cfg: MockConfig) -> list[dict]:
+    """Gerçek snapshot dağılımından n ürün: title, brand, price, specs, bayraklar."""
+    if str(PROJECT_ROOT) not in sys.path:
+        sys.path.insert(0, str(PROJECT_ROOT))
+    from src.etl.synthetic import generate_raw_snapshot
+
+    import pandas as pd
+
+    df = generate_raw_snapshot(n, PLATFORMS[platform], seed=cfg.seed)
+    rng = random.Random(cfg.seed)
+    spec_cols = [c for c in df.columns if c not in META_FIELDS]
+
+    catalog = []
+    for row in df.to_dict("records"):
+        specs = {
+            c: str(row[c]).strip()
+            for c in spec_cols
+            if not pd.isna(row[c]) and str(row[c]).strip()
+        }
+        brand = "" if pd.isna(row["Marka"]) else str(row["Marka"])
+        title = "" if pd.isna(row["Başlık"]) else str(row["Başlık"])
+        catalog.append(
+            {
+                "title": title,
+                "brand": brand,
+                "price": row["Fiyat (TRY)"],
+                "specs": specs,
+                "has_specs": rng.random() >= cfg.missing_specs,
+                # gömülü JSON sadece TY'de var
+                "embed_state": platform == "ty" and rng.random() < cfg.embed_state,
+                # HB bazı değerleri <a title> içinde veriyor
+                "linked": {k for k in specs if rng.random() < 0.3},
+            }
+        )
+    return catalog
+
+
+# -----------------------------
+# Sayfalar
+# -----------------------------
+def _page(title: str, body: str) -> str:
+    return (
+        f'<!DOCTYPE html><html lang="tr"><head><meta charset="utf-8">'
+        f"<title>{html.escape(title)}</title></head><body>{body}</body></html>"
+    )
+
+
+def _js_string(value: str) -> str:
+    return json.dumps(value, ensure_ascii=False).replace("</", "<\\/")
+
+
+def render_hb_listing(products: list[tuple[int, dict]]) -> str:
+    items = "".join(
+        f'<li><a title="{html.escape(p["title"])}" href="/hb/p/{i}">'
+        f'<h3>{html.escape(p["title"])}</h3>'
+        f'<div data-test-id="final-price-{i}">{html.escape(str(p["price"]))}</div>'
+        f"</a></li>"
+        for i, p in products
+    )
+    return _page("Laptop", f"<ul>{items}</ul>")
+
+
+def render_hb_product(p: dict, lazy_ms: int) -> str:
+    from hepsiburada import SPEC_LABEL_CLASS, SPEC_ROW_CLASS, SPEC_VALUE_CLASS
+
+    head = (
+        f'<h1 data-test-id="title">{html.escape(p["title"])}</h1>'
+        f'<a data-test-id="brand" title="{html.escape(p["brand"])}" href="#">'
+        f'{html.escape(p["brand"])}</a>'
+        # uzun broşür bloğu: spec'ler ancak kaydırınca yüklenir
+        '<div style="height:2500px">Ürün açıklaması</div>'
+        '<div id="spec-anchor"></div>'
+    )
+    if not p["has_specs"]:
+        return _page(p["title"], head)
+
+    rows = []
+    for label, value in p["specs"].items():
+        v = html.escape(value)
+        cell = f'<a title="{v}" href="#">{v}</a>' if label in p["linked"] else v
+        rows.append(
+            f'<div class="{SPEC_ROW_CLASS}"><div class="{SPEC_LABEL_CLASS}">'
+            f'{html.escape(label)}</div><div class="{SPEC_VALUE_CLASS}">{cell}</div></div>'
+        )
+    script = f"""<script>
+(function () {{
+  var loaded = false;
+  function load() {{
+    if (loaded) return;
+    loaded = true;
+    setTimeout(function () {{
+      var el = document.createElement('div');
+      el.id = 'techSpecs';
+      el.innerHTML = {_js_string("".join(rows))};
+      document.getElementById('spec-anchor').appendChild(el);
+    }}, {lazy_ms});
+  }}
+  window.addEventListener('scroll', function () {{ if (window.scrollY > 100) load(); }});
+}})();
+</script>"""
+    return _page(p["title"], head + script)
+
+
+def render_ty_listing(products: list[tuple[int, dict]]) -> str:
+    cards = "".join(
+        f'<a class="product-card" href="/ty/p/{i}">'
+        f'<span class="product-brand">{html.escape(p["brand"])}</span>'
+        f'<span class="product-name">{html.escape(p["title"])}</span>'
+        f'<div data-testid="single-price">{html.escape(str(p["price"]))}</div></a>'
+        for i, p in products
+    )
+    return _page("Laptop", f'<div class="products">{cards}</div>')
+
+
+def _ty_items(pairs: list[tuple[str, str]]) -> str:
+    return "".join(
+        f'<div class="attribute-item"><div class="name">{html.escape(k)}</div>'
+        f'<div class="value">{html.escape(v)}</div></div>'
+        for k, v in pairs
+    )
+
+
+def render_ty_product(p: dict) -> str:
+    body = (
+        f'<h1 class="product-title"><a href="#"><strong>{html.escape(p["brand"])}'
+        f'</strong></a> {html.escape(p["title"])}</h1>'
+    )
+    pairs = list(p["specs"].items())
+    if p["embed_state"]:
+        state = {
+            "product": {
+                "name": p["title"],
+                "attributes": [
+                    {"key": {"name": k}, "value": {"name": v}} for k, v in pairs
+                ],
+            }
+        }
+        data = json.dumps(state, ensure_ascii=False).replace("</", "<\\/")
+        body += (
+            f"<script>window.__PRODUCT_DETAIL_APP_INITIAL_STATE__ = {data};</script>"
+        )
+    if not p["has_specs"]:
+        return _page(p["title"], body)
+
+    visible, rest = pairs[:TY_VISIBLE_ATTRIBUTES], pairs[TY_VISIBLE_ATTRIBUTES:]
+    more = ""
+    if rest:
+        more = (
+            '<div class="show-more-section"><button class="show-more-button">'
+            "Daha Fazla Göster</button></div>"
+            f"""<script>
+document.querySelector('.show-more-button').addEventListener('click', function () {{
+  var list = document.querySelector('.attributes-section .attributes');
+  list.insertAdjacentHTML('beforeend', {_js_string(_ty_items(rest))});
+  document.querySelector('.show-more-section').remove();
+}});
+</script>"""
+        )
+    body += (
+        '<div class="product-attributes-container product-attributes">'
+        '<div class="attributes-section"><h3>Ürün Özellikleri</h3>'
+        f'<div class="attributes">{_ty_items(visible)}</div>{more}</div></div>'
+    )
+    return _page(p["title"], body)
+
+
+# -----------------------------
+# Sunucu
+# -----------------------------
+class MockMarket:
+    """
+    with MockMarket(MockConfig(pages=3)) as market:
+        market.hb_url   # "http://127.0.0.1:<port>/hb/laptop?sayfa="
+        market.ty_url   # "http://127.0.0.1:<port>/ty/sr?q=laptop"
+    """
+
+    def __init__(self, cfg: MockConfig | None = None, port: int = 0):
+        self.cfg = cfg or MockConfig()
+        n = self.cfg.pages * self.cfg.per_page
+        self.catalog = {p: build_catalog(p, n, self.cfg) for p in PLATFORMS}
+        self.requests: Counter[tuple[str, int]] = Counter()
+        self._rng = random.Random(self.cfg.seed)
+        self._lock = threading.Lock()
+        self._bucket = {"tokens": 1.0, "at": time.monotonic()}
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    @property
+    def hb_url(self) -> str:
+        return f"{self.base}/hb/laptop?sayfa="
+
+    @property
+    def ty_url(self) -> str:
+        return f"{self.base}/ty/sr?q=laptop"
+
+    def start(self) -> MockMarket:
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> MockMarket:
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _admit(self) -> tuple[int, float]:
+        """(durum kodu, gecikme): hız limiti, rastgele hata ve gecikme kararı."""
+        cfg = self.cfg
+        with self._lock:
+            delay = cfg.latency * self._rng.uniform(1 - cfg.jitter, 1 + cfg.jitter)
+            if cfg.rate_limit:
+                now = time.monotonic()
+                b = self._bucket
+                b["tokens"] = min(1.0, b["tokens"] + (now - b["at"]) * cfg.rate_limit)
+                b["at"] = now
+                if b["tokens"] < 1.0:
+                    return 429, 0.0
+                b["tokens"] -= 1.0
+            if self._rng.random() < cfg.failure_rate:
+                return 503, delay
+        return 200, delay
+
+    def render(self, path: str, query: dict) -> tuple[str, str | None]:
+        """(istek türü, html); bilinmeyen yol için html None."""
+        cfg = self.cfg
+        m = re.fullmatch(r"/(hb|ty)/p/(\d+)", path)
+        if m:
+            platform, i = m.group(1), int(m.group(2))
+            catalog = self.catalog[platform]
+            if i >= len(catalog):
+                return "product", None
+            if platform == "hb":
+                return "product", render_hb_product(catalog[i], cfg.lazy_ms)
+            return "product", render_ty_product(catalog[i])
+
+        listing = {"/hb/laptop": ("hb", "sayfa"), "/ty/sr": ("ty", "pi")}.get(path)
+        if listing is None:
+            return "other", None
+        platform, key = listing
+        try:
+            page = int(query.get(key, ["1"])[0])
+        except ValueError:
+            page = 1
+        start = (page - 1) * cfg.per_page
+        products = list(enumerate(self.catalog[platform]))[start : start + cfg.per_page]
+        render = render_hb_listing if platform == "hb" else render_ty_listing
+        return "listing", render(products)
+
+    def _handler(self):
+        market = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                code, delay = market._admit()
+                kind, body = market.render(parts.path, parse_qs(parts.query))
+                if body is None and code == 200:
+                    code = 404
+                if delay:
+                    time.sleep(delay)
+                with market._lock:
+                    market.requests[(kind, code)] += 1
+
+                data = (body if code == 200 else _page(str(code), str(code))).encode()
+                self.send_response(code)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+# -----------------------------
+# Bench
+# -----------------------------
+def spec_accuracy(details, catalog: list[dict]) -> float:
+    """Katalogdaki spec'lerin scrape edilen detaylarda birebir bulunma oranı."""
+    hit = total = 0
+    for link, row in zip(details["Link"], details.to_dict("records")):
+        m = re.search(r"/p/(\d+)", str(link))
+        if m is None:
+            continue
+        p = catalog[int(m.group(1))]
+        if not p["has_specs"] and not p["embed_state"]:
+            continue
+        for k, v in p["specs"].items():
+            if k in row:
+                total += 1
+                hit += str(row[k]).strip() == v
+    return hit / total if total else 0.0
+
+
+def bench(
+    platform: str,
+    cfg: MockConfig,
+    rate: float = 8.0,
+    headless: bool = True,
+    workers: int = 1,
+) -> dict:
+    """Listeleme + detay scrape'ini sahte pazar yerine karşı çalıştırır (dosya yazmaz)."""
+    import functools
+    import tempfile
+
+    from crawl_engine import get_adapter, get_product_links, scrape_all_details
+    from driver_supervisor import DriverSupervisor, chrome_factory
+    from scrape_log import start_logging
+    from throttle import AIMDLimiter
+    from wait_profile import WaitProfile
+
+    adapter = get_adapter(platform)
+    start_logging()
+    with MockMarket(cfg) as market, tempfile.TemporaryDirectory() as tmp:
+        url = market.hb_url if platform == "hb" else market.ty_url
+        factory = functools.partial(chrome_factory, headless=headless)
+        drivers = [DriverSupervisor(factory) for _ in range(workers)]
+        limiter = AIMDLimiter(initial_rate=rate / 2, max_rate=rate)
+        waits = WaitProfile(f"MOCK_{platform.upper()}", state_dir=tmp)
+        try:
+            t0 = time.monotonic()
+            links_df = get_product_links(
+                adapter, url, cfg.pages, drivers, limiter=limiter, waits=waits
+            )
+            t1 = time.monotonic()
+            details = scrape_all_details(
+                adapter, links_df, drivers, limiter=limiter, waits=waits
+            )
+            t2 = time.monotonic()
+        finally:
+            for driver in drivers:
+                driver.quit()
+
+        result = {
+            "listing_pages_per_s": cfg.pages / (t1 - t0),
+            "products": len(details),
+            "detail_pages_per_s": len(details) / (t2 - t1),
+            "spec_accuracy": spec_accuracy(details, market.catalog[platform]),
+            "requests": dict(market.requests),
+        }
+    return result
+
+
+def main(argv: list[str] | None = None) -> None:
+    p = argparse.ArgumentParser(description="Scraper testi için yerel sahte pazar yeri")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    serve = sub.add_parser("serve", help="Sunucuyu başlat (Ctrl-C ile durur)")
+    serve.add_argument("--port", type=int, default=8765)
+    b = sub.add_parser("bench", help="Headless Chrome ile sayfa/sn + spec doğruluğu")
+    b.add_argument("platform", choices=list(PLATFORMS))
+    b.add_argument(
+        "--rate", type=float, default=8.0, help="Limiter üst sınırı (istek/sn)"
+    )
+    b.add_argument("--show", action="store_true", help="Chrome penceresini göster")
+    b.add_argument("--workers", type=int, default=1, help="Paralel Chrome sayısı")
+
+    for sp in (serve, b):
+        sp.add_argument("--pages", type=int, default=MockConfig.pages)
+        sp.add_argument("--per-page", type=int, default=MockConfig.per_page)
+        sp.add_argument("--latency", type=float, default=MockConfig.latency)
+        sp.add_argument("--failure-rate", type=float, default=MockConfig.failure_rate)
+        sp.add_argument("--rate-limit", type=float, default=None)
+        sp.add_argument("--lazy-ms", type=int, default=MockConfig.lazy_ms)
+        sp.add_argument("--missing-specs", type=float, default=MockConfig.missing_specs)
+        sp.add_argument("--embed-state", type=float, default=MockConfig.embed_state)
+        sp.add_argument("--seed", type=int, default=0)
+    args = p.parse_args(argv)
+
+    cfg = MockConfig(
+        pages=args.pages,
+        per_page=args.per_page,
+        latency=args.latency,
+        failure_rate=args.failure_rate,
+        rate_limit=args.rate_limit,
+        lazy_ms=args.lazy_ms,
+        missing_specs=args.missing_specs,
+        embed_state=args.embed_state,
+        seed=args.seed,
+    )
+
+    if args.command == "serve":
+        market = MockMarket(cfg, port=args.port)
+        print(f"HB: {market.hb_url}  ({cfg.pages} sayfa)")
+        print(f"TY: {market.ty_url}")
+        try:
+            market._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            market._server.server_close()
+            print(dict(market.requests))
+    else:
+        res = bench(
+            args.platform,
+            cfg,
+            rate=args.rate,
+            headless=not args.show,
+            workers=args.workers,
+        )
+        print(
+            f"listeleme {res['listing_pages_per_s']:.2f} sayfa/sn | "
+            f"detay {res['products']} ürün, {res['detail_pages_per_s']:.2f} sayfa/sn | "
+            f"spec doğruluğu {res['spec_accuracy']:.1%}"
+        )
+        print(res["requests"])
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,179 @@
-from hepsiburada import scrape_hepsiburada
-from trendyol import scrape_trendyol
+"""
+Scraper komut satırı.
 
+    python scrap.py                 # hb + ty, varsayılan url/sayfa (eski main)
+    python scrap.py hb --pages 5
+    python scrap.py ty --url "https://www.trendyol.com/sr?..." --pages 2
+    python scrap.py hb --listing-only   # spec'ler başlıktan, az detay ziyareti
+    python scrap.py ty --archive-html   # spec HTML'i offline backfill için saklanır
+    python scrap.py hb --budget 200     # en fazla 200 detay; oynak ürünler önce
+    python scrap.py ty --workers 3      # 3 Chrome paralel, hız limiti ortak
+    python scrap.py fields ty       # TARGET_FIELDS listesini yazdırır
 
-def main():
-    BASE_URL_HB = "https://www.hepsiburada.com/laptop-notebook-dizustu-bilgisayarlar-c-98?puan=3-max&sayfa="
-    TOTAL_PAGES_HB = 1
+Tarama crawl_engine'de, siteye özel kısım adaptör modüllerinde
+(hepsiburada.py, trendyol.py). Bunlar (ve selenium/pandas) sadece ilgili
+komut çalışınca import edilir; --help ve fields anında döner. Log dosyaları
+da scrape başlarken açılır.
+"""
 
-    BASE_URL_TY = "https://www.trendyol.com/sr?wc=103108%2C106084&sst=MOST_RATED"
-    TOTAL_PAGES_TY = 1
+from __future__ import annotations
+import argparse
 
-    scrape_hepsiburada(BASE_URL_HB, TOTAL_PAGES_HB)
-    scrape_trendyol(BASE_URL_TY, TOTAL_PAGES_TY)
+BASE_URL_HB = "https://www.hepsiburada.com/laptop-notebook-dizustu-bilgisayarlar-c-98?puan=3-max&sayfa="
+TOTAL_PAGES_HB = 1
+
+BASE_URL_TY = "https://www.trendyol.com/sr?wc=103108%2C106084&sst=MOST_RATED"
+TOTAL_PAGES_TY = 1
+
+
+# -----------------------------
+# Komutlar
+# -----------------------------
+def run_hepsiburada(
+    base_url: str = BASE_URL_HB,
+    total_pages: int = TOTAL_PAGES_HB,
+    listing_only: bool = False,
+    archive_html: bool = False,
+    crawl_budget: int | None = None,
+    workers: int = 1,
+):
+    from crawl_engine import get_adapter, scrape
+
+    scrape(
+        get_adapter("HB"),
+        base_url,
+        total_pages,
+        listing_only=listing_only,
+        archive_html=archive_html,
+        crawl_budget=crawl_budget,
+        workers=workers,
+    )
+
+
+def run_trendyol(
+    base_url: str = BASE_URL_TY,
+    total_pages: int = TOTAL_PAGES_TY,
+    listing_only: bool = False,
+    archive_html: bool = False,
+    crawl_budget: int | None = None,
+    workers: int = 1,
+):
+    from crawl_engine import get_adapter, scrape
+
+    scrape(
+        get_adapter("TY"),
+        base_url,
+        total_pages,
+        listing_only=listing_only,
+        archive_html=archive_html,
+        crawl_budget=crawl_budget,
+        workers=workers,
+    )
+
+
+def target_fields(platform: str) -> list[str]:
+    from crawl_engine import get_adapter
+
+    return list(get_adapter(platform).target_fields)
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="Hepsiburada / Trendyol laptop scraper")
+    sub = p.add_subparsers(dest="command")
+
+    hb = sub.add_parser("hb", help="Hepsiburada listeleme + detay scrape")
+    hb.add_argument("--url", default=BASE_URL_HB, help="Sayfa numarası sona eklenir")
+    hb.add_argument("--pages", type=int, default=TOTAL_PAGES_HB)
+
+    ty = sub.add_parser("ty", help="Trendyol listeleme + detay scrape")
+    ty.add_argument("--url", default=BASE_URL_TY, help="'&pi=<sayfa>' eklenir")
+    ty.add_argument("--pages", type=int, default=TOTAL_PAGES_TY)
+
+    both = sub.add_parser("all", help="Önce Hepsiburada, sonra Trendyol")
+    both.add_argument("--hb-pages", type=int, default=TOTAL_PAGES_HB)
+    both.add_argument("--ty-pages", type=int, default=TOTAL_PAGES_TY)
+
+    for sp in (hb, ty, both):
+        mode = sp.add_mutually_exclusive_group()
+        mode.add_argument(
+            "--listing-only",
+            action="store_true",
+            help="Spec'leri listeleme başlıklarından çıkar; detay sayfasına "
+            "sadece başlığı değişen / zorunlu alanı eksik ürünler için git",
+        )
+        mode.add_argument(
+            "--budget",
+            type=int,
+            default=None,
+            metavar="N",
+            help="En fazla N detay sayfası; değişim oranı / sıra / bayatlığa "
+            "göre seçilir, kalanlar önceki snapshot'tan (bkz. crawl_scheduler.py)",
+        )
+        sp.add_argument(
+            "--archive-html",
+            action="store_true",
+            help="Detay sayfalarının spec HTML'ini zstd arşive yaz "
+            "(offline backfill için, bkz. html_archive.py)",
+        )
+        sp.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            metavar="N",
+            help="N Chrome paralel; istek hızı yine host başına tek limiter'dan "
+            "(bkz. crawl_engine.run_on_drivers)",
+        )
+
+    fields = sub.add_parser("fields", help="Detay sayfasından çekilen alanlar")
+    fields.add_argument("platform", choices=["hb", "ty"])
+    return p
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+
+    if args.command == "hb":
+        run_hepsiburada(
+            args.url,
+            args.pages,
+            args.listing_only,
+            args.archive_html,
+            args.budget,
+            args.workers,
+        )
+    elif args.command == "ty":
+        run_trendyol(
+            args.url,
+            args.pages,
+            args.listing_only,
+            args.archive_html,
+            args.budget,
+            args.workers,
+        )
+    elif args.command == "fields":
+        print("\n".join(target_fields(args.platform)))
+    elif args.command == "all":
+        run_hepsiburada(
+            total_pages=args.hb_pages,
+            listing_only=args.listing_only,
+            archive_html=args.archive_html,
+            crawl_budget=args.budget,
+            workers=args.workers,
+        )
+        run_trendyol(
+            total_pages=args.ty_pages,
+            listing_only=args.listing_only,
+            archive_html=args.archive_html,
+            crawl_budget=args.budget,
+            workers=args.workers,
+        )
+    else:
+        # alt komutsuz çağrı: eski davranış (iki platform, varsayılanlar)
+        run_hepsiburada()
+        run_trendyol()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,152 @@
+"""
+Scraper logları: kuyruk + tek dinleyici, JSON satırları.
+
+- "scrapper.*" logger'ları sadece bir QueueHandler'a yazar. Aynı process'te
+  kayıt kuyruğa olduğu gibi konur (LocalQueueHandler); mesaj/traceback
+  formatlama ve dosya/konsol IO'su dinleyici thread'inde yapılır, tarama
+  döngüsü beklemez. multiprocessing kuyruğunda kayıt pickle edilmeli, orada
+  worker'da formatlanır (stok QueueHandler).
+- Tek dosya: logs/scrape_<zaman>.jsonl. Her satır bir JSON objesidir:
+  {"ts", "level", "logger", "msg"} ve varsa STRUCTURED_FIELDS
+  (url, stage, duration, outcome ...). Konsola INFO ve üstü kısa formatta
+  yazılır. Dosyaya DEBUG'daki sayfa bazlı kayıtlar da gider.
+- Mesajlar %-stili argümanlarla loglanır. Seviyesi filtrelenen kayıt hiç
+  formatlanmaz.
+- Process'ler: start_logging(multiprocess=True) multiprocessing.Queue
+  kullanır. Worker'lar initializer olarak worker_logging(log_queue())
+  çağırır, böylece aynı dosyaya karışmadan yazar.
+
+    log_file = start_logging()
+    logger.debug("detay", extra={"url": link, "stage": "detail",
+                                 "duration": 1.3, "outcome": "ok"})
+"""
+
+from __future__ import annotations
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+from datetime import datetime
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+LOG_DIR = BASE_DIR / "logs"
+
+ROOT_LOGGER = "scrapper"
+CONSOLE_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+STRUCTURED_FIELDS = ("url", "stage", "duration", "outcome", "attempt", "reason")
+
+_listener: logging.handlers.QueueListener | None = None
+_queue = None
+_handler: logging.Handler | None = None
+_log_file: Path | None = None
+
+
+class LocalQueueHandler(logging.handlers.QueueHandler):
+    """
+    Process içi kuyruk: stok prepare() kaydı çağıran thread'de formatlar ve
+    args/exc_info'yu siler. Burada kayıt aynen geçer; getMessage ve
+    formatException dinleyicide çalışır (JsonFormatter "exc" alanı dahil).
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """Kayıt başına bir JSON satırı; extra ile gelen yapısal alanlar üst düzeyde."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key in STRUCTURED_FIELDS:
+            value = record.__dict__.get(key)
+            if value is not None:
+                data[key] = round(value, 3) if isinstance(value, float) else value
+        if record.exc_info:
+            data["exc"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+def start_logging(
+    log_dir: str | Path = LOG_DIR,
+    console_level: int = logging.INFO,
+    file_level: int = logging.DEBUG,
+    multiprocess: bool = False,
+) -> Path:
+    """Dinleyiciyi başlatır (idempotent); JSON log dosyasının yolunu döndürür."""
+    global _listener, _queue, _handler, _log_file
+    if _listener is not None:
+        return _log_file
+
+    log_dir = Path(log_dir)
+    log_dir.mkdir(parents=True, exist_ok=True)
+    _log_file = log_dir / f"scrape_{datetime.now().strftime('%Y%m%d%H%M%S')}.jsonl"
+
+    if multiprocess:
+        import multiprocessing
+
+        _queue = multiprocessing.Queue(-1)
+    else:
+        _queue = queue.SimpleQueue()
+
+    console = logging.StreamHandler()
+    console.setLevel(console_level)
+    console.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+    file_handler = logging.FileHandler(str(_log_file), encoding="utf-8")
+    file_handler.setLevel(file_level)
+    file_handler.setFormatter(JsonFormatter())
+
+    _listener = logging.handlers.QueueListener(
+        _queue, console, file_handler, respect_handler_level=True
+    )
+    _listener.start()
+
+    if multiprocess:
+        _handler = logging.handlers.QueueHandler(_queue)
+    else:
+        _handler = LocalQueueHandler(_queue)
+    _attach(_handler, min(console_level, file_level))
+    atexit.register(stop_logging)
+    return _log_file
+
+
+def _attach(handler: logging.Handler, level: int) -> None:
+    root = logging.getLogger(ROOT_LOGGER)
+    for h in list(root.handlers):
+        if isinstance(h, logging.handlers.QueueHandler):
+            root.removeHandler(h)
+    root.addHandler(handler)
+    root.setLevel(level)
+    # kök logger'daki (ör. basicConfig) handler'lara ikinci kez gitmesin
+    root.propagate = False
+
+
+def stop_logging() -> None:
+    """Kuyruktaki kayıtları yazıp dinleyiciyi durdurur."""
+    global _listener, _handler
+    if _listener is None:
+        return
+    logging.getLogger(ROOT_LOGGER).removeHandler(_handler)
+    _listener.stop()
+    for h in _listener.handlers:
+        h.close()
+    _listener = _handler = None
+
+
+def log_queue():
+    """Worker process'lere verilecek kuyruk (start_logging(multiprocess=True))."""
+    return _queue
+
+
+def worker_logging(q, level: int = logging.DEBUG) -> None:
+    """Worker process initializer: kayıtlar ana process'teki dinleyiciye gider."""
+    if q is not None:
+        _attach(logging.handlers.QueueHandler(q), level)
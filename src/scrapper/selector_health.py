@@ -0,0 +1,234 @@
+"""
+Selector sağlık kontrolü + devre kesici.
+
+HB spec tablosu üretilmiş class adlarına bağlı (SPEC_ROW_CLASS vb.). Site
+yeniden deploy edilince bu adlar değişir. O zaman her ürün sayfası boş
+spec'le döner ve run saatlerce boşa gider. SelectorBreaker yüklenen (başlığı
+okunan) her detay sayfasının sonucunu kaydeder. Yüklenemeyen sayfalar (429,
+503, ölü session) sayılmaz; onları yeniden deneme katmanı halleder:
+
+- Başlangıç probu: ilk probe_pages sayfanın hiçbirinde spec yoksa
+  selector'lar kırık sayılır.
+- Run boyunca: son window sayfada spec bulunma oranı min_hit_rate'in
+  altına düşerse devre açılır.
+
+Devre açılınca sıradaki strateji denenir: "classes" (class adları) ->
+"structural" (kapsayıcı içindeki iki çocuklu etiket/değer satırları, class
+adından bağımsız). O da aynı kontrolden geçemezse run durdurulur ve hangi
+selector'ın kaç eleman bulduğu loglanır. Boş detay csv'si yazılmaz.
+
+Motorla birlikte sahte adaptör üzerinde kontrol: python selector_health.py check
+"""
+
+from __future__ import annotations
+import argparse
+import logging
+from collections import deque
+from typing import Callable
+
+logger = logging.getLogger("scrapper.selector_health")
+
+STRATEGIES = ("classes", "structural")
+
+# kapsayıcı içinde tam iki element çocuğu olan (etiket, değer) satırları;
+# değer hücresindeki link title'ı varsa onu tercih eder (HB marka/model linkleri)
+STRUCTURAL_PAIRS_JS = """
+const root = document.querySelector(arguments[0]);
+if (!root) return [];
+const pairs = [];
+for (const el of root.querySelectorAll('*')) {
+  const kids = el.children;
+  if (kids.length !== 2) continue;
+  const label = kids[0].innerText.trim();
+  const a = kids[1].querySelector('a[title]');
+  const value = (a ? a.getAttribute('title') : kids[1].innerText).trim();
+  if (label && value && !label.includes('\\n')) pairs.push([label, value]);
+}
+return pairs;
+"""
+
+COUNT_SELECTORS_JS = """
+const out = {};
+for (const [name, sel] of Object.entries(arguments[0])) {
+  try { out[name] = document.querySelectorAll(sel).length; }
+  catch (e) { out[name] = -1; }
+}
+return out;
+"""
+
+
+def structural_pairs(driver, root_selector: str) -> list[tuple[str, str]]:
+    """Class adı kullanmadan kapsayıcıdaki etiket/değer çiftleri (tek round trip)."""
+    return [tuple(p) for p in driver.execute_script(STRUCTURAL_PAIRS_JS, root_selector)]
+
+
+def count_selectors(driver, selectors: dict[str, str]) -> dict[str, int]:
+    """Her selector'ın o anki sayfada eşleştiği eleman sayısı (geçersizse -1)."""
+    try:
+        return driver.execute_script(COUNT_SELECTORS_JS, selectors)
+    except Exception as e:
+        return {"hata": f"{type(e).__name__}: {e}"}
+
+
+def spec_count(
+    features: dict | None, skip=("Başlık", "Marka", "Çekilme Zamanı")
+) -> int:
+    """Başlık/marka dışında dolu alan sayısı."""
+    if not features:
+        return 0
+    return sum(1 for k, v in features.items() if k not in skip and v)
+
+
+# -----------------------------
+# Devre kesici
+# -----------------------------
+class SelectorBreaker:
+    """
+    breaker = SelectorBreaker()
+    features = get_product_details(link, driver, strategy=breaker.strategy)
+    if has_details(features):            # yüklenemeyen sayfa sayılmaz
+        event = breaker.record(features) # None | "switched" | "open"
+    if breaker.open: ...  # run durdurulmalı
+    """
+
+    def __init__(
+        self,
+        strategies: tuple[str, ...] = STRATEGIES,
+        probe_pages: int = 3,
+        window: int = 20,
+        min_hit_rate: float = 0.2,
+        min_fields: int = 3,
+        is_hit: Callable[[dict | None], bool] | None = None,
+        log: logging.Logger | None = None,
+    ):
+        self.strategies = list(strategies)
+        self.probe_pages = probe_pages
+        self.window = window
+        self.min_hit_rate = min_hit_rate
+        self.is_hit = is_hit or (lambda f: spec_count(f) >= min_fields)
+        self.log = log or logger
+        self.level = 0
+        self.open = False
+        self.recent: deque[bool] = deque(maxlen=window)
+        self.pages = 0
+        self.hits = 0
+        self.reason: str | None = None
+
+    @property
+    def strategy(self) -> str:
+        return self.strategies[self.level]
+
+    def hit_rate(self) -> float:
+        return sum(self.recent) / len(self.recent) if self.recent else 1.0
+
+    def record(self, features: dict | None) -> str | None:
+        hit = bool(self.is_hit(features))
+        self.pages += 1
+        self.hits += hit
+        self.recent.append(hit)
+
+        n = len(self.recent)
+        if n == self.probe_pages and not any(self.recent):
+            reason = f"ilk {n} sayfada spec bulunamadı"
+        elif n == self.window and self.hit_rate() < self.min_hit_rate:
+            reason = f"son {n} sayfada spec oranı {self.hit_rate():.0%}"
+        else:
+            return None
+        return self._trip(reason)
+
+    def _trip(self, reason: str) -> str:
+        self.reason = f"{self.strategy}: {reason}"
+        self.recent.clear()
+        if self.level + 1 < len(self.strategies):
+            self.level += 1
+            self.log.error(
+                "Selector devre kesici (%s); '%s' stratejisine geçiliyor",
+                self.reason,
+                self.strategy,
+            )
+            return "switched"
+        self.open = True
+        self.log.error(
+            "Selector devre kesici açıldı (%s); run durduruluyor", self.reason
+        )
+        return "open"
+
+    def summary(self) -> str:
+        return f"strateji {self.strategy}, spec bulunan {self.hits}/{self.pages}" + (
+            f", son kesilme: {self.reason}" if self.reason else ""
+        )
+
+
+# -----------------------------
+# Kontrol (sahte adaptör + crawl_engine)
+# -----------------------------
+def _run_fake(read, n: int = 12):
+    """read(link) -> features ile scrape_all_details; sahte driver, bekleme yok."""
+    import pandas as pd
+
+    from crawl_engine import MarketplaceAdapter, scrape_all_details
+    from throttle import AIMDLimiter, RetryPolicy
+
+    class FakeDriver:
+        def execute_script(self, *args):
+            return {}
+
+    adapter = MarketplaceAdapter(
+        prefix="CHECK",
+        name="selector_check",
+        target_fields=["Başlık", "Marka", "A", "B", "C"],
+        listing_url=lambda base, page: base,
+        read_listing=lambda url, d, waits: [],
+        read_details=lambda link, d, **kwargs: read(link),
+        extract_details_from_html=lambda html: {},
+        spec_selectors={},
+    )
+    links = pd.DataFrame({"Link": [f"/p/{i}" for i in range(n)], "Price": 1})
+    return scrape_all_details(
+        adapter,
+        links,
+        FakeDriver(),
+        limiter=AIMDLimiter(initial_rate=1e6, max_rate=1e6),
+        policy=RetryPolicy(base_delay=0.0),
+    )
+
+
+def check() -> None:
+    """
+    1) İlk 6 çağrı yüklenemeyen (başlıksız) sayfa, sonrası iyi: devre açılmamalı,
+       tüm ürünler yeniden denemeyle gelmeli.
+    2) Sayfalar yükleniyor ama hiç spec yok: devre açılmalı (RuntimeError).
+    """
+    calls = 0
+
+    def transient(link: str) -> dict:
+        nonlocal calls
+        calls += 1
+        if calls <= 6:
+            return {"Başlık": None}
+        return {"Başlık": link, "Marka": "m", "A": "1", "B": "2", "C": "3"}
+
+    df = _run_fake(transient)
+    assert df["Başlık"].notna().all(), "geçici hatalardan sonra eksik ürün var"
+    print(f"geçici hatalar: devre kapalı, {len(df)} ürün ({calls} çağrı)")
+
+    try:
+        _run_fake(lambda link: {"Başlık": link, "Marka": "m"})
+    except RuntimeError as e:
+        print(f"kırık selector'lar: devre açıldı ({e})")
+    else:
+        raise AssertionError("spec'siz sayfalarda devre açılmadı")
+
+
+def main(argv: list[str] | None = None) -> None:
+    p = argparse.ArgumentParser(description="Selector devre kesici kontrolü")
+    sub = p.add_subparsers(dest="command", required=True)
+    sub.add_parser("check", help="Sahte adaptörle geçici hata / kırık selector")
+    p.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(message)s")
+    check()
+
+
+if __name__ == "__main__":
+    main()
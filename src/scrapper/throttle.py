@@ -0,0 +1,379 @@
+"""
+Host başına uyarlanır hız sınırlayıcı (AIMD) + yeniden deneme zamanlayıcısı.
+
+    limiter = AIMDLimiter()
+    results, stats = run_with_retries(links, fetch, ok=..., limiter=limiter)
+    logger.info("%s", stats.summary(limiter))
+
+- Her host için istekler arası aralık 1/rate ile tutulur.
+- Başarılı istekte rate += increase (additive increase); hata, geçersiz
+  sonuç veya gecikmenin host ortalamasının latency_factor katını aşması
+  durumunda rate *= decrease (multiplicative decrease).
+- Başarısız öğe exponential backoff + jitter ile kuyruğun sonuna alınır;
+  max_retries denemeden sonra düşülür. Beklemedeki öğe yeni öğeleri
+  bloklamaz (heap, hazır olma zamanına göre sıralı).
+
+run_with_retries tek thread'de sıralı çalışır. AIMDLimiter thread-safe'tir:
+crawl_engine her worker'a (kendi driver'ı) ayrı bir run_with_retries verip
+aynı limiter'ı paylaştırır, host hızı toplamda tutulur. Yerel throttling
+sunucusuyla deneme için: python throttle.py demo
+"""
+
+from __future__ import annotations
+import argparse
+import heapq
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterable
+from urllib.parse import urlsplit
+
+logger = logging.getLogger("scrapper.throttle")
+
+
+# -----------------------------
+# AIMD hız sınırlayıcı
+# -----------------------------
+@dataclass
+class HostState:
+    rate: float  # istek/sn
+    next_at: float = 0.0
+    successes: int = 0
+    failures: int = 0
+    latency: float | None = None  # başarılı isteklerin EWMA gecikmesi (sn)
+
+
+class AIMDLimiter:
+    """Host başına istek hızı; record() sonuçlarına göre AIMD ile ayarlanır."""
+
+    def __init__(
+        self,
+        initial_rate: float = 1.0,
+        min_rate: float = 0.05,
+        max_rate: float = 4.0,
+        increase: float = 0.1,
+        decrease: float = 0.5,
+        latency_factor: float = 3.0,
+        latency_floor: float = 0.5,
+        alpha: float = 0.2,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.latency_floor = latency_floor
+        self.alpha = alpha
+        self.clock = clock
+        self.sleep = sleep
+        self.hosts: dict[str, HostState] = {}
+        # worker thread'leri aynı host slotlarını paylaşır
+        self._lock = threading.Lock()
+
+    def state(self, url: str) -> HostState:
+        host = urlsplit(url).netloc.lower()
+        st = self.hosts.get(host)
+        if st is None:
+            st = self.hosts[host] = HostState(rate=self.initial_rate)
+        return st
+
+    def acquire(self, url: str) -> None:
+        """Host'un sıradaki slotunu ayırır ve o zamana kadar bekler."""
+        with self._lock:
+            st = self.state(url)
+            now = self.clock()
+            start = max(now, st.next_at)
+            st.next_at = start + 1.0 / st.rate
+        if start > now:
+            self.sleep(start - now)
+
+    def record(self, url: str, ok: bool, latency: float) -> None:
+        with self._lock:
+            self._record(url, ok, latency)
+
+    def _record(self, url: str, ok: bool, latency: float) -> None:
+        st = self.state(url)
+        # gecikme sinyali: ortalamanın latency_factor katı ve en az latency_floor
+        # saniye fazlası (ms mertebesindeki gürültü yavaşlatmasın)
+        slow = st.latency is not None and latency > max(
+            self.latency_factor * st.latency, st.latency + self.latency_floor
+        )
+        if ok:
+            st.successes += 1
+            st.latency = (
+                latency
+                if st.latency is None
+                else (1 - self.alpha) * st.latency + self.alpha * latency
+            )
+        else:
+            st.failures += 1
+
+        old = st.rate
+        if ok and not slow:
+            st.rate = min(self.max_rate, st.rate + self.increase)
+        else:
+            st.rate = max(self.min_rate, st.rate * self.decrease)
+        # yavaşlama hemen etkili olsun: ayrılmış slotu yeni aralığa göre ötele
+        if st.rate < old:
+            st.next_at += 1.0 / st.rate - 1.0 / old
+
+
+# -----------------------------
+# Yeniden deneme
+# -----------------------------
+@dataclass
+class RetryPolicy:
+    max_retries: int = 3
+    base_delay: float = 2.0
+    max_delay: float = 60.0
+    jitter: float = 0.5  # gecikme * U(1 - jitter, 1 + jitter)
+
+    def delay(self, attempt: int, rng: random.Random) -> float:
+        d = min(self.max_delay, self.base_delay * 2**attempt)
+        return d * rng.uniform(1 - self.jitter, 1 + self.jitter)
+
+
+@dataclass
+class CrawlStats:
+    total: int = 0
+    attempts: int = 0
+    successes: int = 0
+    retries: int = 0
+    dropped: int = 0
+    stopped: bool = False  # stop() ile erken kesildi
+    started: float = 0.0
+    elapsed: float = 0.0
+    dropped_items: list = field(default_factory=list)
+
+    @classmethod
+    def merge(cls, parts: list[CrawlStats]) -> CrawlStats:
+        """Paralel worker'ların istatistikleri; süre en uzun worker'ınki."""
+        return cls(
+            total=sum(p.total for p in parts),
+            attempts=sum(p.attempts for p in parts),
+            successes=sum(p.successes for p in parts),
+            retries=sum(p.retries for p in parts),
+            dropped=sum(p.dropped for p in parts),
+            stopped=any(p.stopped for p in parts),
+            started=min((p.started for p in parts), default=0.0),
+            elapsed=max((p.elapsed for p in parts), default=0.0),
+            dropped_items=[i for p in parts for i in p.dropped_items],
+        )
+
+    @property
+    def throughput(self) -> float:
+        """Efektif başarılı öğe/sn (bekleme ve yeniden denemeler dahil)."""
+        return self.successes / self.elapsed if self.elapsed else 0.0
+
+    def summary(self, limiter: AIMDLimiter | None = None) -> str:
+        text = (
+            f"başarılı {self.successes}/{self.total}, deneme {self.attempts}, "
+            f"yeniden deneme {self.retries}, düşen {self.dropped}, "
+            f"{self.elapsed:.1f}s, {self.throughput:.3f} öğe/sn"
+        )
+        if self.stopped:
+            text += " (erken durduruldu)"
+        if limiter is not None:
+            hosts = ", ".join(
+                f"{h}: {st.rate:.2f}/sn"
+                + (f" ~{st.latency:.2f}s" if st.latency is not None else "")
+                for h, st in limiter.hosts.items()
+            )
+            text += f" | {hosts}"
+        return text
+
+
+def run_with_retries(
+    items: Iterable,
+    fetch: Callable,
+    url_of: Callable[[object], str] = str,
+    ok: Callable[[object], bool] = lambda r: True,
+    limiter: AIMDLimiter | None = None,
+    policy: RetryPolicy | None = None,
+    log: logging.Logger | None = None,
+    rng: random.Random | None = None,
+    stop: Callable[[], bool] | None = None,
+    stage: str = "fetch",
+) -> tuple[list, CrawlStats]:
+    """
+    fetch(item) her öğe için çağrılır; exception veya ok(sonuç) False ise
+    başarısız sayılır ve backoff ile yeniden kuyruğa alınır.
+
+    Dönen liste items ile hizalı: başarılı sonuç, yoksa son denemenin
+    sonucu (exception ile bittiyse None). Düşen öğeler stats.dropped_items'ta.
+    stop() True dönerse kalan öğeler denenmeden bırakılır (sonuçları None).
+    Her deneme DEBUG seviyesinde yapısal kayıt olarak loglanır (url, stage,
+    duration, outcome, attempt; bkz. scrape_log).
+    """
+    items = list(items)
+    limiter = limiter or AIMDLimiter()
+    policy = policy or RetryPolicy()
+    log = log or logger
+    rng = rng or random.Random()
+    clock, sleep = limiter.clock, limiter.sleep
+
+    stats = CrawlStats(total=len(items), started=clock())
+    results: list = [None] * len(items)
+    # (hazır olma zamanı, sıra, öğe indeksi, deneme no)
+    queue = [(0.0, i, i, 0) for i in range(len(items))]
+    seq = len(items)
+
+    while queue:
+        if stop is not None and stop():
+            stats.stopped = True
+            log.warning("Tarama durduruldu; %d öğe denenmedi", len(queue))
+            break
+        ready_at, _, i, attempt = heapq.heappop(queue)
+        now = clock()
+        if ready_at > now:
+            sleep(ready_at - now)
+
+        item = items[i]
+        url = url_of(item)
+        limiter.acquire(url)
+
+        t0 = clock()
+        stats.attempts += 1
+        try:
+            results[i] = fetch(item)
+            good = bool(ok(results[i]))
+            reason = "geçersiz sonuç"
+        except Exception as e:
+            good, reason = False, f"{type(e).__name__}: {e}"
+        duration = clock() - t0
+        limiter.record(url, good, duration)
+        event = {
+            "url": url,
+            "stage": stage,
+            "duration": duration,
+            "attempt": attempt + 1,
+        }
+
+        if good:
+            stats.successes += 1
+            log.debug("%s ok: %s", stage, url, extra={**event, "outcome": "ok"})
+        elif attempt < policy.max_retries:
+            delay = policy.delay(attempt, rng)
+            stats.retries += 1
+            seq += 1
+            heapq.heappush(queue, (clock() + delay, seq, i, attempt + 1))
+            log.warning(
+                "%s başarısız (%s); %d. yeniden deneme %.1fs sonra",
+                url,
+                reason,
+                attempt + 1,
+                delay,
+                extra={**event, "outcome": "retry", "reason": reason},
+            )
+        else:
+            stats.dropped += 1
+            stats.dropped_items.append(item)
+            log.error(
+                "%s %d denemeden sonra düşüldü (%s)",
+                url,
+                attempt + 1,
+                reason,
+                extra={**event, "outcome": "dropped", "reason": reason},
+            )
+
+    stats.elapsed = clock() - stats.started
+    return results, stats
+
+
+# -----------------------------
+# Demo: yerel throttling sunucusu
+# -----------------------------
+def _throttling_server(server_rate: float, error_rate: float, seed: int):
+    """
+    Token bucket ile server_rate istek/sn üstünü 429, ayrıca rastgele
+    error_rate oranında 503 döndüren yerel HTTP sunucusu (arka plan thread'i).
+    """
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    lock = threading.Lock()
+    bucket = {"tokens": 1.0, "at": time.monotonic()}
+    rng = random.Random(seed)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with lock:
+                now = time.monotonic()
+                bucket["tokens"] = min(
+                    1.0, bucket["tokens"] + (now - bucket["at"]) * server_rate
+                )
+                bucket["at"] = now
+                if bucket["tokens"] >= 1.0:
+                    bucket["tokens"] -= 1.0
+                    code = 503 if rng.random() < error_rate else 200
+                else:
+                    code = 429
+            body = self.path.encode() if code == 200 else b""
+            self.send_response(code)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def demo(
+    n: int = 40, server_rate: float = 5.0, error_rate: float = 0.05, seed: int = 0
+) -> CrawlStats:
+    import urllib.error
+    import urllib.request
+
+    server = _throttling_server(server_rate, error_rate, seed)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    def fetch(path: str) -> int:
+        try:
+            with urllib.request.urlopen(base + path, timeout=5) as r:
+                return r.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+    try:
+        limiter = AIMDLimiter(initial_rate=2.0, max_rate=4 * server_rate)
+        policy = RetryPolicy(max_retries=5, base_delay=0.2, max_delay=2.0)
+        _, stats = run_with_retries(
+            [f"/urun/{i}" for i in range(n)],
+            fetch,
+            url_of=lambda p: base + p,
+            ok=lambda status: status == 200,
+            limiter=limiter,
+            policy=policy,
+            rng=random.Random(seed),
+        )
+    finally:
+        server.shutdown()
+    print(stats.summary(limiter))
+    return stats
+
+
+def main(argv: list[str] | None = None) -> None:
+    p = argparse.ArgumentParser(description="AIMD limiter demosu (yerel sunucu)")
+    sub = p.add_subparsers(dest="command", required=True)
+    d = sub.add_parser("demo", help="429/503 döndüren yerel sunucuya karşı tarama")
+    d.add_argument("-n", type=int, default=40, help="İstek (öğe) sayısı")
+    d.add_argument("--server-rate", type=float, default=5.0, help="Sunucu limiti/sn")
+    d.add_argument("--error-rate", type=float, default=0.05, help="Rastgele 503 oranı")
+    d.add_argument("--seed", type=int, default=0)
+    args = p.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    demo(args.n, args.server_rate, args.error_rate, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,50 +1,25 @@
-import os
+"""
+Trendyol adaptörü (bkz. crawl_engine): listeleme kartları, ürün
+özellikleri (gömülü JSON / DOM / "Daha Fazla Göster" yedeği) ve arşivden
+offline çıkarım. Tarama döngüsü, driver, yeniden deneme ve çıktı
+crawl_engine'de.
+"""
+
+from __future__ import annotations
+import json
 import logging
-from pathlib import Path
-import pandas as pd
-from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import (
-    TimeoutException,
-    ElementClickInterceptedException,
-    StaleElementReferenceException,
-)
-
-LINK_DIR = "../../data/link"
-SCRAPPED_DIR = "../../data/scrapped"
-PROCESSED_DIR = "../../data/processed"
+from typing import TYPE_CHECKING
 
-# Use an absolute log folder so logs don't end up in an unexpected CWD
-BASE_DIR = Path(__file__).resolve().parent
-LOG_DIR = BASE_DIR / "logs"
-LOG_DIR.mkdir(parents=True, exist_ok=True)
+# selenium ağır; sadece scrape sırasında (fonksiyon içinde) import edilir.
+if TYPE_CHECKING:
+    from html_archive import HtmlArchive
 
-timestamp = datetime.now().strftime("%Y%m%d%H%M")
-log_file = LOG_DIR / f"TY_Scraper_{timestamp}.log"
+from crawl_engine import MarketplaceAdapter, add_feature, empty_features, now_str
+from selector_health import structural_pairs
+from wait_profile import WaitProfile, wait_until
 
-LOG_FORMAT = "%(asctime)s [%(levelname)s] %(message)s"
-
-# Dedicated logger to avoid clashing with Hepsiburada (or other modules) in the same process.
 logger = logging.getLogger("scrapper.trendyol")
-logger.setLevel(logging.INFO)
-
-if not logger.handlers:
-    formatter = logging.Formatter(LOG_FORMAT)
-
-    stream_handler = logging.StreamHandler()
-    stream_handler.setFormatter(formatter)
-
-    file_handler = logging.FileHandler(str(log_file), encoding="utf-8")
-    file_handler.setFormatter(formatter)
-
-    logger.addHandler(stream_handler)
-    logger.addHandler(file_handler)
 
-# Prevent logs from bubbling up to the root logger (which may have other handlers)
-logger.propagate = False
 # Define the target fields to extract from Trendyol product pages
 TARGET_FIELDS = [
     # Genel
@@ -87,19 +62,92 @@ TARGET_FIELDS = [
 ]
 
 
-def expand_product_attributes(driver, timeout: int = 10) -> None:
+# Ürün özellikleri kapsayıcısı (canlı sayfa ve offline çıkarım aynı alanı hedefler)
+ATTRIBUTES_ROOT_SELECTOR = (
+    "div.product-attributes-container.product-attributes, "
+    "div[data-drroot='product-attributes']"
+)
+
+# devre kesici açılınca hangi selector'ın kırıldığını görmek için
+SPEC_SELECTORS = {
+    "title": "h1.product-title",
+    "attributes": ATTRIBUTES_ROOT_SELECTOR,
+    "section": "div.attributes-section",
+    "item": "div.attributes div.attribute-item",
+    "name": "div.attribute-item .name",
+    "value": "div.attribute-item .value",
+}
+
+# Ürün sayfasına gömülü state; product.attributes: [{key: {name}, value: {name}}]
+PRODUCT_STATE_VAR = "__PRODUCT_DETAIL_APP_INITIAL_STATE__"
+
+# Tek round trip: gömülü JSON'daki attributes + 'Ürün Özellikleri' bölümündeki
+# tüm öğeler (bölüm yoksa çift dönmez). textContent gizli (daraltılmış) öğeleri de okur; liste ancak
+# "Daha Fazla Göster" butonu yoksa veya gizli öğe varsa tam sayılır (buton
+# var ama gizli öğe yoksa kalan öğeler henüz DOM'da değil).
+ATTRIBUTES_JS = """
+const [rootSelector, stateVar, withHtml] = arguments;
+const state = window[stateVar];
+const out = {attrs: (state && state.product && state.product.attributes) || null,
+             root: false, section: false, pairs: [], complete: false, html: null};
+const root = document.querySelector(rootSelector);
+if (!root) return out;
+out.root = true;
+if (withHtml) out.html = root.outerHTML;
+let scope = null;
+for (const sec of root.querySelectorAll('div.attributes-section')) {
+  if ([...sec.querySelectorAll('h3')].some(h => h.textContent.trim() === 'Ürün Özellikleri')) {
+    scope = sec;
+    break;
+  }
+}
+// bölüm yoksa kapsayıcının geri kalanı taranmaz (ilgisiz çiftler gelir)
+if (!scope) return out;
+out.section = true;
+let hidden = 0;
+for (const item of scope.querySelectorAll('div.attributes div.attribute-item')) {
+  const n = item.querySelector('.name'), v = item.querySelector('.value');
+  if (!n || !v) continue;
+  if (item.getClientRects().length === 0) hidden++;
+  out.pairs.push([n.textContent.trim(), v.textContent.trim()]);
+}
+const button = root.querySelector('.show-more-section button.show-more-button');
+out.complete = !button || hidden > 0;
+return out;
+"""
+
+
+# kapsayıcı veya gömülü state'teki attributes geldi mi (bekleme koşulu)
+STATE_OR_ROOT_JS = """
+const [rootSelector, stateVar] = arguments;
+const state = window[stateVar];
+return !!document.querySelector(rootSelector)
+    || !!(state && state.product && state.product.attributes);
+"""
+
+
+def expand_product_attributes(
+    driver, timeout: int = 10, waits: WaitProfile | None = None
+) -> None:
     """Clicks the correct 'Daha Fazla Göster' inside the product attributes container (if present)."""
-    wait = WebDriverWait(driver, timeout)
+    from selenium.common.exceptions import (
+        ElementClickInterceptedException,
+        StaleElementReferenceException,
+        TimeoutException,
+    )
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
 
     # Scope clicks to the attributes root to avoid other 'show more' buttons on the page
-    root_selector = (
-        "div.product-attributes-container.product-attributes, "
-        "div[data-drroot='product-attributes']"
-    )
+    root_selector = ATTRIBUTES_ROOT_SELECTOR
 
     try:
-        root = wait.until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, root_selector))
+        root = wait_until(
+            driver,
+            EC.presence_of_element_located((By.CSS_SELECTOR, root_selector)),
+            timeout,
+            "attributes",
+            waits,
         )
         driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", root)
 
@@ -111,6 +159,8 @@ def expand_product_attributes(driver, timeout: int = 10) -> None:
             return
 
         btn = buttons[0]
+        item_selector = "div.attributes div.attribute-item"
+        before = len(root.find_elements(By.CSS_SELECTOR, item_selector))
         try:
             driver.execute_script(
                 "arguments[0].scrollIntoView({block: 'center'});", btn
@@ -127,20 +177,20 @@ def expand_product_attributes(driver, timeout: int = 10) -> None:
             def _expanded(_driver):
                 try:
                     current_root = _driver.find_element(By.CSS_SELECTOR, root_selector)
-                    item_count = len(
-                        current_root.find_elements(
-                            By.CSS_SELECTOR, "div.attributes div.attribute-item"
-                        )
-                    )
-                    # heuristic: expanded pages often have more than 12 items
-                    return item_count > 12
+                    if not current_root.find_elements(
+                        By.CSS_SELECTOR, ".show-more-section button.show-more-button"
+                    ):
+                        return True
+                    # tıklamadan önceki öğe sayısı aşıldıysa liste açılmıştır
+                    items = current_root.find_elements(By.CSS_SELECTOR, item_selector)
+                    return len(items) > before
                 except Exception:
                     return True
 
-            wait.until(_expanded)
+            wait_until(driver, _expanded, timeout, "attributes_expanded", waits)
         except Exception as e:
             logger.warning(
-                f"Ürün özellikleri için 'Daha Fazla Göster' tıklanamadı: {e}"
+                "Ürün özellikleri için 'Daha Fazla Göster' tıklanamadı: %s", e
             )
 
     except TimeoutException:
@@ -149,162 +199,311 @@ def expand_product_attributes(driver, timeout: int = 10) -> None:
         )
 
 
-def get_product_links_trendyol(base_url: str, total_pages: int, driver):
-    all_data = []
+def attribute_pairs(attrs) -> list[tuple[str, str]]:
+    """Gömülü ürün JSON'undaki attributes listesi -> (etiket, değer) çiftleri."""
 
-    for page in range(1, total_pages + 1):
-        url = f"{base_url}&pi={page}"
-        logger.info(f"Sayfa {page} işleniyor: {url}")
+    def _name(x):
+        return x.get("name") if isinstance(x, dict) else x
 
+    pairs = []
+    for a in attrs if isinstance(attrs, list) else []:
+        if not isinstance(a, dict):
+            continue
+        label, value = _name(a.get("key")), _name(a.get("value"))
+        if isinstance(label, str) and isinstance(value, str):
+            if label.strip() and value.strip():
+                pairs.append((label.strip(), value.strip()))
+    return pairs
+
+
+def read_attributes(
+    driver,
+    timeout: int = 10,
+    waits: WaitProfile | None = None,
+    with_html: bool = False,
+) -> tuple[str, list[tuple[str, str]], str | None]:
+    """
+    "Daha Fazla Göster" tıklaması olmadan tam özellik listesi.
+    Dönen (kaynak, çiftler, arşiv HTML'i):
+      "json":    sayfaya gömülü ürün state'i
+      "dom":     kapsayıcıdaki tüm öğeler (gizli olanlar dahil)
+      "partial": liste kısaltılmış veya 'Ürün Özellikleri' bölümü yok;
+                 tıklama yedeğine gidilmeli
+      "missing": kapsayıcı da gömülü state de yok
+    Kapsayıcı ilk okumada yoksa kapsayıcı veya gömülü state beklenir ve
+    ikinci okuma da önce gömülü state'e bakar.
+    """
+    from selenium.common.exceptions import TimeoutException
+
+    def _read() -> dict:
+        return driver.execute_script(
+            ATTRIBUTES_JS, ATTRIBUTES_ROOT_SELECTOR, PRODUCT_STATE_VAR, with_html
+        )
+
+    def _from_state(res: dict):
+        pairs = attribute_pairs(res.get("attrs"))
+        if not pairs:
+            return None
+        html = None
+        if with_html:
+            # offline çıkarım (extract_details_from_html) aynı JSON'u okur
+            data = json.dumps(res["attrs"], ensure_ascii=False).replace("</", "<\\/")
+            html = f'<script type="application/json" data-product-attributes>{data}</script>'
+        return "json", pairs, html
+
+    res = _read()
+    found = _from_state(res)
+    if found is not None:
+        return found
+
+    if not res["root"]:
         try:
-            driver.get(url)
-            wait = WebDriverWait(driver, 15)
-            wait.until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, "a.product-card"))
+            wait_until(
+                driver,
+                lambda d: d.execute_script(
+                    STATE_OR_ROOT_JS, ATTRIBUTES_ROOT_SELECTOR, PRODUCT_STATE_VAR
+                ),
+                timeout,
+                "attributes",
+                waits,
             )
+        except TimeoutException:
+            return "missing", [], None
+        res = _read()
+        found = _from_state(res)
+        if found is not None:
+            return found
+        if not res["root"]:
+            return "missing", [], None
+
+    if not res["section"]:
+        return "partial", [], res["html"]
+
+    pairs = [tuple(p) for p in res["pairs"]]
+    source = "dom" if res["complete"] and pairs else "partial"
+    return source, pairs, res["html"]
+
+
+def listing_url(base_url: str, page: int) -> str:
+    return f"{base_url}&pi={page}"
+
+
+def get_listing_page_trendyol(
+    url: str, driver, waits: WaitProfile | None = None
+) -> list[dict]:
+    """Tek listeleme sayfasındaki ürünler; sayfa yüklenmezse exception fırlatır."""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+
+    driver.get(url)
+    wait_until(
+        driver,
+        EC.presence_of_all_elements_located((By.CSS_SELECTOR, "a.product-card")),
+        15,
+        "listing",
+        waits,
+    )
 
-            product_cards = driver.find_elements(By.CSS_SELECTOR, "a.product-card")
-            logger.info(f"{len(product_cards)} ürün bulundu.")
-
-            for card in product_cards:
-                try:
-                    brand = card.find_element(
-                        By.CLASS_NAME, "product-brand"
-                    ).text.strip()
-                    name = card.find_element(By.CLASS_NAME, "product-name").text.strip()
-                    price_elem = card.find_element(
-                        By.CSS_SELECTOR, 'div[data-testid="single-price"]'
-                    )
-                    href = card.get_attribute("href")
-
-                    title = f"{brand} {name}".strip()
-                    price = price_elem.text.strip()
-                    link = href
-
-                    all_data.append(
-                        {
-                            "Name": title,
-                            "Price": price,
-                            "Link": link,
-                            "Timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                        }
-                    )
-                except Exception as e:
-                    logger.warning(f"Ürün işlenirken hata: {e}")
+    product_cards = driver.find_elements(By.CSS_SELECTOR, "a.product-card")
+    logger.info("%d ürün bulundu.", len(product_cards))
 
+    all_data = []
+    for card in product_cards:
+        try:
+            brand = card.find_element(By.CLASS_NAME, "product-brand").text.strip()
+            name = card.find_element(By.CLASS_NAME, "product-name").text.strip()
+            price_elem = card.find_element(
+                By.CSS_SELECTOR, 'div[data-testid="single-price"]'
+            )
+            href = card.get_attribute("href")
+
+            title = f"{brand} {name}".strip()
+            price = price_elem.text.strip()
+            link = href
+
+            all_data.append(
+                {
+                    "Name": title,
+                    "Price": price,
+                    "Link": link,
+                    "Timestamp": now_str(),
+                }
+            )
         except Exception as e:
-            logger.error(f"Sayfa işlenemedi: {e}")
-            continue
+            logger.warning("Ürün işlenirken hata: %s", e)
+
+    return all_data
 
-    df = pd.DataFrame(all_data)
-    return df
 
+def get_product_details_trendyol(
+    link: str,
+    driver,
+    archive: HtmlArchive | None = None,
+    strategy: str = "classes",
+    waits: WaitProfile | None = None,
+) -> dict:
+    """
+    strategy="structural": özellikler class adları yerine kapsayıcı içindeki
+    iki çocuklu etiket/değer elemanlarından okunur (bkz. selector_health).
+    waits: bekleme timeout'ları gözlenen gecikmeden öğrenilir (bkz. wait_profile).
+    """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
 
-def get_product_details_trendyol(link: str, driver) -> dict:
-    features = {field: None for field in TARGET_FIELDS}
-    wait = WebDriverWait(driver, 15)
+    features = empty_features(TARGET_FIELDS)
+    html_parts = []
 
     try:
         driver.get(link)
 
         # Başlık ve Marka
         try:
-            h1_elem = wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "h1.product-title"))
+            h1_elem = wait_until(
+                driver,
+                EC.presence_of_element_located((By.CSS_SELECTOR, "h1.product-title")),
+                15,
+                "title",
+                waits,
             )
+            if archive is not None:
+                html_parts.append(h1_elem.get_attribute("outerHTML"))
             brand_elem = h1_elem.find_element(By.CSS_SELECTOR, "a strong")
             brand = brand_elem.text.strip()
             title = h1_elem.text.strip().replace(brand, "").strip()
             features["Marka"] = brand
             features["Başlık"] = title
         except Exception as e:
-            logger.warning(f"Başlık veya marka alınamadı: {e}")
+            logger.warning("Başlık veya marka alınamadı: %s", e)
 
-        # Ürün Özellikleri: önce doğru kapsayıcıyı genişlet
-        expand_product_attributes(driver)
-
-        # Özellikler (sadece 'Ürün Özellikleri' bölümünü hedefle)
-        try:
-            root_selector = (
-                "div.product-attributes-container.product-attributes, "
-                "div[data-drroot='product-attributes']"
-            )
-            root = wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, root_selector))
-            )
-
-            # 'Ürün Özellikleri' başlığı olan section
-            feature_section = root.find_element(
-                By.XPATH,
-                ".//div[contains(@class,'attributes-section')][.//h3[normalize-space()='Ürün Özellikleri']]",
-            )
-            attr_items = feature_section.find_elements(
-                By.CSS_SELECTOR, "div.attributes div.attribute-item"
+        # Ürün Özellikleri: önce tıklamasız (gömülü JSON / gizli öğeler dahil DOM)
+        source = None
+        if strategy == "classes":
+            source, pairs, html = read_attributes(
+                driver, waits=waits, with_html=archive is not None
             )
+            if source in ("json", "dom"):
+                for label, value in pairs:
+                    add_feature(features, label, value)
+                if html:
+                    html_parts.append(html)
+            elif source == "missing":
+                logger.warning("Ürün özellikleri alanı bulunamadı: %s", link)
+
+        # yedek: "Daha Fazla Göster" tıklaması + görünen öğeler
+        if source in (None, "partial"):
+            # Ürün Özellikleri: önce doğru kapsayıcıyı genişlet
+            expand_product_attributes(driver, waits=waits)
+
+            # Özellikler (sadece 'Ürün Özellikleri' bölümünü hedefle)
+            try:
+                root = wait_until(
+                    driver,
+                    EC.presence_of_element_located(
+                        (By.CSS_SELECTOR, ATTRIBUTES_ROOT_SELECTOR)
+                    ),
+                    15,
+                    "attributes_after_expand",
+                    waits,
+                )
+                if archive is not None:
+                    html_parts.append(root.get_attribute("outerHTML"))
+
+                if strategy == "structural":
+                    for label, value in structural_pairs(
+                        driver, ATTRIBUTES_ROOT_SELECTOR
+                    ):
+                        add_feature(features, label, value)
+                    attr_items = []
+                else:
+                    # 'Ürün Özellikleri' başlığı olan section
+                    feature_section = root.find_element(
+                        By.XPATH,
+                        ".//div[contains(@class,'attributes-section')][.//h3[normalize-space()='Ürün Özellikleri']]",
+                    )
+                    attr_items = feature_section.find_elements(
+                        By.CSS_SELECTOR, "div.attributes div.attribute-item"
+                    )
 
-            for item in attr_items:
-                try:
-                    label = item.find_element(By.CSS_SELECTOR, ".name").text.strip()
-                    value = item.find_element(By.CSS_SELECTOR, ".value").text.strip()
-
-                    if label in features and value:
-                        # Aynı etiket gelirse kaybetmemek için birleştir
-                        if features[label] and features[label] != value:
-                            features[label] = f"{features[label]}; {value}"
-                        else:
-                            features[label] = value
-                except Exception:
-                    continue
+                for item in attr_items:
+                    try:
+                        label = item.find_element(By.CSS_SELECTOR, ".name").text.strip()
+                        value = item.find_element(
+                            By.CSS_SELECTOR, ".value"
+                        ).text.strip()
+                        add_feature(features, label, value)
+                    except Exception:
+                        continue
 
-        except Exception as e:
-            logger.warning(f"Özellikler okunamadı: {e}")
+            except Exception as e:
+                logger.warning("Özellikler okunamadı: %s", e)
 
     except Exception as e:
-        logger.error(f"Ürün detayları alınamadı: {e}")
-
-    features["Çekilme Zamanı"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    return features
-
+        logger.error("Ürün detayları alınamadı: %s", e)
 
-def scrape_all_details_trendyol(links_df: pd.DataFrame, driver) -> pd.DataFrame:
-    results = []
+    if html_parts:
+        try:
+            archive.put(link, "\n".join(html_parts))
+        except Exception as e:
+            logger.warning("HTML arşive yazılamadı: %s - %s", link, e)
 
-    for i, (link, price) in enumerate(
-        zip(links_df["Link"], links_df["Price"]), start=1
-    ):
-        if i % 50 == 0 or i == 1:
-            logger.info(f"{i}. ürün işleniyor: {link}")
+    features["Çekilme Zamanı"] = now_str()
+    return features
 
-        details = get_product_details_trendyol(link, driver)
-        details["Fiyat (TRY)"] = price
-        details["Link"] = link
-        results.append(details)
 
-    df = pd.DataFrame(results)
-    return df
+def extract_details_from_html(html: str) -> dict:
+    """get_product_details_trendyol'un arşivlenmiş HTML üzerinde offline karşılığı."""
+    from html_archive import has_attr, has_class, parse_html, tag
 
+    features = empty_features(TARGET_FIELDS)
+    root = parse_html(html)
 
-def scrape_trendyol(base_url: str, total_pages: int):
-    os.makedirs(LINK_DIR, exist_ok=True)
-    os.makedirs(SCRAPPED_DIR, exist_ok=True)
-    os.makedirs(PROCESSED_DIR, exist_ok=True)
+    h1 = root.find(lambda n: n.tag == "h1" and "product-title" in n.classes)
+    if h1 is not None:
+        a_tag = h1.find(tag("a"))
+        strong = a_tag.find(tag("strong")) if a_tag is not None else None
+        if strong is not None:
+            brand = strong.text()
+            features["Marka"] = brand
+            features["Başlık"] = h1.text().replace(brand, "").strip()
+
+    # tıklamasız yolda gömülü JSON'dan okunmuş sayfalar
+    script = root.find(has_attr("data-product-attributes"))
+    if script is not None:
+        raw = "".join(c for c in script.children if isinstance(c, str))
+        for label, value in attribute_pairs(json.loads(raw)):
+            add_feature(features, label, value)
+        return features
+
+    attrs_root = root.find(
+        lambda n: has_class("product-attributes-container", "product-attributes")(n)
+        or has_attr("data-drroot", "product-attributes")(n)
+    )
+    if attrs_root is None:
+        return features
 
-    driver = webdriver.Chrome()
+    for section in attrs_root.find_all(has_class("attributes-section")):
+        if not any(
+            h3.text() == "Ürün Özellikleri" for h3 in section.find_all(tag("h3"))
+        ):
+            continue
+        for attributes in section.find_all(has_class("attributes")):
+            for item in attributes.find_all(has_class("attribute-item")):
+                label = item.find(has_class("name"))
+                value = item.find(has_class("value"))
+                if label is not None and value is not None:
+                    add_feature(features, label.text(), value.text())
+        break
 
-    try:
-        links_df = get_product_links_trendyol(base_url, total_pages, driver)
-        link_path = os.path.join(
-            LINK_DIR, f"TY_Links_{datetime.now().strftime('%Y%m%d%H%M')}.csv"
-        )
-        links_df.to_csv(link_path, index=False)
-        logger.info(f"Linkler kaydedildi: {link_path}")
+    return features
 
-        details_df = scrape_all_details_trendyol(links_df, driver)
-        scrapped_path = os.path.join(
-            SCRAPPED_DIR, f"TY_Details_{datetime.now().strftime('%Y%m%d%H%M')}.csv"
-        )
-        details_df.to_csv(scrapped_path, index=False)
-        logger.info(f"Detaylar kaydedildi: {scrapped_path}")
 
-    finally:
-        driver.quit()
+ADAPTER = MarketplaceAdapter(
+    prefix="TY",
+    name="trendyol",
+    target_fields=TARGET_FIELDS,
+    listing_url=listing_url,
+    read_listing=get_listing_page_trendyol,
+    read_details=get_product_details_trendyol,
+    extract_details_from_html=extract_details_from_html,
+    spec_selectors=SPEC_SELECTORS,
+)
@@ -0,0 +1,175 @@
+"""
+Gözlenen gecikmeden öğrenilen bekleme timeout'ları.
+
+Scraper'lardaki sabit timeout'lar (başlık 15s, teknik özellikler 20s,
+genişletme 10s ...) hiç gelmeyecek bir eleman için her sayfada tam süre
+bekletiyor. WaitProfile her bekleme koşulu (isim) için başarılı
+beklemelerin süresini tutar:
+
+    timeout = min(varsayılan, max(min_timeout, q95 * margin + slack))
+
+Yeterli örnek (min_samples) yoksa varsayılan kullanılır. Kısılmış timeout
+geç gelen elemanları kesip dağılımı aşağı çekmesin diye her
+explore_every beklemede bir varsayılan süre denenir. Profil platform
+başına data/crawl_state/wait_profile_<PREFIX>.json'da saklanır ve
+sonraki run'lar oradan başlar.
+"""
+
+from __future__ import annotations
+import json
+import os
+import threading
+import time
+from collections import Counter, deque
+from pathlib import Path
+from typing import Callable
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+STATE_DIR = PROJECT_ROOT / "data" / "crawl_state"
+
+
+def _quantile(values: list[float], q: float) -> float:
+    s = sorted(values)
+    return s[min(len(s) - 1, int(q * len(s)))]
+
+
+class WaitProfile:
+    """
+    waits = WaitProfile("HB")
+    el = waits.until(driver, "title", EC.presence_of_element_located(...), 15)
+    waits.save()
+    """
+
+    def __init__(
+        self,
+        prefix: str,
+        state_dir: str | Path = STATE_DIR,
+        quantile: float = 0.95,
+        margin: float = 1.5,
+        slack: float = 1.0,
+        min_timeout: float = 2.0,
+        min_samples: int = 30,
+        explore_every: int = 25,
+        max_samples: int = 500,
+    ):
+        self.prefix = prefix
+        self.path = Path(state_dir) / f"wait_profile_{prefix}.json"
+        self.quantile = quantile
+        self.margin = margin
+        self.slack = slack
+        self.min_timeout = min_timeout
+        self.min_samples = min_samples
+        self.explore_every = explore_every
+        self.max_samples = max_samples
+
+        self.samples: dict[str, deque[float]] = {}
+        self.calls: Counter[str] = Counter()
+        self.timeouts: Counter[str] = Counter()
+        # bu run'da timeout'a düşen beklemelerde varsayılana göre kazanılan süre
+        self.saved: Counter[str] = Counter()
+        # paralel worker'lar aynı profili paylaşır
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        for name, values in data.get("samples", {}).items():
+            self.samples[name] = deque(values, maxlen=self.max_samples)
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            samples = {k: [round(v, 3) for v in d] for k, d in self.samples.items()}
+        data = {"updated": time.strftime("%Y-%m-%d %H:%M:%S"), "samples": samples}
+        tmp = self.path.with_suffix(f".tmp{os.getpid()}")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)
+
+    # -----------------------------
+    # Timeout
+    # -----------------------------
+    def learned(self, name: str) -> float | None:
+        """Öğrenilmiş timeout (varsayılan sınırı uygulanmadan); örnek azsa None."""
+        values = self.samples.get(name)
+        if not values or len(values) < self.min_samples:
+            return None
+        q = _quantile(list(values), self.quantile)
+        return max(self.min_timeout, q * self.margin + self.slack)
+
+    def timeout(self, name: str, default: float) -> float:
+        with self._lock:
+            self.calls[name] += 1
+            learned = self.learned(name)
+            if learned is None or self.calls[name] % self.explore_every == 0:
+                return default
+            return min(default, learned)
+
+    def record(self, name: str, elapsed: float, ok: bool) -> None:
+        with self._lock:
+            if ok:
+                d = self.samples.get(name)
+                if d is None:
+                    d = self.samples[name] = deque(maxlen=self.max_samples)
+                d.append(elapsed)
+            else:
+                self.timeouts[name] += 1
+
+    def until(
+        self,
+        driver,
+        name: str,
+        condition: Callable,
+        default: float,
+        poll: float = 0.5,
+    ):
+        """WebDriverWait(driver, öğrenilen timeout).until(condition) + ölçüm."""
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        timeout = self.timeout(name, default)
+        t0 = time.monotonic()
+        try:
+            result = WebDriverWait(driver, timeout, poll_frequency=poll).until(
+                condition
+            )
+        except TimeoutException:
+            self.record(name, time.monotonic() - t0, ok=False)
+            with self._lock:
+                self.saved[name] += default - timeout
+            raise
+        self.record(name, time.monotonic() - t0, ok=True)
+        return result
+
+    def summary(self) -> str:
+        parts = []
+        for name in sorted(self.calls):
+            learned = self.learned(name)
+            t = f"{learned:.1f}s" if learned is not None else "varsayılan"
+            parts.append(
+                f"{name}: {t}, timeout {self.timeouts[name]}/{self.calls[name]}"
+            )
+        saved = sum(self.saved.values())
+        return "; ".join(parts) + f" | timeout'larda kazanılan {saved:.0f}s"
+
+
+def wait_until(
+    driver,
+    condition: Callable,
+    timeout: float,
+    name: str,
+    waits: WaitProfile | None = None,
+    poll: float = 0.5,
+):
+    """waits verilirse öğrenilen timeout'la, yoksa sabit timeout'la bekler."""
+    if waits is not None:
+        return waits.until(driver, name, condition, timeout, poll)
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    return WebDriverWait(driver, timeout, poll_frequency=poll).until(condition)